@@ -1,3 +1,5 @@
+import 'dart:developer';
+
 import 'package:bloc/bloc.dart';
 import 'package:equatable/equatable.dart';
 import 'package:pinball/game/game.dart';
@@ -13,6 +15,8 @@ class AssetsManagerCubit extends Cubit<AssetsManagerState> {
   final PinballGame _game;
   final PinballAudioPlayer _audioPlayer;
 
+  static const _throttleSize = 3;
+
   Future<void> load() async {
     /// Assigning loadables is a very expensive operation. With this purposeful
     /// delay here, which is a bit random in duration but enough to let the UI
@@ -20,6 +24,13 @@ class AssetsManagerCubit extends Cubit<AssetsManagerState> {
     /// the UI paint first, and then we start loading the assets.
     await Future<void>.delayed(const Duration(seconds: 1));
     if (isClosed) return;
+    final stopwatch = Stopwatch()..start();
+
+    // Only what the board needs to mount gates the game; the loading
+    // progress counts these. The bonus and character animations are read
+    // with fromCache when their widgets build, so they gate it too.
+    // BonusAnimation.loadAssets also sets the image prefix the character
+    // animations load with, so it goes first.
     final loadables = <Future<void> Function()>[
       _game.preFetchLeaderboard,
       ..._game.preLoadAssets(),
@@ -27,30 +38,53 @@ class AssetsManagerCubit extends Cubit<AssetsManagerState> {
       ...BonusAnimation.loadAssets(),
       ...SelectedCharacter.loadAssets(),
     ];
+    final attractLoadables = _game.attractAssets();
+    final lazyLoadables = _game.lazyAssets();
     emit(
       state.copyWith(
         assetsCount: loadables.length,
       ),
     );
 
-    late void Function() _triggerLoad;
-    _triggerLoad = () async {
-      if (loadables.isEmpty) return;
-      final loadable = loadables.removeAt(0);
-      try {
-        await loadable();
-      } catch (_) {
-        // Skip failing assets so the loading lane keeps going.
-      }
-      if (!isClosed) {
-        emit(state.copyWith(loaded: state.loaded + 1));
-        _triggerLoad();
-      }
-    };
+    await _loadAll(
+      loadables,
+      onLoaded: () => emit(state.copyWith(loaded: state.loaded + 1)),
+    );
+    if (isClosed) return;
+    log('Board assets loaded in ${stopwatch.elapsedMilliseconds}ms');
 
-    const _throttleSize = 3;
-    for (var i = 0; i < _throttleSize; i++) {
-      _triggerLoad();
+    // The board is up in attract mode from here. The ball and the arcade
+    // backgrounds come next, then what play and game over draw; the
+    // components that draw those load them on mount too, so this only
+    // prefetches.
+    await _loadAll(attractLoadables);
+    if (isClosed) return;
+    log('Attract assets loaded in ${stopwatch.elapsedMilliseconds}ms');
+    await _loadAll(lazyLoadables);
+    if (isClosed) return;
+    log('All assets loaded in ${stopwatch.elapsedMilliseconds}ms');
+  }
+
+  /// Runs [loadables] in order on [_throttleSize] parallel lanes.
+  Future<void> _loadAll(
+    List<Future<void> Function()> loadables, {
+    void Function()? onLoaded,
+  }) {
+    final pending = List.of(loadables);
+    Future<void> lane() async {
+      while (pending.isNotEmpty && !isClosed) {
+        final loadable = pending.removeAt(0);
+        try {
+          await loadable();
+        } catch (_) {
+          // Skip failing assets so the loading lane keeps going.
+        }
+        if (!isClosed) onLoaded?.call();
+      }
     }
+
+    return Future.wait([
+      for (var i = 0; i < _throttleSize; i++) lane(),
+    ]);
   }
 }
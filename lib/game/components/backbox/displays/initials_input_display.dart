@@ -163,7 +163,7 @@ class _CharacterIconSpriteComponent extends SpriteComponent with HasGameRef {
   @override
   Future<void> onLoad() async {
     await super.onLoad();
-    final sprite = Sprite(gameRef.images.fromCache(_characterIconPath));
+    final sprite = Sprite(await gameRef.images.load(_characterIconPath));
     this.sprite = sprite;
     size = sprite.originalSize / 20;
   }
@@ -275,7 +275,7 @@ class _DividerSpriteComponent extends SpriteComponent with HasGameRef {
   Future<void> onLoad() async {
     await super.onLoad();
     final sprite = Sprite(
-      gameRef.images.fromCache(Assets.images.backbox.displayDivider.keyName),
+      await gameRef.images.load(Assets.images.backbox.displayDivider.keyName),
     );
     this.sprite = sprite;
     size = sprite.originalSize / 20;
@@ -149,7 +149,7 @@ class FacebookButtonComponent extends SpriteComponent
   Future<void> onLoad() async {
     await super.onLoad();
     final sprite = Sprite(
-      gameRef.images.fromCache(Assets.images.backbox.button.facebook.keyName),
+      await gameRef.images.load(Assets.images.backbox.button.facebook.keyName),
     );
     this.sprite = sprite;
     size = sprite.originalSize / 25;
@@ -182,7 +182,7 @@ class TwitterButtonComponent extends SpriteComponent
   Future<void> onLoad() async {
     await super.onLoad();
     final sprite = Sprite(
-      gameRef.images.fromCache(Assets.images.backbox.button.twitter.keyName),
+      await gameRef.images.load(Assets.images.backbox.button.twitter.keyName),
     );
     this.sprite = sprite;
     size = sprite.originalSize / 25;
@@ -1 +1,2 @@
 export 'assets.gen.dart';
+export 'preload_plan.gen.dart';
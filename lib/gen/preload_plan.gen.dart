@@ -0,0 +1,285 @@
+/// GENERATED CODE - DO NOT MODIFY BY HAND
+/// *****************************************************
+///  tools/preload_plan.py
+/// *****************************************************
+
+// coverage:ignore-file
+// ignore_for_file: type=lint
+
+/// Keys of `PinballGameAssetsX.imageAssets` grouped by when they are
+/// first drawn. Each tier is ordered largest-first.
+abstract class PreloadPlan {
+  /// Read from the cache while the board mounts. 114 images, 7888 KB.
+  static const critical = <String>[
+    // 2129x1765, 2239 KB
+    'packages/pinball_components/assets/images/backbox/marquee.png',
+    // 1800x400, 637 KB
+    'packages/pinball_components/assets/images/android/spaceship/animatronic.png',
+    // 1019x1440, 622 KB
+    'packages/pinball_components/assets/images/board_background.png',
+    // 1189x1600, 606 KB
+    'packages/pinball_components/assets/images/boundary/outer.png',
+    // 2035x1422, 471 KB
+    'packages/pinball_components/assets/images/dino/animatronic/head.png',
+    // 4000x2750, 363 KB
+    'packages/pinball_theme/assets/images/dash/background.jpg',
+    // 1295x618, 267 KB
+    'packages/pinball_components/assets/images/android/spaceship/saucer.png',
+    // 512x512, 250 KB
+    'packages/pinball_components/assets/images/seeker_phone/retracted.png',
+    // 1112x1253, 181 KB
+    'packages/pinball_components/assets/images/sparky/computer/glow.png',
+    // 1950x900, 181 KB
+    'packages/pinball_components/assets/images/dash/animatronic.png',
+    // 2000x375, 180 KB
+    'packages/pinball_components/assets/images/plunger/plunger.png',
+    // 512x512, 178 KB
+    'packages/pinball_components/assets/images/android/spaceship/toly_head.png',
+    // 2035x1422, 139 KB
+    'packages/pinball_components/assets/images/dino/animatronic/mouth.png',
+    // 957x322, 137 KB
+    'packages/pinball_components/assets/images/boundary/bottom.png',
+    // 1800x1400, 100 KB
+    'packages/pinball_components/assets/images/sparky/animatronic.png',
+    // 256x256, 90 KB
+    'packages/pinball_components/assets/images/solana_coin/lit.png',
+    // 410x338, 81 KB
+    'packages/pinball_components/assets/images/android/ramp/main.png',
+    // 447x1431, 79 KB
+    'packages/pinball_components/assets/images/launch_ramp/ramp.png',
+    // 256x256, 70 KB
+    'packages/pinball_components/assets/images/solana_coin/idle.png',
+    // 153x539, 58 KB
+    'packages/pinball_components/assets/images/dino/bottom_wall.png',
+    // 175x557, 58 KB
+    'packages/pinball_components/assets/images/android/rail/main.png',
+    // 200x300, 55 KB
+    'packages/pinball_components/assets/images/android/mineshaft.png',
+    // 1190x25, 36 KB
+    'packages/pinball_components/assets/images/boundary/outer_bottom.png',
+    // 381x1383, 36 KB
+    'packages/pinball_components/assets/images/launch_ramp/foreground_railing.png',
+    // 436x1411, 35 KB
+    'packages/pinball_components/assets/images/launch_ramp/background_railing.png',
+    // 249x242, 35 KB
+    'packages/pinball_components/assets/images/android/spaceship/light_beam.png',
+    // 1400x100, 32 KB
+    'packages/pinball_components/assets/images/flapper/flap.png',
+    // 100x247, 28 KB
+    'packages/pinball_components/assets/images/dino/top_wall.png',
+    // 393x351, 26 KB
+    'packages/pinball_components/assets/images/android/ramp/railing_background.png',
+    // 168x177, 23 KB
+    'packages/pinball_components/assets/images/plunger/rocket.png',
+    // 98x239, 22 KB
+    'packages/pinball_components/assets/images/google_rollover/left/decal.png',
+    // 98x239, 21 KB
+    'packages/pinball_components/assets/images/google_rollover/right/decal.png',
+    // 258x283, 19 KB
+    'packages/pinball_components/assets/images/android/ramp/railing_foreground.png',
+    // 87x190, 17 KB
+    'packages/pinball_components/assets/images/kicker/left/lit.png',
+    // 88x190, 17 KB
+    'packages/pinball_components/assets/images/kicker/right/lit.png',
+    // 275x179, 16 KB
+    'packages/pinball_components/assets/images/baseboard/right.png',
+    // 87x190, 16 KB
+    'packages/pinball_components/assets/images/kicker/left/dimmed.png',
+    // 275x179, 16 KB
+    'packages/pinball_components/assets/images/baseboard/left.png',
+    // 88x190, 16 KB
+    'packages/pinball_components/assets/images/kicker/right/dimmed.png',
+    // 92x252, 14 KB
+    'packages/pinball_components/assets/images/skill_shot/decal.png',
+    // 108x86, 14 KB
+    'packages/pinball_components/assets/images/dash/bumper/main/active.png',
+    // 106x156, 14 KB
+    'packages/pinball_components/assets/images/signpost/active3.png',
+    // 106x156, 14 KB
+    'packages/pinball_components/assets/images/signpost/active2.png',
+    // 106x156, 13 KB
+    'packages/pinball_components/assets/images/signpost/active1.png',
+    // 106x156, 13 KB
+    'packages/pinball_components/assets/images/signpost/inactive.png',
+    // 75x74, 11 KB
+    'packages/pinball_components/assets/images/dash/bumper/b/active.png',
+    // 71x75, 11 KB
+    'packages/pinball_components/assets/images/dash/bumper/a/active.png',
+    // 75x74, 10 KB
+    'packages/pinball_components/assets/images/dash/bumper/b/inactive.png',
+    // 75x74, 10 KB
+    'packages/pinball_components/assets/images/android/bumper/cow/dimmed.png',
+    // 75x74, 10 KB
+    'packages/pinball_components/assets/images/android/bumper/cow/lit.png',
+    // 71x75, 10 KB
+    'packages/pinball_components/assets/images/dash/bumper/a/inactive.png',
+    // 75x69, 10 KB
+    'packages/pinball_components/assets/images/android/bumper/a/dimmed.png',
+    // 75x69, 10 KB
+    'packages/pinball_components/assets/images/android/bumper/a/lit.png',
+    // 73x66, 10 KB
+    'packages/pinball_components/assets/images/android/bumper/b/dimmed.png',
+    // 73x66, 9 KB
+    'packages/pinball_components/assets/images/android/bumper/b/lit.png',
+    // 108x86, 9 KB
+    'packages/pinball_components/assets/images/dash/bumper/main/inactive.png',
+    // 87x114, 8 KB
+    'packages/pinball_components/assets/images/sparky/computer/base.png',
+    // 150x258, 8 KB
+    'packages/pinball_components/assets/images/android/ramp/arrow/active5.png',
+    // 150x258, 8 KB
+    'packages/pinball_components/assets/images/android/ramp/arrow/active4.png',
+    // 150x55, 8 KB
+    'packages/pinball_components/assets/images/flipper/right.png',
+    // 150x258, 7 KB
+    'packages/pinball_components/assets/images/android/ramp/arrow/active3.png',
+    // 150x55, 7 KB
+    'packages/pinball_components/assets/images/flipper/left.png',
+    // 150x258, 7 KB
+    'packages/pinball_components/assets/images/android/ramp/arrow/active2.png',
+    // 67x57, 7 KB
+    'packages/pinball_components/assets/images/sparky/bumper/a/lit.png',
+    // 150x258, 7 KB
+    'packages/pinball_components/assets/images/android/ramp/arrow/active1.png',
+    // 67x57, 7 KB
+    'packages/pinball_components/assets/images/sparky/bumper/a/dimmed.png',
+    // 150x258, 7 KB
+    'packages/pinball_components/assets/images/android/ramp/arrow/inactive.png',
+    // 65x53, 7 KB
+    'packages/pinball_components/assets/images/sparky/bumper/c/lit.png',
+    // 56x75, 6 KB
+    'packages/pinball_components/assets/images/slingshot/lower.png',
+    // 65x53, 6 KB
+    'packages/pinball_components/assets/images/sparky/bumper/c/dimmed.png',
+    // 64x52, 6 KB
+    'packages/pinball_components/assets/images/sparky/bumper/b/lit.png',
+    // 64x52, 6 KB
+    'packages/pinball_components/assets/images/sparky/bumper/b/dimmed.png',
+    // 64x52, 6 KB
+    'packages/pinball_components/assets/images/multiball/lit.png',
+    // 86x89, 6 KB
+    'packages/pinball_components/assets/images/sparky/computer/top.png',
+    // 39x75, 6 KB
+    'packages/pinball_components/assets/images/slingshot/upper.png',
+    // 125x34, 5 KB
+    'packages/pinball_components/assets/images/android/ramp/board_opening.png',
+    // 64x52, 5 KB
+    'packages/pinball_components/assets/images/multiball/dimmed.png',
+    // 47x44, 5 KB
+    'packages/pinball_components/assets/images/google_word/letter1/lit.png',
+    // 56x53, 5 KB
+    'packages/pinball_components/assets/images/multiplier/x5/lit.png',
+    // 48x44, 5 KB
+    'packages/pinball_components/assets/images/google_word/letter6/lit.png',
+    // 58x54, 5 KB
+    'packages/pinball_components/assets/images/multiplier/x6/lit.png',
+    // 85x58, 5 KB
+    'packages/pinball_components/assets/images/android/rail/exit.png',
+    // 47x43, 5 KB
+    'packages/pinball_components/assets/images/google_word/letter4/lit.png',
+    // 48x43, 4 KB
+    'packages/pinball_components/assets/images/google_word/letter2/lit.png',
+    // 47x43, 4 KB
+    'packages/pinball_components/assets/images/google_word/letter3/lit.png',
+    // 47x43, 4 KB
+    'packages/pinball_components/assets/images/google_word/letter5/lit.png',
+    // 48x35, 4 KB
+    'packages/pinball_components/assets/images/skill_shot/lit.png',
+    // 48x47, 4 KB
+    'packages/pinball_components/assets/images/multiplier/x4/lit.png',
+    // 56x53, 4 KB
+    'packages/pinball_components/assets/images/multiplier/x5/dimmed.png',
+    // 58x54, 3 KB
+    'packages/pinball_components/assets/images/multiplier/x6/dimmed.png',
+    // 48x35, 3 KB
+    'packages/pinball_components/assets/images/skill_shot/dimmed.png',
+    // 48x47, 3 KB
+    'packages/pinball_components/assets/images/multiplier/x4/dimmed.png',
+    // 47x44, 3 KB
+    'packages/pinball_components/assets/images/google_word/letter1/dimmed.png',
+    // 46x36, 3 KB
+    'packages/pinball_components/assets/images/multiplier/x3/lit.png',
+    // 48x44, 3 KB
+    'packages/pinball_components/assets/images/google_word/letter6/dimmed.png',
+    // 48x57, 2 KB
+    'packages/pinball_components/assets/images/google_rollover/left/pin.png',
+    // 47x43, 2 KB
+    'packages/pinball_components/assets/images/google_word/letter4/dimmed.png',
+    // 48x43, 2 KB
+    'packages/pinball_components/assets/images/google_word/letter2/dimmed.png',
+    // 43x34, 2 KB
+    'packages/pinball_components/assets/images/multiplier/x2/lit.png',
+    // 47x43, 2 KB
+    'packages/pinball_components/assets/images/google_word/letter3/dimmed.png',
+    // 47x43, 2 KB
+    'packages/pinball_components/assets/images/google_word/letter5/dimmed.png',
+    // 39x70, 2 KB
+    'packages/pinball_components/assets/images/skill_shot/pin.png',
+    // 48x54, 2 KB
+    'packages/pinball_components/assets/images/google_rollover/right/pin.png',
+    // 46x36, 2 KB
+    'packages/pinball_components/assets/images/multiplier/x3/dimmed.png',
+    // 43x34, 2 KB
+    'packages/pinball_components/assets/images/multiplier/x2/dimmed.png',
+    // 26x38, 2 KB
+    'packages/pinball_components/assets/images/flapper/front_support.png',
+    // 25x38, 1 KB
+    'packages/pinball_components/assets/images/flapper/back_support.png',
+    // 62x62, 1 KB
+    'packages/pinball_theme/assets/images/dash/leaderboard_icon.png',
+    // 68x63, 1 KB
+    'packages/pinball_components/assets/images/display_arrows/arrow_left.png',
+    // 68x63, 1 KB
+    'packages/pinball_components/assets/images/display_arrows/arrow_right.png',
+    // 62x47, 1 KB
+    'packages/pinball_theme/assets/images/android/leaderboard_icon.png',
+    // 15x16, 1 KB
+    'packages/pinball_components/assets/images/dino/top_wall_tunnel.png',
+    // 52x62, 1 KB
+    'packages/pinball_theme/assets/images/sparky/leaderboard_icon.png',
+    // 62x52, 0 KB
+    'packages/pinball_theme/assets/images/dino/leaderboard_icon.png',
+  ];
+
+  /// First drawn once a character is chosen. 7 images, 1111 KB.
+  static const attract = <String>[
+    // 4000x2750, 373 KB
+    'packages/pinball_theme/assets/images/dino/background.jpg',
+    // 4000x2750, 366 KB
+    'packages/pinball_theme/assets/images/sparky/background.jpg',
+    // 4000x2750, 360 KB
+    'packages/pinball_theme/assets/images/android/background.jpg',
+    // 80x80, 3 KB
+    'packages/pinball_theme/assets/images/sparky/ball.png',
+    // 80x80, 3 KB
+    'packages/pinball_theme/assets/images/dash/ball.png',
+    // 80x80, 3 KB
+    'packages/pinball_theme/assets/images/android/ball.png',
+    // 80x80, 3 KB
+    'packages/pinball_theme/assets/images/dino/ball.png',
+  ];
+
+  /// First drawn during play or after game over. 10 images, 752 KB.
+  static const lazy = <String>[
+    // 2048x128, 358 KB
+    'packages/pinball_components/assets/images/dino/solana_token.png',
+    // 2400x2000, 334 KB
+    'packages/pinball_components/assets/images/ball/flame_effect.png',
+    // 914x225, 13 KB
+    'packages/pinball_components/assets/images/score/two_hundred_thousand.png',
+    // 1088x225, 13 KB
+    'packages/pinball_components/assets/images/score/one_million.png',
+    // 761x225, 12 KB
+    'packages/pinball_components/assets/images/score/twenty_thousand.png',
+    // 633x225, 11 KB
+    'packages/pinball_components/assets/images/score/five_thousand.png',
+    // 125x124, 4 KB
+    'packages/pinball_components/assets/images/backbox/button/twitter.png',
+    // 125x124, 3 KB
+    'packages/pinball_components/assets/images/backbox/button/facebook.png',
+    // 1000x550, 2 KB
+    'packages/pinball_components/assets/images/backbox/display_divider.png',
+    // 701x171, 2 KB
+    'packages/pinball_components/assets/images/backbox/display_title_decoration.png',
+  ];
+}
@@ -72,19 +72,31 @@ class ArcadeBackgroundSpriteComponent extends SpriteComponent
 
   final String? _assetPath;
 
+  /// Key of the latest state's image, so a slower load started for an
+  /// earlier theme does not replace it.
+  String? _key;
+
   @override
   void onNewState(ArcadeBackgroundState state) {
-    sprite = Sprite(
-      gameRef.images.fromCache(state.characterTheme.background.keyName),
-    );
+    final key = state.characterTheme.background.keyName;
+    _key = key;
+    // Only the default background is loaded with the board, so the chosen
+    // character's may still be loading.
+    if (gameRef.images.containsKey(key)) {
+      sprite = Sprite(gameRef.images.fromCache(key));
+    } else {
+      gameRef.images.load(key).then((image) {
+        if (_key == key) sprite = Sprite(image);
+      });
+    }
   }
 
   @override
   Future<void> onLoad() async {
     await super.onLoad();
     final sprite = Sprite(
-      gameRef.images
-          .fromCache(_assetPath ?? theme.Assets.images.dash.background.keyName),
+      await gameRef.images
+          .load(_assetPath ?? theme.Assets.images.dash.background.keyName),
     );
     this.sprite = sprite;
     size = sprite.originalSize / 10;
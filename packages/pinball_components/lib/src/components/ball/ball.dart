@@ -113,19 +113,30 @@ class BallSpriteComponent extends SpriteComponent
 
   final String? _assetPath;
 
+  /// Key of the latest state's image, so a slower load started for an
+  /// earlier theme does not replace it.
+  String? _key;
+
   @override
   void onNewState(BallState state) {
-    sprite = Sprite(
-      gameRef.images.fromCache(state.characterTheme.ball.keyName),
-    );
+    final key = state.characterTheme.ball.keyName;
+    _key = key;
+    // The balls are not loaded with the board, so one may still be loading.
+    if (gameRef.images.containsKey(key)) {
+      sprite = Sprite(gameRef.images.fromCache(key));
+    } else {
+      gameRef.images.load(key).then((image) {
+        if (_key == key) sprite = Sprite(image);
+      });
+    }
   }
 
   @override
   Future<void> onLoad() async {
     await super.onLoad();
     final sprite = Sprite(
-      gameRef.images
-          .fromCache(_assetPath ?? theme.Assets.images.dash.ball.keyName),
+      await gameRef.images
+          .load(_assetPath ?? theme.Assets.images.dash.ball.keyName),
     );
     this.sprite = sprite;
     size = sprite.originalSize / 12.5;
@@ -57,7 +57,7 @@ class ScoreComponent extends SpriteComponent with HasGameRef, ZIndex {
   Future<void> onLoad() async {
     await super.onLoad();
     final sprite = Sprite(
-      gameRef.images.fromCache(points.asset),
+      await gameRef.images.load(points.asset),
     );
     this.sprite = sprite;
     size = sprite.originalSize / 55;
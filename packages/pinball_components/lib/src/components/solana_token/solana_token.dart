@@ -113,7 +113,7 @@ class _SolanaTokenSprite extends SpriteAnimationComponent with HasGameRef {
   Future<void> onLoad() async {
     await super.onLoad();
 
-    final spriteSheet = gameRef.images.fromCache(
+    final spriteSheet = await gameRef.images.load(
       Assets.images.dino.solanaToken.keyName,
     );
 
@@ -13,6 +13,7 @@ import 'package:mocktail/mocktail.dart';
 import 'package:pinball/game/behaviors/behaviors.dart';
 import 'package:pinball/game/components/backbox/displays/displays.dart';
 import 'package:pinball/game/game.dart';
+import 'package:pinball/gen/gen.dart' show PreloadPlan;
 import 'package:pinball/select_character/select_character.dart';
 import 'package:pinball_audio/src/pinball_audio.dart';
 import 'package:pinball_components/pinball_components.dart';
@@ -33,7 +34,11 @@ class _TestPinballGame extends PinballGame {
 
   Future<void> preLoad() async {
     images.prefix = '';
-    final futures = preLoadAssets().map((loadableBuilder) => loadableBuilder());
+    final futures = [
+      ...preLoadAssets(),
+      ...attractAssets(),
+      ...lazyAssets(),
+    ].map((loadableBuilder) => loadableBuilder());
     await Future.wait<void>(futures);
   }
 }
@@ -52,7 +57,11 @@ class _TestDebugPinballGame extends DebugPinballGame {
 
   Future<void> preLoad() async {
     images.prefix = '';
-    final futures = preLoadAssets().map((loadableBuilder) => loadableBuilder());
+    final futures = [
+      ...preLoadAssets(),
+      ...attractAssets(),
+      ...lazyAssets(),
+    ].map((loadableBuilder) => loadableBuilder());
     await Future.wait<void>(futures);
   }
 }
@@ -118,6 +127,18 @@ void main() {
   group('PinballGame', () {
     final flameTester = FlameTester(_TestPinballGame.new);
 
+    test('PreloadPlan tiers hold every imageAssets key exactly once', () {
+      // Loading only goes through the tiers, so a key missing from them
+      // (tools/preload_plan.py not re-run) would never be loaded.
+      final tiers = [
+        ...PreloadPlan.critical,
+        ...PreloadPlan.attract,
+        ...PreloadPlan.lazy,
+      ];
+      expect(tiers.toSet().length, equals(tiers.length));
+      expect(tiers.toSet(), equals(_TestPinballGame().imageAssets.toSet()));
+    });
+
     group('components', () {
       flameTester.testGameWidget(
         'has only one BallSpawningBehavior',
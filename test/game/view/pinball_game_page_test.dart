@@ -37,6 +37,8 @@ class _TestPinballGame extends PinballGame {
     images.prefix = '';
     final futures = [
       ...preLoadAssets(),
+      ...attractAssets(),
+      ...lazyAssets(),
       ...BonusAnimation.loadAssets(),
       ...SelectedCharacter.loadAssets(),
       preFetchLeaderboard,
@@ -83,7 +85,11 @@ void main() {
 
     setUp(() async {
       await Future.wait<void>(
-        game.preLoadAssets().map((loadableBuilder) => loadableBuilder()),
+        [
+          ...game.preLoadAssets(),
+          ...game.attractAssets(),
+          ...game.lazyAssets(),
+        ].map((loadableBuilder) => loadableBuilder()),
       );
       characterThemeCubit = _MockCharacterThemeCubit();
       gameBloc = _MockGameBloc();
@@ -186,7 +192,11 @@ void main() {
 
     setUp(() async {
       await Future.wait<void>(
-        game.preLoadAssets().map((loadableBuilder) => loadableBuilder()),
+        [
+          ...game.preLoadAssets(),
+          ...game.attractAssets(),
+          ...game.lazyAssets(),
+        ].map((loadableBuilder) => loadableBuilder()),
       );
 
       whenListen(
@@ -1,36 +1,70 @@
-"""Analyze the frame taper by scanning per-row boundaries."""
-from PIL import Image
-import numpy as np
-
-# Use git to get the original file
-import subprocess
-result = subprocess.run(
-    ['git', 'show', 'HEAD~1:packages/pinball_components/assets/images/backbox/marquee.png'],
-    capture_output=True, cwd=r'D:\dev\seeker-pinball'
-)
-from io import BytesIO
-img = Image.open(BytesIO(result.stdout)).convert('RGBA')
-arr = np.array(img)
-W, H = img.size
-print(f'Original: {W}x{H}')
-
-brightness = np.max(arr[:, :, :3], axis=2)
-alpha = arr[:, :, 3]
-
-# Approximate artwork region (generous)
-art_top, art_bottom = 120, 1160
-art_left, art_right = 100, 2030
-
-# For each row, find leftmost and rightmost bright pixel
-print('\nPer-row boundaries (sampled every 50 rows):')
-for y in range(art_top, art_bottom, 50):
-    row_bright = brightness[y, art_left:art_right]
-    row_alpha = alpha[y, art_left:art_right]
-    bright_mask = (row_bright > 70) & (row_alpha > 200)
-    indices = np.where(bright_mask)[0]
-    if len(indices) > 0:
-        left = indices[0] + art_left
-        right = indices[-1] + art_left
-        print(f'  y={y:4d}: left={left:4d}, right={right:4d}, width={right-left:4d}')
-    else:
-        print(f'  y={y:4d}: no bright pixels')
+"""
+Analyze the frame taper by scanning per-row boundaries.
+
+    python tools/analyze_taper.py --rev HEAD~1
+"""
+
+import argparse
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: NumPy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from replace_marquee import MARQUEE_PATH
+from sprite_utils import open_image
+
+
+def _span(text):
+    start, _, end = text.partition(":")
+    return int(start), int(end)
+
+
+def row_bounds(arr, rows, left, right, min_brightness=70, min_alpha=200):
+    """[(y, first, last)] of bright opaque pixels per row, None where there are none."""
+    brightness = np.max(arr[:, :, :3], axis=2)
+    alpha = arr[:, :, 3]
+    out = []
+    for y in rows:
+        bright_mask = (brightness[y, left:right] > min_brightness) & (alpha[y, left:right] > min_alpha)
+        indices = np.where(bright_mask)[0]
+        if len(indices) > 0:
+            out.append((y, indices[0] + left, indices[-1] + left))
+        else:
+            out.append((y, None, None))
+    return out
+
+
+def print_bounds(bounds, empty="no bright pixels"):
+    for y, left, right in bounds:
+        if left is None:
+            print(f"  y={y:4d}: {empty}")
+        else:
+            print(f"  y={y:4d}: left={left:4d}, right={right:4d}, width={right-left:4d}")
+
+
+def main(defaults=None):
+    defaults = dict({"step": 50, "rows": "120:1160", "cols": "100:2030"}, **(defaults or {}))
+    parser = argparse.ArgumentParser(description="Per-row artwork boundaries of the marquee")
+    parser.add_argument("path", nargs="?", default=MARQUEE_PATH)
+    parser.add_argument("--rev", help="Read the image at this git revision (e.g. HEAD~1)")
+    parser.add_argument("--step", type=int, default=defaults["step"], help="Row sampling step")
+    parser.add_argument("--rows", default=defaults["rows"], help="Row range top:bottom")
+    parser.add_argument("--cols", default=defaults["cols"], help="Approximate artwork columns left:right")
+    args = parser.parse_args()
+
+    img = open_image(args.path, args.rev).convert("RGBA")
+    arr = np.array(img)
+    W, H = img.size
+    print(f"{'Original' if args.rev else 'Image'}: {W}x{H}")
+
+    top, bottom = _span(args.rows)
+    left, right = _span(args.cols)
+    print(f"\nPer-row boundaries (sampled every {args.step} rows):")
+    print_bounds(row_bounds(arr, range(top, bottom, args.step), left, right))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Find dead and duplicate assets in the Flutter bundle.
+
+Indexes every file the app and its packages bundle (the `flutter: assets:`
+entries of each pubspec.yaml) with a SHA-256 and, for images, a 64-bit
+perceptual difference hash. Each file is cross-referenced against the
+generated `Assets` accessors and the Dart sources that use them (or its
+path as a string literal), then the report lists:
+
+  - unreferenced files, with the bytes they add to the download
+  - exact duplicates (same SHA-256)
+  - near-duplicate images: perceptual hash within --distance bits and,
+    to confirm, no pixel of their 32x32 premultiplied RGBA thumbnails
+    differing by more than --tolerance
+
+    python tools/asset_audit.py [--json audit.json]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    print("ERROR: Pillow and NumPy required. Run: pip install Pillow numpy")
+    sys.exit(1)
+
+from dart_assets import REPO_ROOT, asset_key, bundled_files, load_accessors, package_dir, uses_chain
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".webp", ".gif")
+
+def sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+THUMB_SIZE = 32
+
+
+def perceptual_hash(path):
+    """
+    64-bit difference hash of the image composited on grey, its aspect
+    ratio and a small premultiplied RGBA thumbnail for confirmation.
+    """
+    with Image.open(path) as img:
+        img = img.convert("RGBA")
+        aspect = img.width / float(img.height)
+        flat = Image.new("RGBA", img.size, (128, 128, 128, 255))
+        flat.alpha_composite(img)
+        small = flat.convert("L").resize((9, 8), Image.BOX)
+        thumb = np.asarray(img.resize((THUMB_SIZE, THUMB_SIZE), Image.BOX), dtype=np.float32) / 255.0
+    thumb[..., :3] *= thumb[..., 3:]
+    px = np.asarray(small, dtype=np.int16)
+    bits = (px[:, 1:] > px[:, :-1]).ravel()
+    return int("".join("1" if b else "0" for b in bits), 2), aspect, thumb
+
+
+def dart_sources(root=REPO_ROOT):
+    """Non-generated Dart files of the app and its packages (lib/ only)."""
+    dirs = [os.path.join(root, "lib")]
+    packages = os.path.join(root, "packages")
+    if os.path.isdir(packages):
+        dirs += [os.path.join(packages, p, "lib") for p in sorted(os.listdir(packages))]
+    for base in dirs:
+        for dirpath, _, names in os.walk(base):
+            for name in names:
+                if name.endswith(".dart") and not name.endswith(".gen.dart"):
+                    yield os.path.join(dirpath, name)
+
+
+def referenced(root=REPO_ROOT):
+    """Accessor chains and string literals used by the Dart sources."""
+    chains, literals = set(), set()
+    for path in dart_sources(root):
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        collapsed = re.sub(r"\s+", "", text)
+        chains.update(re.findall(r"Assets\.([\w.]+)", collapsed))
+        literals.update(re.findall(r"'([^'\n]+\.\w+)'", text))
+        literals.update(re.findall(r'"([^"\n]+\.\w+)"', text))
+    return chains, literals
+
+
+def _is_used(chain, used_chains):
+    return chain is not None and any(uses_chain(used, chain) for used in used_chains)
+
+
+def audit(root=REPO_ROOT, distance=6, tolerance=0.05):
+    accessors = load_accessors(root)
+    used_chains, literals = referenced(root)
+    by_path = {
+        package: {path: chain for chain, path in chains.items()}
+        for package, chains in accessors.items()
+    }
+
+    index = []
+    for package, rel in bundled_files(root):
+        path = os.path.join(package_dir(package, root), *rel.split("/"))
+        chain = by_path.get(package, {}).get(rel)
+        key = asset_key(package, rel)
+        used = _is_used(chain, used_chains) or rel in literals or key in literals
+        entry = {
+            "key": key,
+            "file": os.path.relpath(path, root).replace(os.sep, "/"),
+            "bytes": os.path.getsize(path),
+            "sha256": sha256(path),
+            "accessor": f"Assets.{chain}" if chain else None,
+            "referenced": used,
+        }
+        if rel.lower().endswith(IMAGE_EXTS):
+            entry["phash"], entry["aspect"], entry["thumb"] = perceptual_hash(path)
+        index.append(entry)
+
+    unreferenced = [e for e in index if not e["referenced"]]
+
+    by_sha = {}
+    for e in index:
+        by_sha.setdefault(e["sha256"], []).append(e)
+    exact = [group for group in by_sha.values() if len(group) > 1]
+
+    images = [e for e in index if "phash" in e]
+    near = []
+    for i, a in enumerate(images):
+        for b in images[i + 1:]:
+            if a["sha256"] == b["sha256"]:
+                continue
+            if abs(a["aspect"] - b["aspect"]) > 0.1 * max(a["aspect"], b["aspect"]):
+                continue
+            bits = bin(a["phash"] ^ b["phash"]).count("1")
+            if bits > distance:
+                continue
+            # The hash only sees coarse luma structure, which the states of
+            # one sprite (lit/dimmed, active1..n) share. They differ in one
+            # segment, which a mean over the thumbnail averages away, so
+            # confirm on the largest per-pixel difference instead.
+            if float(np.abs(a["thumb"] - b["thumb"]).max()) <= tolerance:
+                near.append((bits, a, b))
+    near.sort(key=lambda n: (n[0], -min(n[1]["bytes"], n[2]["bytes"])))
+    return index, unreferenced, exact, near
+
+
+def _kb(n):
+    return f"{n / 1024:8.1f} KB"
+
+
+def print_report(index, unreferenced, exact, near):
+    total = sum(e["bytes"] for e in index)
+    print(f"{len(index)} bundled files, {total / 1024:.0f} KB")
+
+    dead = sum(e["bytes"] for e in unreferenced)
+    print(f"\nUnreferenced: {len(unreferenced)} files, {dead / 1024:.0f} KB")
+    for e in sorted(unreferenced, key=lambda e: e["bytes"], reverse=True):
+        accessor = e["accessor"] or "no accessor"
+        print(f"  {_kb(e['bytes'])}  {e['file']}  ({accessor})")
+
+    wasted = sum(sum(e["bytes"] for e in group[1:]) for group in exact)
+    print(f"\nExact duplicates: {len(exact)} groups, {wasted / 1024:.0f} KB redundant")
+    for group in exact:
+        print(f"  {_kb(group[0]['bytes'])}  x{len(group)}")
+        for e in group:
+            print(f"      {e['file']}")
+
+    saving = sum(min(a["bytes"], b["bytes"]) for _, a, b in near)
+    print(f"\nNear duplicates: {len(near)} pairs, up to {saving / 1024:.0f} KB")
+    for bits, a, b in near:
+        print(f"  {bits:2d} bits  {_kb(a['bytes'])} {a['file']}")
+        print(f"           {_kb(b['bytes'])} {b['file']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report dead and duplicate bundled assets")
+    parser.add_argument("--distance", type=int, default=6,
+                        help="Max perceptual hash distance (bits of 64) for near duplicates")
+    parser.add_argument("--tolerance", type=float, default=0.05,
+                        help="Max per-pixel thumbnail difference (0-1) to confirm a near duplicate")
+    parser.add_argument("--json", help="Also write the index and findings as JSON here")
+    args = parser.parse_args()
+
+    index, unreferenced, exact, near = audit(distance=args.distance, tolerance=args.tolerance)
+    print_report(index, unreferenced, exact, near)
+
+    if args.json:
+        report = {
+            "index": [{k: v for k, v in e.items() if k not in ("aspect", "thumb")} for e in index],
+            "unreferenced": [e["file"] for e in unreferenced],
+            "exact": [[e["file"] for e in group] for group in exact],
+            "near": [{"bits": bits, "files": [a["file"], b["file"]]} for bits, a, b in near],
+        }
+        for e in report["index"]:
+            if "phash" in e:
+                e["phash"] = f"{e['phash']:016x}"
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\nReport: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
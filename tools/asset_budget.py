@@ -0,0 +1,217 @@
+"""
+Image inventory and decode-memory budgets for the bundled assets.
+
+Reads only the PNG IHDR / JPEG SOF headers of every bundled image (no
+pixel decode, so the whole tree takes milliseconds) and reports file
+bytes, decoded RGBA bytes and the extra bytes a power-of-two texture
+would need, per asset, per component (first directory under
+assets/images) and per package or theme. Budgets from a JSON file are
+enforced; the exit status is 1 when any is exceeded, so the check can
+fail an asset build:
+
+    python tools/asset_budget.py                      # report + budgets
+    python tools/asset_budget.py --budgets other.json --top 30
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+
+from dart_assets import REPO_ROOT, bundled_files, package_dir
+
+DEFAULT_BUDGETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "asset_budgets.json")
+
+MB = 1024 * 1024
+
+# JPEG start-of-frame markers (baseline, progressive, lossless...).
+_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def png_size(f):
+    head = f.read(24)
+    if len(head) < 24 or head[:8] != b"\x89PNG\r\n\x1a\n" or head[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", head[16:24])
+
+
+def jpeg_size(f):
+    if f.read(2) != b"\xff\xd8":
+        return None
+    while True:
+        byte = f.read(1)
+        while byte and byte != b"\xff":
+            byte = f.read(1)
+        while byte == b"\xff":
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            continue
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack(">H", length_bytes)[0]
+        if marker in _SOF_MARKERS:
+            data = f.read(5)
+            if len(data) < 5:
+                return None
+            height, width = struct.unpack(">HH", data[1:5])
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def image_size(path):
+    """(width, height) from the file header, or None if not a PNG/JPEG."""
+    with open(path, "rb") as f:
+        head = f.read(2)
+        f.seek(0)
+        if head == b"\x89P":
+            return png_size(f)
+        if head == b"\xff\xd8":
+            return jpeg_size(f)
+    return None
+
+
+def next_pow2(n):
+    return 1 << max(0, (n - 1).bit_length())
+
+
+def group_of(package, rel):
+    """Component (first directory under assets/images) or theme of an asset."""
+    parts = rel.split("/")
+    if parts[:2] == ["assets", "images"]:
+        parts = parts[2:]
+    component = parts[0] if len(parts) > 1 else "(root)"
+    return f"{package or 'app'}/{component}"
+
+
+def inventory(root=REPO_ROOT):
+    items = []
+    for package, rel in bundled_files(root):
+        path = os.path.join(package_dir(package, root), *rel.split("/"))
+        size = image_size(path)
+        if size is None:
+            continue
+        width, height = size
+        decoded = width * height * 4
+        padded = next_pow2(width) * next_pow2(height) * 4
+        items.append({
+            "file": os.path.relpath(path, root).replace(os.sep, "/"),
+            "package": package or "app",
+            "group": group_of(package, rel),
+            "width": width,
+            "height": height,
+            "bytes": os.path.getsize(path),
+            "decoded": decoded,
+            "pow2_waste": padded - decoded,
+        })
+    return items
+
+
+def totals(items, key):
+    out = {}
+    for item in items:
+        t = out.setdefault(item[key], {"count": 0, "bytes": 0, "decoded": 0, "pow2_waste": 0})
+        t["count"] += 1
+        for field in ("bytes", "decoded", "pow2_waste"):
+            t[field] += item[field]
+    return out
+
+
+def check_budgets(items, budgets):
+    """List of human-readable budget violations."""
+    failures = []
+    limit = budgets.get("total_decoded_mb")
+    total = sum(i["decoded"] for i in items)
+    if limit is not None and total > limit * MB:
+        failures.append(f"total decoded {total / MB:.1f} MB > {limit} MB")
+    limit = budgets.get("total_bytes_mb")
+    total = sum(i["bytes"] for i in items)
+    if limit is not None and total > limit * MB:
+        failures.append(f"total file size {total / MB:.1f} MB > {limit} MB")
+
+    limit = budgets.get("asset_decoded_mb")
+    exceptions = budgets.get("asset_exceptions", {})
+    for item in items:
+        item_limit = exceptions.get(item["file"], limit)
+        if item_limit is not None and item["decoded"] > item_limit * MB:
+            failures.append(f"{item['file']} decodes to {item['decoded'] / MB:.1f} MB > {item_limit} MB")
+
+    for scope in ("groups", "packages"):
+        key = "group" if scope == "groups" else "package"
+        sums = totals(items, key)
+        for name, limit in budgets.get(scope, {}).items():
+            decoded = sums.get(name, {}).get("decoded", 0)
+            if decoded > limit * MB:
+                failures.append(f"{name} decodes to {decoded / MB:.1f} MB > {limit} MB")
+    return failures
+
+
+def _row(label, t):
+    return (f"  {t['count']:4d}  {t['bytes'] / 1024:9.0f} KB  {t['decoded'] / MB:8.1f} MB"
+            f"  {t['pow2_waste'] / MB:8.1f} MB  {label}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Header-only image inventory with memory budgets")
+    parser.add_argument("--budgets", default=DEFAULT_BUDGETS, help="Budget JSON (default: tools/asset_budgets.json)")
+    parser.add_argument("--no-budgets", action="store_true", help="Report only")
+    parser.add_argument("--top", type=int, default=15, help="Largest assets to list, 0 for none")
+    parser.add_argument("--json", help="Also write the inventory as JSON here")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    items = inventory()
+    elapsed = (time.perf_counter() - start) * 1000
+
+    header = f"  {'n':>4s}  {'file':>12s}  {'decoded':>11s}  {'pow2 waste':>11s}"
+    print(f"{len(items)} images, headers read in {elapsed:.0f}ms")
+    print(header)
+    total = {
+        "count": len(items),
+        "bytes": sum(i["bytes"] for i in items),
+        "decoded": sum(i["decoded"] for i in items),
+        "pow2_waste": sum(i["pow2_waste"] for i in items),
+    }
+    print(_row("total", total))
+
+    print("\nPer package:")
+    for name, t in sorted(totals(items, "package").items(), key=lambda kv: -kv[1]["decoded"]):
+        print(_row(name, t))
+    print("\nPer component / theme:")
+    for name, t in sorted(totals(items, "group").items(), key=lambda kv: -kv[1]["decoded"]):
+        print(_row(name, t))
+    if args.top > 0:
+        print(f"\nLargest {args.top} by decoded size:")
+        for item in sorted(items, key=lambda i: -i["decoded"])[:args.top]:
+            t = dict(item, count=1)
+            print(_row(f"{item['file']} ({item['width']}x{item['height']})", t))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(items, f, indent=1)
+            f.write("\n")
+        print(f"\nInventory: {args.json}")
+
+    if args.no_budgets:
+        return
+    if not os.path.exists(args.budgets):
+        print(f"\nNo budget file at {args.budgets}")
+        return
+    with open(args.budgets) as f:
+        budgets = json.load(f)
+    failures = check_budgets(items, budgets)
+    if failures:
+        print(f"\nBUDGET EXCEEDED ({len(failures)}):")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print(f"\nAll budgets in {os.path.basename(args.budgets)} met")
+
+
+if __name__ == "__main__":
+    main()
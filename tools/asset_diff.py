@@ -0,0 +1,312 @@
+"""
+Perceptual diff of images or whole asset trees, across git revisions.
+
+Each side is a file or directory on disk, or `REV:path` read straight
+from git (like `git show`, without a checkout). Trees are paired by
+relative path; files whose bytes are identical are skipped, the rest are
+compared in a process pool:
+
+  - mean absolute difference per R, G, B and alpha channel
+  - fraction of pixels that changed by more than 2/255
+  - SSIM (7x7 box windows) of the luma of both images composited on grey
+    (only the bounding box of differing pixels is analyzed; the rest of
+    a sheet is known to be identical)
+  - DSSIM = (1 - SSIM) / 2, which the report is ranked by
+
+With --heatmaps a PNG per changed image shows the per-pixel difference in
+red-to-yellow over a greyed copy of the new image.
+
+    python tools/asset_diff.py old.png new.png --heatmaps /tmp/diff
+    python tools/asset_diff.py HEAD~1:packages/pinball_components/assets/images \\
+        packages/pinball_components/assets/images --top 20
+    python tools/asset_diff.py HEAD~3:test/game/components/golden HEAD:test/game/components/golden
+"""
+
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    print("ERROR: Pillow and NumPy required. Run: pip install Pillow numpy")
+    sys.exit(1)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".webp")
+
+SSIM_WINDOW = 7
+_C1 = 0.01 ** 2
+_C2 = 0.03 ** 2
+CHANGE_THRESHOLD = 2 / 255.0
+
+
+def _git(args, **kwargs):
+    return subprocess.run(["git"] + args, cwd=REPO_ROOT, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE, check=False, **kwargs)
+
+
+class FileSource:
+    """Images under a file or directory on disk."""
+
+    def __init__(self, path):
+        self.path = path
+        self.label = path
+
+    def list(self):
+        if os.path.isfile(self.path):
+            return {os.path.basename(self.path): self.path}
+        out = {}
+        for dirpath, _, names in os.walk(self.path):
+            for name in names:
+                if name.lower().endswith(IMAGE_EXTS):
+                    full = os.path.join(dirpath, name)
+                    out[os.path.relpath(full, self.path).replace(os.sep, "/")] = full
+        return out
+
+    def read(self, refs):
+        out = {}
+        for rel, full in refs.items():
+            with open(full, "rb") as f:
+                out[rel] = f.read()
+        return out
+
+
+class GitSource:
+    """Images under a path at a git revision, read with one cat-file process."""
+
+    def __init__(self, revision, path):
+        self.revision = revision
+        self.path = path.strip("/")
+        self.label = f"{revision}:{self.path}"
+
+    def list(self):
+        result = _git(["ls-tree", "-r", "--name-only", self.revision, "--", self.path], text=True)
+        if result.returncode != 0:
+            print(f"ERROR: git ls-tree failed: {result.stderr.strip()}")
+            sys.exit(1)
+        names = [n for n in result.stdout.splitlines() if n.lower().endswith(IMAGE_EXTS)]
+        if names == [self.path]:
+            return {os.path.basename(self.path): self.path}
+        prefix = self.path + "/" if self.path else ""
+        return {n[len(prefix):]: n for n in names}
+
+    def read(self, refs):
+        if not refs:
+            return {}
+        request = "".join(f"{self.revision}:{path}\n" for path in refs.values()).encode()
+        result = _git(["cat-file", "--batch"], input=request)
+        data, out, pos = result.stdout, {}, 0
+        for rel in refs:
+            end = data.index(b"\n", pos)
+            header = data[pos:end].split()
+            pos = end + 1
+            if len(header) < 3 or header[1] != b"blob":
+                continue
+            size = int(header[2])
+            out[rel] = data[pos:pos + size]
+            pos += size + 1
+        return out
+
+
+def open_source(spec):
+    """FileSource for paths on disk, GitSource for `REV:path`."""
+    if os.path.exists(spec) or ":" not in spec:
+        return FileSource(spec)
+    revision, _, path = spec.partition(":")
+    check = _git(["rev-parse", "--verify", "--quiet", f"{revision}^{{commit}}"])
+    if check.returncode != 0:
+        print(f"ERROR: {spec} is neither a path nor REV:path")
+        sys.exit(1)
+    return GitSource(revision, path)
+
+
+def _load(data):
+    with Image.open(io.BytesIO(data)) as img:
+        return np.asarray(img.convert("RGBA"))
+
+
+def _pad(arr, height, width):
+    if arr.shape[:2] == (height, width):
+        return arr
+    out = np.zeros((height, width, 4), dtype=np.uint8)
+    out[:arr.shape[0], :arr.shape[1]] = arr
+    return out
+
+
+def _box_mean(arr, size):
+    """Mean over size x size windows (valid region) via an integral image."""
+    integral = np.zeros((arr.shape[0] + 1, arr.shape[1] + 1), dtype=np.float64)
+    integral[1:, 1:] = arr.cumsum(0).cumsum(1)
+    total = (integral[size:, size:] - integral[:-size, size:]
+             - integral[size:, :-size] + integral[:-size, :-size])
+    return total / (size * size)
+
+
+def _premultiplied(rgba):
+    """uint8 RGBA -> float32 premultiplied RGBA in [0, 1]."""
+    out = rgba.astype(np.float32) / 255.0
+    out[..., :3] *= out[..., 3:]
+    return out
+
+
+def _luma_on_grey(premul):
+    rgb = premul[..., :3] + 0.5 * (1.0 - premul[..., 3:])
+    return rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def ssim_map(a, b, size=SSIM_WINDOW):
+    """SSIM of every size x size window of two greyscale arrays in [0, 1]."""
+    mu_a, mu_b = _box_mean(a, size), _box_mean(b, size)
+    var_a = _box_mean(a * a, size) - mu_a * mu_a
+    var_b = _box_mean(b * b, size) - mu_b * mu_b
+    cov = _box_mean(a * b, size) - mu_a * mu_b
+    return ((2 * mu_a * mu_b + _C1) * (2 * cov + _C2)) / (
+        (mu_a * mu_a + mu_b * mu_b + _C1) * (var_a + var_b + _C2))
+
+
+def heatmap(diff, new):
+    """Difference (0-1 per pixel) in red->yellow over a dimmed grey `new`."""
+    grey = _luma_on_grey(_premultiplied(new)) * 0.35
+    level = np.clip(diff * 4.0, 0.0, 1.0)
+    out = np.empty(diff.shape + (3,), dtype=np.float32)
+    out[..., 0] = grey + (1.0 - grey) * np.minimum(level * 2.0, 1.0)
+    out[..., 1] = grey * (1.0 - level) + np.clip(level * 2.0 - 1.0, 0.0, 1.0)
+    out[..., 2] = grey * (1.0 - level)
+    return Image.fromarray((np.clip(out, 0.0, 1.0) * 255 + 0.5).astype(np.uint8), "RGB")
+
+
+def compare(job):
+    """Metrics for one (name, old bytes, new bytes, heatmap path) job."""
+    name, old_data, new_data, heatmap_path = job
+    old, new = _load(old_data), _load(new_data)
+    result = {"name": name, "old_size": [old.shape[1], old.shape[0]], "new_size": [new.shape[1], new.shape[0]]}
+    height, width = max(old.shape[0], new.shape[0]), max(old.shape[1], new.shape[1])
+    old, new = _pad(old, height, width), _pad(new, height, width)
+    size = max(1, min(SSIM_WINDOW, height, width))
+    pixels = height * width
+    windows = (height - size + 1) * (width - size + 1)
+
+    # Sheets are large and edits usually local: everything below only
+    # looks at the bounding box of differing pixels. Identical windows have
+    # an SSIM of exactly 1, so the crop is grown by one window to cover
+    # every window that touches a change.
+    differs = (old != new).any(axis=2)
+    rows, cols = np.flatnonzero(differs.any(axis=1)), np.flatnonzero(differs.any(axis=0))
+    if not rows.size:
+        result.update({"r": 0.0, "g": 0.0, "b": 0.0, "alpha": 0.0, "max": 0.0,
+                       "changed": 0.0, "ssim": 1.0, "dssim": 0.0})
+        return result
+    y0, y1 = max(0, rows[0] - size + 1), min(height, rows[-1] + size)
+    x0, x1 = max(0, cols[0] - size + 1), min(width, cols[-1] + size)
+
+    # Colour is compared premultiplied so invisible pixels do not count.
+    old_pm = _premultiplied(old[y0:y1, x0:x1])
+    new_pm = _premultiplied(new[y0:y1, x0:x1])
+    delta = np.abs(new_pm - old_pm)
+    channel = delta.reshape(-1, 4).sum(axis=0) / pixels
+    per_pixel = delta.max(axis=2)
+
+    local = ssim_map(_luma_on_grey(old_pm), _luma_on_grey(new_pm), size)
+    score = (float(local.sum()) + windows - local.size) / windows
+    result.update({
+        "r": float(channel[0]), "g": float(channel[1]), "b": float(channel[2]), "alpha": float(channel[3]),
+        "max": float(per_pixel.max()),
+        "changed": float((per_pixel > CHANGE_THRESHOLD).sum()) / pixels,
+        "ssim": score,
+        "dssim": (1.0 - score) / 2.0,
+    })
+    if heatmap_path and result["max"] > CHANGE_THRESHOLD:
+        full = np.zeros((height, width), dtype=np.float32)
+        full[y0:y1, x0:x1] = per_pixel
+        os.makedirs(os.path.dirname(heatmap_path), exist_ok=True)
+        heatmap(full, new).save(heatmap_path, optimize=False)
+        result["heatmap"] = heatmap_path
+    return result
+
+
+def diff_trees(old_source, new_source, heatmap_dir=None, workers=None):
+    """(ranked results, added, removed, identical count)."""
+    old_refs, new_refs = old_source.list(), new_source.list()
+    if len(old_refs) == 1 and len(new_refs) == 1 and set(old_refs) != set(new_refs):
+        # Two single files with different names: compare them directly.
+        new_refs = {next(iter(old_refs)): next(iter(new_refs.values()))}
+    common = sorted(set(old_refs) & set(new_refs))
+    added = sorted(set(new_refs) - set(old_refs))
+    removed = sorted(set(old_refs) - set(new_refs))
+
+    old_data = old_source.read({n: old_refs[n] for n in common})
+    new_data = new_source.read({n: new_refs[n] for n in common})
+    jobs, identical = [], 0
+    for name in common:
+        if name not in old_data or name not in new_data:
+            continue
+        if old_data[name] == new_data[name]:
+            identical += 1
+            continue
+        path = None
+        if heatmap_dir:
+            path = os.path.join(heatmap_dir, os.path.splitext(name)[0] + ".diff.png")
+        jobs.append((name, old_data[name], new_data[name], path))
+
+    if len(jobs) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(compare, jobs, chunksize=max(1, len(jobs) // 32)))
+    else:
+        results = [compare(job) for job in jobs]
+    results.sort(key=lambda r: (r["dssim"], r["changed"], r["max"]), reverse=True)
+    return results, added, removed, identical
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perceptual diff of images or asset trees")
+    parser.add_argument("old", help="File, directory or REV:path")
+    parser.add_argument("new", help="File, directory or REV:path")
+    parser.add_argument("--heatmaps", help="Write a difference heat map per changed image here")
+    parser.add_argument("--top", type=int, default=30, help="Changed images to list")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--json", help="Also write the results as JSON here")
+    args = parser.parse_args()
+
+    old_source, new_source = open_source(args.old), open_source(args.new)
+    start = time.perf_counter()
+    results, added, removed, identical = diff_trees(old_source, new_source, args.heatmaps, args.workers)
+    elapsed = time.perf_counter() - start
+
+    print(f"{old_source.label} -> {new_source.label}")
+    print(f"  {len(results)} changed, {identical} identical, {len(added)} added, "
+          f"{len(removed)} removed ({elapsed:.1f}s)")
+    if results:
+        print(f"\n  {'dssim':>7s} {'ssim':>6s} {'changed':>8s} {'max':>5s} "
+              f"{'R':>6s} {'G':>6s} {'B':>6s} {'A':>6s}  file")
+        for r in results[:args.top]:
+            resized = "" if r["old_size"] == r["new_size"] else \
+                f"  ({r['old_size'][0]}x{r['old_size'][1]} -> {r['new_size'][0]}x{r['new_size'][1]})"
+            print(f"  {r['dssim']:7.4f} {r['ssim']:6.3f} {r['changed'] * 100:7.2f}% {r['max'] * 255:5.0f} "
+                  f"{r['r'] * 255:6.2f} {r['g'] * 255:6.2f} {r['b'] * 255:6.2f} {r['alpha'] * 255:6.2f}  "
+                  f"{r['name']}{resized}")
+        if len(results) > args.top:
+            print(f"  ... {len(results) - args.top} more")
+    for name in added:
+        print(f"  + {name}")
+    for name in removed:
+        print(f"  - {name}")
+    if args.heatmaps and results:
+        print(f"\nHeat maps: {args.heatmaps}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"changed": results, "added": added, "removed": removed, "identical": identical}, f, indent=2)
+            f.write("\n")
+        print(f"Results: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
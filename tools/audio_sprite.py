@@ -0,0 +1,178 @@
+"""
+Build audio sprites from the pinball_audio SFX.
+
+Decodes every SFX with a local ffmpeg to PCM, concatenates them with
+silence padding into one (or, with --max-seconds, a few) sprite files
+and writes a JSON offset table the audio layer can seek into. MP3 is
+always written; --opus adds an Ogg/Opus copy for browsers that prefer
+it. Each sprite gets a start per format: the Opus start is the exact
+sample position in the concatenated PCM (decoders must honour the Opus
+pre-skip), the MP3 start adds the LAME encoder delay (MP3_DELAY_FRAMES).
+
+The MP3 sprites are written without a Xing/LAME header, so no decoder
+can trim that delay and every player sees the same priming. The caveat
+is the decoder half of the delay: MP3_DELAY_FRAMES assumes the usual
+529-sample decoder delay (ffmpeg, mpg123 and the browsers built on
+them); a decoder with a different one lands that many samples off.
+
+    python tools/audio_sprite.py [--opus] [--gap-ms 250] [--max-seconds 20]
+
+Requires ffmpeg on PATH.
+"""
+
+import argparse
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SFX_DIR = os.path.join(REPO_ROOT, "packages", "pinball_audio", "assets", "sfx")
+OUTPUT_DIR = os.path.join(REPO_ROOT, "packages", "pinball_audio", "assets", "sprites")
+
+# Opus only runs at 48 kHz; using it for the PCM too keeps offsets identical
+# between the MP3 and Opus outputs.
+SAMPLE_RATE = 48000
+CHANNELS = 2
+BYTES_PER_FRAME = 2 * CHANNELS  # s16le
+
+# Samples of priming a decoded libmp3lame stream starts with: 576 of
+# encoder delay plus 529 of decoder delay, the same initial padding ffmpeg
+# reports for the encoder. MPEG-1 Layer III, so it holds at 48 kHz.
+MP3_DELAY_FRAMES = 576 + 529
+
+
+def find_ffmpeg():
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        print("ERROR: ffmpeg not found on PATH. Install it (e.g. apt install ffmpeg / brew install ffmpeg)")
+        sys.exit(1)
+    return ffmpeg
+
+
+def decode_pcm(ffmpeg, path):
+    """Decode to interleaved s16le stereo at SAMPLE_RATE. Returns bytes."""
+    result = subprocess.run(
+        [ffmpeg, "-v", "error", "-i", path, "-f", "s16le", "-acodec", "pcm_s16le",
+         "-ac", str(CHANNELS), "-ar", str(SAMPLE_RATE), "-"],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed on {path}: {result.stderr.decode(errors='replace').strip()}")
+    return result.stdout
+
+
+def encode(ffmpeg, pcm, path, codec_args):
+    result = subprocess.run(
+        [ffmpeg, "-v", "error", "-y", "-f", "s16le", "-ac", str(CHANNELS), "-ar", str(SAMPLE_RATE),
+         "-i", "-"] + codec_args + [path],
+        input=pcm, stderr=subprocess.PIPE, check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed writing {path}: {result.stderr.decode(errors='replace').strip()}")
+
+
+def pack(clips, gap_frames, max_frames=None):
+    """
+    Split (name, pcm) clips into sprites. Each clip starts after a gap of
+    silence so a late stop never bleeds into the next sound. Returns a
+    list of sprites, each a list of (name, start_frame, frames).
+    """
+    sprites, current, cursor = [], [], 0
+    for name, pcm in clips:
+        frames = len(pcm) // BYTES_PER_FRAME
+        start = cursor + (gap_frames if current else 0)
+        if current and max_frames and start + frames > max_frames:
+            sprites.append(current)
+            current, start = [], 0
+        current.append((name, start, frames))
+        cursor = start + frames
+    if current:
+        sprites.append(current)
+    return sprites
+
+
+def render(layout, pcm_by_name, tail_frames):
+    """Concatenate one sprite's clips into a PCM buffer."""
+    end = max(start + frames for _, start, frames in layout) + tail_frames
+    out = bytearray(end * BYTES_PER_FRAME)
+    for name, start, frames in layout:
+        offset = start * BYTES_PER_FRAME
+        out[offset:offset + frames * BYTES_PER_FRAME] = pcm_by_name[name][:frames * BYTES_PER_FRAME]
+    return bytes(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concatenate SFX into audio sprites")
+    parser.add_argument("--input", default=SFX_DIR, help="Directory of source clips")
+    parser.add_argument("--output", default=OUTPUT_DIR, help="Directory for sprites and the offset table")
+    parser.add_argument("--name", default="sfx", help="Base name of the sprite files")
+    parser.add_argument("--gap-ms", type=int, default=250, help="Silence between clips")
+    parser.add_argument("--max-seconds", type=float,
+                        help="Start a new sprite when one would exceed this length")
+    parser.add_argument("--bitrate", default="96k", help="MP3 bitrate")
+    parser.add_argument("--opus", action="store_true", help="Also write an Ogg/Opus copy")
+    parser.add_argument("--opus-bitrate", default="64k")
+    args = parser.parse_args()
+
+    ffmpeg = find_ffmpeg()
+    sources = sorted(glob.glob(os.path.join(args.input, "*.mp3")) +
+                     glob.glob(os.path.join(args.input, "*.wav")) +
+                     glob.glob(os.path.join(args.input, "*.ogg")))
+    if not sources:
+        print(f"ERROR: no audio files in {args.input}")
+        sys.exit(1)
+
+    print(f"Decoding {len(sources)} clips...")
+    clips = []
+    for path in sources:
+        name = os.path.splitext(os.path.basename(path))[0]
+        clips.append((name, decode_pcm(ffmpeg, path)))
+
+    gap = int(SAMPLE_RATE * args.gap_ms / 1000)
+    max_frames = int(SAMPLE_RATE * args.max_seconds) if args.max_seconds else None
+    sprites = pack(clips, gap, max_frames)
+    pcm_by_name = dict(clips)
+
+    os.makedirs(args.output, exist_ok=True)
+    table = {"sampleRate": SAMPLE_RATE, "files": [], "sprites": {}}
+    source_bytes = sum(os.path.getsize(p) for p in sources)
+    sprite_bytes = 0
+    for index, layout in enumerate(sprites):
+        base = args.name if len(sprites) == 1 else f"{args.name}_{index}"
+        pcm = render(layout, pcm_by_name, gap)
+        files = {"mp3": f"{base}.mp3"}
+        encode(ffmpeg, pcm, os.path.join(args.output, files["mp3"]),
+               ["-codec:a", "libmp3lame", "-b:a", args.bitrate, "-write_xing", "0"])
+        if args.opus:
+            files["ogg"] = f"{base}.ogg"
+            encode(ffmpeg, pcm, os.path.join(args.output, files["ogg"]),
+                   ["-codec:a", "libopus", "-b:a", args.opus_bitrate])
+        table["files"].append(files)
+        for name, start, frames in layout:
+            starts = {"mp3": round((start + MP3_DELAY_FRAMES) / SAMPLE_RATE, 4)}
+            if args.opus:
+                starts["ogg"] = round(start / SAMPLE_RATE, 4)
+            table["sprites"][name] = {
+                "file": index,
+                "start": starts,
+                "duration": round(frames / SAMPLE_RATE, 4),
+            }
+        size = os.path.getsize(os.path.join(args.output, files["mp3"]))
+        sprite_bytes += size
+        seconds = len(pcm) / BYTES_PER_FRAME / SAMPLE_RATE
+        print(f"  {files['mp3']}: {len(layout)} clips, {seconds:.1f}s, {size / 1024:.0f} KB")
+
+    table_path = os.path.join(args.output, f"{args.name}.json")
+    with open(table_path, "w") as f:
+        json.dump(table, f, indent=2)
+        f.write("\n")
+    print(f"{len(sources)} requests -> {len(sprites)} "
+          f"({source_bytes / 1024:.0f} KB -> {sprite_bytes / 1024:.0f} KB MP3)")
+    print(f"Offset table: {table_path}")
+
+
+if __name__ == "__main__":
+    main()
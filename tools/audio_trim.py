@@ -0,0 +1,309 @@
+"""
+Trim silence from the pinball_audio SFX and normalize their loudness.
+
+Every SFX (and the background music) is decoded with a local ffmpeg,
+analyzed with NumPy and re-encoded at its own bitrate and sample rate
+(--bitrate caps the bitrate), so a pass never grows a file:
+
+  - leading and trailing silence is found with RMS windows (10ms by
+    default) against a dBFS threshold; a short pre-roll is kept before
+    the onset and a fade-out after the tail so nothing clicks.
+  - the re-encode keeps a Xing/LAME header declaring its encoder delay.
+    Players that honour it start at the first sample; the rest hear the
+    ~25ms of LAME priming again, so the report gives the lead-in removed
+    net of that delay (and of the delay a source header already hid).
+  - integrated loudness is measured per ITU-R BS.1770 (K-weighting,
+    400ms blocks, absolute and relative gating) and the clip is gained
+    to --target LUFS, limited so the sample peak stays under --ceiling.
+
+The music is normalized to --music-target and only has its lead
+trimmed. The file gets shorter, but everything from the first onset to
+the end is kept, so the loop period measured from that onset is too.
+
+Results go to tools/trimmed_audio/ (or --output); --in-place replaces
+the bundled files instead.
+
+    python tools/audio_trim.py --dry-run        # report only
+    python tools/audio_trim.py                  # write to tools/trimmed_audio/
+    python tools/audio_trim.py --output /tmp/sfx
+    python tools/audio_trim.py --in-place       # rewrite the bundled files
+
+Requires ffmpeg on PATH.
+"""
+
+import argparse
+import glob
+import os
+import subprocess
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: NumPy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from audio_sprite import MP3_DELAY_FRAMES, find_ffmpeg
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AUDIO_DIR = os.path.join(REPO_ROOT, "packages", "pinball_audio", "assets")
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "trimmed_audio")
+
+# The BS.1770 K-weighting filter is specified at 48 kHz, so analysis runs
+# there whatever the source rate.
+SAMPLE_RATE = 48000
+CHANNELS = 2
+
+# BS.1770 pre-filter (high shelf) and RLB high-pass, 48 kHz biquads.
+_SHELF = ([1.53512485958697, -2.69169618940638, 1.19839281085285],
+          [1.0, -1.69065929318241, 0.73248077421585])
+_HIGHPASS = ([1.0, -2.0, 1.0],
+             [1.0, -1.99004745483398, 0.99007225036621])
+
+BLOCK_SECONDS = 0.4
+BLOCK_HOP = 0.1
+ABSOLUTE_GATE = -70.0
+RELATIVE_GATE = -10.0
+
+# MPEG-1 Layer III CBR bitrates (kbps) and the sample rates per version id.
+BITRATES = (32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+_LAME_TAGS = (b"LAME", b"Lavc", b"Lavf")
+# Samples a decoder adds on top of the encoder delay a LAME tag records.
+_DECODER_DELAY = 529
+
+
+def mp3_info(path):
+    """
+    (sample_rate, audio_bytes, encoder_delay) read from the first MPEG
+    frame. encoder_delay is None without a Xing/LAME tag.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    start, end = 0, len(data)
+    if data[:3] == b"ID3":
+        start = 10 + (data[6] << 21 | data[7] << 14 | data[8] << 7 | data[9])
+        if data[5] & 0x10:
+            start += 10
+    if data[-128:-125] == b"TAG":
+        end -= 128
+    while start + 4 <= end and not (data[start] == 0xFF and data[start + 1] & 0xE0 == 0xE0):
+        start += 1
+    if start + 4 > end:
+        raise ValueError(f"{path}: no MPEG audio frame")
+    version, rate_index = data[start + 1] >> 3 & 3, data[start + 2] >> 2 & 3
+    if version not in _SAMPLE_RATES or rate_index == 3:
+        raise ValueError(f"{path}: unsupported MPEG frame header")
+    mono = data[start + 3] >> 6 == 3
+    side_info = (17 if mono else 32) if version == 3 else (9 if mono else 17)
+    delay = None
+    tag = start + 4 + side_info
+    if data[tag:tag + 4] in (b"Xing", b"Info"):
+        flags = int.from_bytes(data[tag + 4:tag + 8], "big")
+        lame = tag + 8 + 4 * (flags & 1) + 4 * (flags >> 1 & 1) + 100 * (flags >> 2 & 1) + 4 * (flags >> 3 & 1)
+        if data[lame:lame + 4] in _LAME_TAGS:
+            delay = data[lame + 21] << 4 | data[lame + 22] >> 4
+    return _SAMPLE_RATES[version][rate_index], end - start, delay
+
+
+def source_bitrate(audio_bytes, seconds):
+    """Nearest CBR bitrate (kbps) to the average of a file."""
+    kbps = audio_bytes * 8 / max(seconds, 1e-3) / 1000
+    return min(BITRATES, key=lambda b: abs(b - kbps))
+
+
+def decode(ffmpeg, path):
+    """(frames, CHANNELS) float32 samples at SAMPLE_RATE."""
+    result = subprocess.run(
+        [ffmpeg, "-v", "error", "-i", path, "-f", "f32le", "-acodec", "pcm_f32le",
+         "-ac", str(CHANNELS), "-ar", str(SAMPLE_RATE), "-"],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed on {path}: {result.stderr.decode(errors='replace').strip()}")
+    return np.frombuffer(result.stdout, dtype=np.float32).reshape(-1, CHANNELS)
+
+
+def encode(ffmpeg, samples, path, bitrate, sample_rate):
+    data = np.ascontiguousarray(samples, dtype=np.float32).tobytes()
+    result = subprocess.run(
+        [ffmpeg, "-v", "error", "-y", "-f", "f32le", "-ac", str(CHANNELS), "-ar", str(SAMPLE_RATE),
+         "-i", "-", "-ar", str(sample_rate), "-codec:a", "libmp3lame", "-b:a", f"{bitrate}k",
+         "-write_xing", "1", path],
+        input=data, stderr=subprocess.PIPE, check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed writing {path}: {result.stderr.decode(errors='replace').strip()}")
+
+
+def window_rms_db(samples, window):
+    """RMS level in dBFS of consecutive `window`-frame windows (all channels)."""
+    count = -(-len(samples) // window)
+    padded = np.zeros((count * window, samples.shape[1]), dtype=np.float32)
+    padded[:len(samples)] = samples
+    power = np.square(padded).reshape(count, -1).mean(axis=1)
+    return 10 * np.log10(np.maximum(power, 1e-12))
+
+
+def silence_bounds(samples, threshold_db=-50.0, window_ms=10.0, preroll_ms=2.0, release_ms=30.0,
+                   trim_tail=True):
+    """(start, end) frames of the audible part, or None if all silent."""
+    window = max(1, int(SAMPLE_RATE * window_ms / 1000))
+    loud = np.flatnonzero(window_rms_db(samples, window) > threshold_db)
+    if not loud.size:
+        return None
+    start = max(0, loud[0] * window - int(SAMPLE_RATE * preroll_ms / 1000))
+    end = len(samples)
+    if trim_tail:
+        end = min(end, (loud[-1] + 1) * window + int(SAMPLE_RATE * release_ms / 1000))
+    return start, end
+
+
+def _k_weighting_response(n):
+    """Magnitude of the K-weighting filter at the rfft bins of an n-point FFT."""
+    z = np.exp(1j * np.pi * np.fft.rfftfreq(n, d=1.0) * 2)
+    response = np.ones_like(z)
+    for b, a in (_SHELF, _HIGHPASS):
+        response *= np.polyval(b[::-1], 1 / z) / np.polyval(a[::-1], 1 / z)
+    return np.abs(response)
+
+
+def k_weight(samples):
+    """K-weighted copy of `samples`, filtered in the frequency domain."""
+    # Zero padding keeps the circular convolution from wrapping the tail
+    # into the onset; the filter's energy decays well within 0.5s.
+    n = 1 << int(len(samples) + SAMPLE_RATE // 2 - 1).bit_length()
+    spectrum = np.fft.rfft(samples, n=n, axis=0)
+    spectrum *= _k_weighting_response(n)[:, None]
+    return np.fft.irfft(spectrum, n=n, axis=0)[:len(samples)]
+
+
+def integrated_loudness(samples):
+    """Gated integrated loudness in LUFS (BS.1770-4), -inf for silence."""
+    weighted = k_weight(samples.astype(np.float64))
+    block = int(SAMPLE_RATE * BLOCK_SECONDS)
+    hop = int(SAMPLE_RATE * BLOCK_HOP)
+    energy = np.vstack([np.zeros((1, CHANNELS)), np.cumsum(np.square(weighted), axis=0)])
+    if len(weighted) <= block:
+        # Clips shorter than one gating block are measured as one block.
+        starts = np.array([0])
+        block = len(weighted)
+    else:
+        starts = np.arange(0, len(weighted) - block + 1, hop)
+    if block == 0:
+        return float("-inf")
+    # Mean square per block and channel; channel weights are 1 for L/R.
+    z = ((energy[starts + block] - energy[starts]) / block).sum(axis=1)
+    loudness = -0.691 + 10 * np.log10(np.maximum(z, 1e-20))
+    gated = z[loudness > ABSOLUTE_GATE]
+    if not gated.size:
+        return float("-inf")
+    relative = -0.691 + 10 * np.log10(gated.mean()) + RELATIVE_GATE
+    gated = z[(loudness > ABSOLUTE_GATE) & (loudness > relative)]
+    return float(-0.691 + 10 * np.log10(gated.mean()))
+
+
+def process(samples, target, ceiling_db, trim_tail, threshold_db, fade_ms=10.0):
+    """Trimmed, gained samples plus a report dict."""
+    bounds = silence_bounds(samples, threshold_db, trim_tail=trim_tail)
+    if bounds is None:
+        return None, {"silent": True}
+    start, end = bounds
+    trimmed = samples[start:end].copy()
+    if trim_tail and end < len(samples):
+        fade = min(len(trimmed), int(SAMPLE_RATE * fade_ms / 1000))
+        trimmed[-fade:] *= np.linspace(1.0, 0.0, fade, dtype=np.float32)[:, None]
+
+    measured = integrated_loudness(trimmed)
+    gain_db = target - measured if np.isfinite(measured) else 0.0
+    peak = float(np.abs(trimmed).max())
+    limited = False
+    if peak > 0 and 20 * np.log10(peak) + gain_db > ceiling_db:
+        gain_db = ceiling_db - 20 * np.log10(peak)
+        limited = True
+    trimmed *= np.float32(10 ** (gain_db / 20))
+    return trimmed, {
+        "lead_ms": start * 1000 / SAMPLE_RATE,
+        "tail_ms": (len(samples) - end) * 1000 / SAMPLE_RATE,
+        "lufs": measured,
+        "gain_db": gain_db,
+        "limited": limited,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trim silence and normalize SFX loudness")
+    parser.add_argument("--assets", default=AUDIO_DIR, help="pinball_audio assets directory")
+    where = parser.add_mutually_exclusive_group()
+    where.add_argument("--output", default=DEFAULT_OUTPUT, help="Directory for the results")
+    where.add_argument("--in-place", action="store_true", help="Replace the bundled files")
+    parser.add_argument("--target", type=float, default=-16.0, help="SFX loudness (LUFS)")
+    parser.add_argument("--music-target", type=float, default=-20.0, help="Music loudness (LUFS)")
+    parser.add_argument("--ceiling", type=float, default=-1.0, help="Max sample peak (dBFS)")
+    parser.add_argument("--threshold", type=float, default=-50.0, help="Silence threshold (dBFS RMS)")
+    parser.add_argument("--bitrate", type=int, default=128,
+                        help="Max bitrate (kbps); files keep a lower source bitrate")
+    parser.add_argument("--sample-rate", type=int,
+                        help="Sample rate of the re-encode (default: the source's)")
+    parser.add_argument("--dry-run", action="store_true", help="Report without writing")
+    args = parser.parse_args()
+
+    ffmpeg = find_ffmpeg()
+    files = sorted(glob.glob(os.path.join(args.assets, "sfx", "*.mp3")))
+    music = os.path.join(args.assets, "music", "background.mp3")
+    if os.path.exists(music):
+        files.append(music)
+    if not files:
+        print(f"ERROR: no audio under {args.assets}")
+        sys.exit(1)
+
+    print(f"  {'lead':>7s} {'net':>7s} {'tail':>7s} {'LUFS':>6s} {'gain':>6s} {'kbps':>7s} "
+          f"{'bytes':>16s}  file")
+    total_lead = total_net = total_before = total_after = 0
+    for path in files:
+        is_music = path == music
+        rel = os.path.relpath(path, args.assets)
+        samples = decode(ffmpeg, path)
+        source_rate, audio_bytes, source_delay = mp3_info(path)
+        source_kbps = source_bitrate(audio_bytes, len(samples) / SAMPLE_RATE)
+        bitrate = min(source_kbps, args.bitrate)
+        sample_rate = args.sample_rate or source_rate
+        out, report = process(samples, args.music_target if is_music else args.target,
+                              args.ceiling, not is_music, args.threshold)
+        if out is None:
+            print(f"  WARNING: {rel} is silent, skipped")
+            continue
+
+        before = os.path.getsize(path)
+        after = before
+        if not args.dry_run:
+            dest = path if args.in_place else os.path.join(args.output, rel)
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            tmp = dest + ".tmp.mp3"
+            encode(ffmpeg, out, tmp, bitrate, sample_rate)
+            os.replace(tmp, dest)
+            after = os.path.getsize(dest)
+        # For a player that ignores the LAME header: the source's declared
+        # delay was dropped by the decode (so is not in lead_ms) but was
+        # heard, and the re-encode's delay is heard on top of the pre-roll.
+        hidden_ms = 0.0
+        if source_delay is not None:
+            hidden_ms = (source_delay + _DECODER_DELAY) * 1000 / source_rate
+        net_ms = report["lead_ms"] + hidden_ms - MP3_DELAY_FRAMES * 1000 / sample_rate
+        total_lead += report["lead_ms"]
+        total_net += net_ms
+        total_before += before
+        total_after += after
+        flag = " (peak-limited)" if report["limited"] else ""
+        print(f"  {report['lead_ms']:5.0f}ms {net_ms:5.0f}ms {report['tail_ms']:5.0f}ms "
+              f"{report['lufs']:6.1f} {report['gain_db']:+5.1f}dB {source_kbps:3d}->{bitrate:3d} "
+              f"{before:7d}->{after:7d}  {rel}{flag}")
+
+    print(f"Latency removed: {total_lead:.0f}ms total lead-in across {len(files)} files, "
+          f"{total_net:.0f}ms net of encoder delay where the LAME header is ignored")
+    if not args.dry_run:
+        print(f"Bytes: {total_before} -> {total_after} ({total_before - total_after:+d} saved)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Best-of-N candidate selection for Gemini-generated sprites.
+
+Requests several images for the same prompt concurrently, removes the
+background from each one and scores the result automatically, so the best
+candidate can be kept in a single batch pass instead of rerunning a
+generator until a good image comes back.
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: NumPy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+import debug_writer
+from sprite_utils import matte_all
+
+# Relative weight of each score in the total. Symmetry is only counted for
+# assets that are expected to be mirror-symmetric (coins, tokens).
+WEIGHTS = {
+    "background": 0.35,
+    "coverage": 0.25,
+    "centering": 0.25,
+    "symmetry": 0.15,
+}
+
+
+def _clamp(value):
+    return float(min(1.0, max(0.0, value)))
+
+
+def score_candidate(matted, symmetric=False):
+    """Score a background-removed RGBA image. Returns a dict of 0-1 scores."""
+    alpha = np.asarray(matted.getchannel("A"), dtype=np.float32) / 255.0
+    h, w = alpha.shape
+    bbox = matted.getbbox()
+    if bbox is None:
+        scores = {k: 0.0 for k in WEIGHTS}
+        scores["total"] = 0.0
+        return scores
+    x0, y0, x1, y1 = bbox
+
+    # Background cleanliness: the border should be fully transparent, the
+    # edge fringe should be thin, and the content should form one compact
+    # block (a stray label leaves empty rows/columns inside the bbox).
+    border = max(2, min(h, w) // 50)
+    edge = np.concatenate([
+        alpha[:border].ravel(), alpha[-border:].ravel(),
+        alpha[:, :border].ravel(), alpha[:, -border:].ravel(),
+    ])
+    border_alpha = float(edge.mean())
+    visible = alpha > 0
+    haze = float(((alpha > 0) & (alpha < 1)).sum()) / max(1, int(visible.sum()))
+    content = alpha[y0:y1, x0:x1] > 0.5
+    rows_used = content.any(axis=1).mean()
+    cols_used = content.any(axis=0).mean()
+    background = _clamp(1 - border_alpha * 4) * _clamp(1 - haze * 2) * float(rows_used * cols_used)
+
+    # Alpha coverage: the subject should be solid inside its bbox and take up
+    # a reasonable part of the frame.
+    bbox_area = (x1 - x0) * (y1 - y0)
+    fill = float(alpha[y0:y1, x0:x1].sum()) / bbox_area
+    frame_frac = bbox_area / float(w * h)
+    coverage = _clamp(fill) * _clamp(frame_frac / 0.15)
+
+    # Centering from getbbox: distance of the bbox centre from the image
+    # centre, halved when the subject is clipped by the image edge.
+    dx = abs((x0 + x1) / 2 - w / 2) / (w / 2)
+    dy = abs((y0 + y1) / 2 - h / 2) / (h / 2)
+    centering = _clamp(1 - max(dx, dy))
+    if x0 == 0 or y0 == 0 or x1 == w or y1 == h:
+        centering *= 0.5
+
+    # Symmetry: IoU of the alpha mask with its horizontal mirror.
+    mask = alpha[y0:y1, x0:x1]
+    mirrored = mask[:, ::-1]
+    symmetry = float(np.minimum(mask, mirrored).sum()) / max(1e-6, float(np.maximum(mask, mirrored).sum()))
+
+    scores = {
+        "background": background,
+        "coverage": coverage,
+        "centering": centering,
+        "symmetry": symmetry,
+    }
+    used = [k for k in WEIGHTS if symmetric or k != "symmetry"]
+    total = float(sum(WEIGHTS[k] * scores[k] for k in used) / sum(WEIGHTS[k] for k in used))
+    scores["total"] = total
+    return scores
+
+
+def _format_scores(scores):
+    parts = ", ".join(f"{k}={scores[k]:.2f}" for k in WEIGHTS)
+    return f"total={scores['total']:.3f} ({parts})"
+
+
+def best_candidate(generate, matte, count=1, symmetric=False, label="asset", log_dir=None):
+    """
+    Request `count` images concurrently and keep the highest scoring one.
+
+    `generate` is a zero-argument callable returning a PIL image (or None /
+    raising on failure) and `matte` removes the background from it. Returns
+    `(raw, matted)` for the winner, or `(None, None)` if every request failed.
+    Rejected candidates are logged and, when `log_dir` is set, saved there
+    as "all"-level debug images.
+    """
+    count = max(1, count)
+    if count > 1:
+        print(f"  Requesting {count} candidates for {label}...")
+
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        futures = [pool.submit(generate) for _ in range(count)]
+
+    raws = []
+    for idx, future in enumerate(futures):
+        try:
+            raw = future.result()
+        except Exception as e:
+            print(f"    Candidate {idx + 1} failed: {e}")
+            continue
+        if raw is None:
+            print(f"    Candidate {idx + 1} failed: no image")
+            continue
+        raws.append((idx, raw))
+
+    # Same-size candidates are matted on a process pool through shared memory.
+    results = []
+    for (idx, raw), matted in zip(raws, matte_all([raw for _, raw in raws], matte)):
+        scores = score_candidate(matted, symmetric=symmetric)
+        results.append((scores["total"], idx, raw, matted, scores))
+
+    if not results:
+        return None, None
+
+    results.sort(key=lambda r: r[0], reverse=True)
+    _, best_idx, best_raw, best_matted, best_scores = results[0]
+    if count > 1:
+        print(f"    Kept candidate {best_idx + 1}: {_format_scores(best_scores)}")
+        for _, idx, _, matted, scores in results[1:]:
+            print(f"    Rejected candidate {idx + 1}: {_format_scores(scores)}")
+            if log_dir:
+                path = os.path.join(log_dir, f"{label}_rejected_{idx + 1}.png")
+                debug_writer.save(matted, path, level=debug_writer.ALL)
+    return best_raw, best_matted
@@ -1,3 +1,24 @@
-from PIL import Image
-img = Image.open(r'D:\dev\seeker-pinball\packages\pinball_components\assets\images\backbox\marquee.png')
-print(f'Size: {img.size}, Mode: {img.mode}')
+"""
+Print the marquee's size and mode.
+
+    python tools/check_marquee.py [marquee.png] [--rev HEAD~1]
+"""
+
+import argparse
+
+from replace_marquee import MARQUEE_PATH
+from sprite_utils import open_image
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the marquee's size and mode")
+    parser.add_argument("path", nargs="?", default=MARQUEE_PATH)
+    parser.add_argument("--rev", help="Read the image at this git revision")
+    args = parser.parse_args()
+
+    img = open_image(args.path, args.rev)
+    print(f"Size: {img.size}, Mode: {img.mode}")
+
+
+if __name__ == "__main__":
+    main()
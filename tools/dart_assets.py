@@ -0,0 +1,163 @@
+"""
+Read the FlutterGen `Assets` classes and bundled assets of the app and
+its packages.
+
+Maps generated accessor chains (`Assets.images.dash.bumper.a.active`) to
+asset files and Flutter asset keys, and lists what each pubspec.yaml
+bundles, without a Dart toolchain.
+"""
+
+import os
+import re
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PACKAGES = (None, "pinball_components", "pinball_theme", "pinball_ui", "pinball_audio")
+
+# Generated files per package; None is the app itself.
+GEN_FILES = {
+    None: os.path.join("lib", "gen", "assets.gen.dart"),
+    "pinball_components": os.path.join("packages", "pinball_components", "lib", "gen", "assets.gen.dart"),
+    "pinball_theme": os.path.join("packages", "pinball_theme", "lib", "src", "generated", "assets.gen.dart"),
+    "pinball_ui": os.path.join("packages", "pinball_ui", "lib", "gen", "assets.gen.dart"),
+    "pinball_audio": os.path.join("packages", "pinball_audio", "lib", "gen", "assets.gen.dart"),
+}
+
+_CLASS_RE = re.compile(r"^class (\$?\w+) \{(.*?)^\}", re.S | re.M)
+_DIR_GETTER_RE = re.compile(r"(\$\w+) get (\w+) =>\s*const (\$\w+)\(\)")
+_FILE_GETTER_RE = re.compile(r"(?:AssetGenImage|SvgGenImage|String|\w+) get (\w+) =>\s*(?:const \w+\(\s*)?'([^']+)'")
+_ROOT_FIELD_RE = re.compile(r"static const (\$\w+) (\w+) = (?:const )?(\$\w+)\(\)")
+
+
+def parse_gen(text):
+    """Accessor chain (without the leading `Assets.`) -> package-relative path."""
+    classes = {name: body for name, body in _CLASS_RE.findall(text)}
+    children = {}
+    files = {}
+    for name, body in classes.items():
+        children[name] = [(getter, cls) for _, getter, cls in _DIR_GETTER_RE.findall(body)]
+        files[name] = _FILE_GETTER_RE.findall(body)
+
+    out = {}
+
+    def walk(cls, prefix, depth=0):
+        if depth > 32:
+            return
+        for getter, path in files.get(cls, []):
+            out[f"{prefix}.{getter}"] = path
+        for getter, child in children.get(cls, []):
+            walk(child, f"{prefix}.{getter}", depth + 1)
+
+    for _, field, cls in _ROOT_FIELD_RE.findall(classes.get("Assets", "")):
+        walk(cls, field)
+    return out
+
+
+def uses_chain(used, chain):
+    """Whether a referenced accessor chain `used` reaches the asset at `chain`."""
+    if used == chain or used.startswith(chain + "."):
+        return True
+    # `.values` on a directory getter uses every file below it.
+    return used.endswith(".values") and chain.startswith(used[:-len("values")])
+
+
+def asset_key(package, path):
+    """Flutter asset key for a package-relative path."""
+    return path if package is None else f"packages/{package}/{path}"
+
+
+def asset_file(package, path, root=REPO_ROOT):
+    """Repo file behind a package-relative path."""
+    return os.path.join(package_dir(package, root), *path.split("/"))
+
+
+def load_accessors(root=REPO_ROOT):
+    """{package: {accessor chain: path}} for every generated file present."""
+    out = {}
+    for package, rel in GEN_FILES.items():
+        path = os.path.join(root, rel)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                out[package] = parse_gen(f.read())
+    return out
+
+
+def theme_getters(root=REPO_ROOT):
+    """{ThemeClass: {getter: accessor chain}} from pinball_theme's themes."""
+    themes_dir = os.path.join(root, "packages", "pinball_theme", "lib", "src", "themes")
+    out = {}
+    if not os.path.isdir(themes_dir):
+        return out
+    for name in sorted(os.listdir(themes_dir)):
+        if not name.endswith(".dart"):
+            continue
+        with open(os.path.join(themes_dir, name), encoding="utf-8") as f:
+            text = f.read()
+        match = re.search(r"class (\w+) extends CharacterTheme", text)
+        if not match:
+            continue
+        out[match.group(1)] = {
+            getter: chain
+            for getter, chain in re.findall(r"get (\w+) =>\s*Assets\.([\w.]+);", text)
+        }
+    return out
+
+
+def package_dir(package, root=REPO_ROOT):
+    return root if package is None else os.path.join(root, "packages", package)
+
+
+def app_package(root=REPO_ROOT):
+    """The `name:` of the app's pubspec.yaml (the root package)."""
+    with open(os.path.join(root, "pubspec.yaml"), encoding="utf-8") as f:
+        match = re.search(r"^name:\s*(\w+)", f.read(), re.M)
+    return match.group(1) if match else None
+
+
+def bundled_entries(pubspec):
+    """The `flutter: assets:` list of a pubspec.yaml."""
+    entries = []
+    section = None
+    in_assets = False
+    with open(pubspec, encoding="utf-8") as f:
+        for line in f:
+            stripped = line.split("#", 1)[0].rstrip()
+            if not stripped:
+                continue
+            indent = len(stripped) - len(stripped.lstrip())
+            if indent == 0:
+                section = stripped if stripped == "flutter:" else None
+                in_assets = False
+                continue
+            if section is None:
+                continue
+            if indent == 2:
+                in_assets = stripped.strip() == "assets:"
+                continue
+            if in_assets and stripped.strip().startswith("- "):
+                entries.append(stripped.strip()[2:].strip().strip("'\""))
+    return entries
+
+
+def bundled_files(root=REPO_ROOT):
+    """(package, package-relative path) of every bundled file."""
+    files = []
+    for package in PACKAGES:
+        base = package_dir(package, root)
+        pubspec = os.path.join(base, "pubspec.yaml")
+        if not os.path.exists(pubspec):
+            continue
+        seen = set()
+        for entry in bundled_entries(pubspec):
+            path = os.path.join(base, *entry.rstrip("/").split("/"))
+            if entry.endswith("/"):
+                # Directory entries bundle the files directly inside only.
+                names = sorted(os.listdir(path)) if os.path.isdir(path) else []
+                rels = [f"{entry}{n}" for n in names if os.path.isfile(os.path.join(path, n))]
+            else:
+                rels = [entry] if os.path.isfile(path) else []
+            for rel in rels:
+                if rel not in seen and not os.path.basename(rel).startswith("."):
+                    seen.add(rel)
+                    files.append((package, rel))
+    return files
@@ -0,0 +1,133 @@
+"""
+Background writer for the generators' debug images.
+
+Generators save raw Gemini responses, processed frames and rejected
+candidates for inspection. Encoding those PNGs on the main thread adds
+hundreds of milliseconds per image to every run, so save() only copies
+the image onto a bounded queue and one writer thread encodes it with
+fast compression (zlib level 1 for PNG). The queue bound keeps memory
+flat when the generator outruns the encoder: save() then waits for a
+free slot.
+
+Each artifact has a level and is skipped when the configured level is
+lower: "processed" keeps the frames the sheets are built from, "all"
+adds raw responses, references and rejected candidates. The queue is
+drained on exit, including after an error or sys.exit, and by flush().
+
+    debug_writer.configure(args.debug)
+    debug_writer.save(processed, os.path.join(DEBUG_DIR, "token_processed.png"))
+    debug_writer.save(raw_img, os.path.join(DEBUG_DIR, "token_raw.png"), level=debug_writer.ALL)
+"""
+
+import atexit
+import os
+import queue
+import threading
+
+OFF, PROCESSED, ALL = 0, 1, 2
+LEVELS = {"off": OFF, "processed": PROCESSED, "all": ALL}
+
+# Images waiting to be encoded; a 1024x1024 RGBA copy is 4 MB.
+MAX_PENDING = 8
+
+# Encoder options per format: speed over size for throwaway output.
+SAVE_OPTIONS = {
+    "PNG": {"compress_level": 1},
+    "JPEG": {"quality": 90},
+}
+
+_EXTENSIONS = {".png": "PNG", ".jpg": "JPEG", ".jpeg": "JPEG"}
+
+
+class DebugWriter:
+    """Encodes queued images on a daemon thread until close()."""
+
+    def __init__(self, level=ALL, max_pending=MAX_PENDING):
+        self.level = level
+        self.errors = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name="debug-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                img, path = item
+                fmt = _EXTENSIONS.get(os.path.splitext(path)[1].lower(), "PNG")
+                if fmt == "JPEG" and img.mode not in ("RGB", "L"):
+                    img = img.convert("RGB")
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                img.save(path, fmt, **SAVE_OPTIONS.get(fmt, {}))
+            except Exception as e:
+                self.errors += 1
+                print(f"  WARNING: debug image {item[1]} not written: {e}")
+            finally:
+                self._queue.task_done()
+
+    def save(self, img, path, level=PROCESSED):
+        """Queue `img` for `path` if `level` is enabled; returns whether it was."""
+        if level > self.level or not self._thread.is_alive():
+            return False
+        # A copy, so the caller may keep changing its image.
+        self._queue.put((img.copy(), path))
+        return True
+
+    def flush(self):
+        """Wait until every queued image is written."""
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_writer = None
+
+
+def configure(level="all", max_pending=MAX_PENDING):
+    """Start the shared writer at `level` (a LEVELS name or number), replacing any earlier one."""
+    global _writer
+    if _writer is not None:
+        _writer.close()
+    _writer = DebugWriter(LEVELS.get(level, level), max_pending)
+    return _writer
+
+
+def writer():
+    """The shared writer, started at level "all" on first use."""
+    return _writer or configure()
+
+
+def save(img, path, level=PROCESSED):
+    return writer().save(img, path, level)
+
+
+def flush():
+    if _writer is not None:
+        _writer.flush()
+
+
+def add_argument(parser):
+    """The generators' --debug option."""
+    parser.add_argument("--debug", choices=list(LEVELS), default="all",
+                        help="Debug images to write: off, the processed frames, "
+                             "or all (adds raw responses and rejected candidates)")
+
+
+@atexit.register
+def _close():
+    # Runs after an uncaught exception or sys.exit too, before the
+    # daemon thread is stopped.
+    if _writer is not None:
+        _writer.close()
@@ -0,0 +1,40 @@
+"""
+Configuration shared by the generator tools, resolved on first use.
+
+Keys come from the environment or from tools/.env (environment wins).
+Nothing is read at import time, so generator modules can be imported by
+other tools and by the pinball_assets CLI without a key being set.
+"""
+
+import os
+import sys
+
+ENV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
+
+_loaded = False
+
+
+def load_env(path=ENV_PATH):
+    """Merge KEY=value lines from `path` into os.environ, once."""
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    if not os.path.exists(path):
+        return
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and "=" in line:
+                k, v = line.split("=", 1)
+                os.environ.setdefault(k.strip(), v.strip())
+
+
+def gemini_keys():
+    """[primary, backup] Gemini API keys that are set; exits if there are none."""
+    load_env()
+    keys = [os.environ.get(name, "") for name in ("GEMINI_API_KEY", "GEMINI_BACKUP_KEY")]
+    if not keys[0]:
+        print("ERROR: GEMINI_API_KEY not set. Add it to tools/.env or export it.")
+        sys.exit(1)
+    return [k for k in keys if k]
@@ -1,37 +1,61 @@
-"""Find the exact inner edge of the frame (where the dark bevel meets bright artwork)."""
-from PIL import Image
-import numpy as np
-
-img = Image.open(r'D:\dev\seeker-pinball\packages\pinball_components\assets\images\backbox\marquee.png').convert('RGBA')
-arr = np.array(img)
-W, H = img.size
-
-# The inner frame has a dark bevel (brightness < 50) right before the bright artwork.
-# Find where we cross from dark bevel INTO bright artwork.
-# This gives us the true inner edge.
-
-blue_ch = arr[:, :, 2]  # Blue channel - sky is very blue
-brightness = np.max(arr[:, :, :3], axis=2)
-
-# For detecting sky: blue > 150 AND brightness > 160
-is_sky = (blue_ch > 150) & (brightness > 160) & (arr[:, :, 3] > 200)
-
-print("Inner edge of artwork (first sky pixel per row):")
-print("Scanning rows 140-1150...")
-for y in range(140, 1155, 10):
-    row = is_sky[y, :]
-    indices = np.where(row)[0]
-    if len(indices) > 0:
-        left = indices[0]
-        right = indices[-1]
-        print(f'  y={y:4d}: left={left:4d}, right={right:4d}, width={right-left:4d}')
-    else:
-        print(f'  y={y:4d}: NO SKY')
-
-# Also check the very top to find where artwork starts
-print("\nTop edge scan at center:")
-cx = W // 2
-for y in range(100, 200):
-    is_bright = is_sky[y, cx]
-    r, g, b, a = arr[y, cx]
-    print(f'  y={y}: rgb({r},{g},{b}) sky={is_bright}')
+"""
+Find the exact inner edge of the frame (where the dark bevel meets bright artwork).
+
+    python tools/find_inner_edge.py [marquee.png] [--rev HEAD~1]
+"""
+
+import argparse
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: NumPy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from analyze_taper import print_bounds
+from replace_marquee import MARQUEE_PATH
+from sprite_utils import open_image
+
+
+def sky_mask(arr):
+    """Bright, very blue, opaque pixels: the sky of the original artwork."""
+    # The inner frame has a dark bevel (brightness < 50) right before the
+    # bright artwork, so the first sky pixel of a row is the true inner edge.
+    blue_ch = arr[:, :, 2]
+    brightness = np.max(arr[:, :, :3], axis=2)
+    return (blue_ch > 150) & (brightness > 160) & (arr[:, :, 3] > 200)
+
+
+def sky_bounds(is_sky, rows):
+    out = []
+    for y in rows:
+        indices = np.where(is_sky[y, :])[0]
+        out.append((y, indices[0], indices[-1]) if len(indices) > 0 else (y, None, None))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inner edge of the marquee artwork")
+    parser.add_argument("path", nargs="?", default=MARQUEE_PATH)
+    parser.add_argument("--rev", help="Read the image at this git revision")
+    args = parser.parse_args()
+
+    arr = np.array(open_image(args.path, args.rev).convert("RGBA"))
+    H, W = arr.shape[:2]
+    is_sky = sky_mask(arr)
+
+    print("Inner edge of artwork (first sky pixel per row):")
+    print("Scanning rows 140-1150...")
+    print_bounds(sky_bounds(is_sky, range(140, 1155, 10)), empty="NO SKY")
+
+    # Also check the very top to find where artwork starts
+    print("\nTop edge scan at center:")
+    cx = W // 2
+    for y in range(100, min(200, H)):
+        r, g, b, a = arr[y, cx]
+        print(f"  y={y}: rgb({r},{g},{b}) sky={is_sky[y, cx]}")
+
+
+if __name__ == "__main__":
+    main()
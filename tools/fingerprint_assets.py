@@ -0,0 +1,479 @@
+"""
+Content-fingerprint the asset files of a Flutter web build.
+
+Run after `flutter build web`. Every asset under build/web/assets whose
+key can be rewritten safely is renamed to `<name>.<hash>.<ext>`, and the
+references are rewritten to match:
+
+  - AssetManifest.bin / AssetManifest.bin.json / AssetManifest.json keys
+    and variant paths, FontManifest.json font paths
+  - the asset key string literals compiled into main.dart.js (and any
+    deferred .part.js), both the full key and, for package assets, the
+    package-relative path that the generated `Assets` classes prefix at
+    runtime
+  - the RESOURCES table of flutter_service_worker.js: renamed keys, and
+    fresh MD5s for the manifests and scripts rewritten above
+
+A file is only renamed when every literal that could name it is
+unambiguous, so keys built at runtime from other strings keep their old
+name (and their short cache lifetime) instead of breaking. Fingerprinted
+files never change content, which is what lets firebase.json mark them
+immutable:
+
+    python tools/fingerprint_assets.py build/web
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import re
+import struct
+import sys
+
+HASH_LENGTH = 12
+
+# Fingerprinted file names, as matched by the firebase.json header rule.
+FINGERPRINT_RE = re.compile(r"\.[0-9a-f]{%d}\.[^./]+$" % HASH_LENGTH)
+
+FIREBASE_HEADER_RULE = {
+    "regex": r"^/assets/.+\.[0-9a-f]{%d}\.[^./]+$" % HASH_LENGTH,
+    "headers": [
+        {
+            "key": "Cache-Control",
+            "value": "public, max-age=31536000, immutable",
+        }
+    ],
+}
+
+# Loaded by the engine or framework under fixed names.
+SKIP_KEYS = re.compile(r"^(AssetManifest\..*|FontManifest\.json|NOTICES|shaders/.*|fingerprints\.json)$")
+
+RECORD_NAME = "fingerprints.json"
+
+# "url": "md5" entries of the service worker's RESOURCES table.
+RESOURCE_RE = re.compile(r'"([^"]+)"(\s*:\s*)"[0-9a-f]{32}"')
+
+
+# -- StandardMessageCodec (AssetManifest.bin) -------------------------------
+
+def _read_size(buf, pos):
+    b = buf[pos]
+    if b < 254:
+        return b, pos + 1
+    if b == 254:
+        return struct.unpack_from("<H", buf, pos + 1)[0], pos + 3
+    return struct.unpack_from("<I", buf, pos + 1)[0], pos + 5
+
+
+def _align(pos, n):
+    return pos + (-pos % n)
+
+
+_TYPED_LISTS = {9: ("i", 4), 10: ("q", 8), 11: ("d", 8), 14: ("f", 4)}
+
+
+def _decode(buf, pos):
+    t = buf[pos]
+    pos += 1
+    if t == 0:
+        return None, pos
+    if t in (1, 2):
+        return t == 1, pos
+    if t == 3:
+        return struct.unpack_from("<i", buf, pos)[0], pos + 4
+    if t == 4:
+        return struct.unpack_from("<q", buf, pos)[0], pos + 8
+    if t == 6:
+        pos = _align(pos, 8)
+        return struct.unpack_from("<d", buf, pos)[0], pos + 8
+    if t in (5, 7):
+        n, pos = _read_size(buf, pos)
+        return bytes(buf[pos:pos + n]).decode("utf-8"), pos + n
+    if t == 8:
+        n, pos = _read_size(buf, pos)
+        return bytes(buf[pos:pos + n]), pos + n
+    if t in _TYPED_LISTS:
+        code, width = _TYPED_LISTS[t]
+        n, pos = _read_size(buf, pos)
+        pos = _align(pos, width)
+        return list(struct.unpack_from(f"<{n}{code}", buf, pos)), pos + n * width
+    if t == 12:
+        n, pos = _read_size(buf, pos)
+        out = []
+        for _ in range(n):
+            value, pos = _decode(buf, pos)
+            out.append(value)
+        return out, pos
+    if t == 13:
+        n, pos = _read_size(buf, pos)
+        out = {}
+        for _ in range(n):
+            key, pos = _decode(buf, pos)
+            value, pos = _decode(buf, pos)
+            out[key] = value
+        return out, pos
+    raise ValueError(f"unsupported StandardMessageCodec type {t} at {pos - 1}")
+
+
+def _write_size(out, n):
+    if n < 254:
+        out.append(n)
+    elif n <= 0xFFFF:
+        out.append(254)
+        out += struct.pack("<H", n)
+    else:
+        out.append(255)
+        out += struct.pack("<I", n)
+
+
+def _encode(out, value):
+    if value is None:
+        out.append(0)
+    elif value is True:
+        out.append(1)
+    elif value is False:
+        out.append(2)
+    elif isinstance(value, int):
+        if -2 ** 31 <= value < 2 ** 31:
+            out.append(3)
+            out += struct.pack("<i", value)
+        else:
+            out.append(4)
+            out += struct.pack("<q", value)
+    elif isinstance(value, float):
+        out.append(6)
+        out += b"\0" * (-len(out) % 8)
+        out += struct.pack("<d", value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        out.append(7)
+        _write_size(out, len(data))
+        out += data
+    elif isinstance(value, bytes):
+        out.append(8)
+        _write_size(out, len(value))
+        out += value
+    elif isinstance(value, list):
+        out.append(12)
+        _write_size(out, len(value))
+        for item in value:
+            _encode(out, item)
+    elif isinstance(value, dict):
+        out.append(13)
+        _write_size(out, len(value))
+        for key, item in value.items():
+            _encode(out, key)
+            _encode(out, item)
+    else:
+        raise TypeError(f"cannot encode {type(value).__name__}")
+
+
+def decode_message(data):
+    value, _ = _decode(memoryview(data), 0)
+    return value
+
+
+def encode_message(value):
+    out = bytearray()
+    _encode(out, value)
+    return bytes(out)
+
+
+# -- Fingerprinting ---------------------------------------------------------
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()[:HASH_LENGTH]
+
+
+def resource_hash(path):
+    """MD5 hex digest, as flutter build web writes into RESOURCES."""
+    h = hashlib.md5()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def rehash_resources(text, web_dir, paths):
+    """Update the RESOURCES hashes of the files at `paths` to their current content."""
+    hashes = {os.path.relpath(p, web_dir).replace(os.sep, "/"): resource_hash(p) for p in paths}
+    count = [0]
+
+    def replace(m):
+        digest = hashes.get(m.group(1))
+        if digest is None:
+            return m.group(0)
+        count[0] += 1
+        return f'"{m.group(1)}"{m.group(2)}"{digest}"'
+
+    return RESOURCE_RE.sub(replace, text), count[0]
+
+
+def fingerprinted_name(key, digest):
+    stem, ext = os.path.splitext(key)
+    return f"{stem}.{digest}{ext}"
+
+
+def literal_forms(key):
+    """String literals that may name `key` in compiled code."""
+    forms = [key]
+    match = re.match(r"^packages/[^/]+/(.+)$", key)
+    if match:
+        forms.append(match.group(1))
+    return forms
+
+
+def list_assets(assets_dir):
+    keys = []
+    for dirpath, _, files in os.walk(assets_dir):
+        for name in files:
+            rel = os.path.relpath(os.path.join(dirpath, name), assets_dir).replace(os.sep, "/")
+            if not SKIP_KEYS.match(rel) and not FINGERPRINT_RE.search(rel):
+                keys.append(rel)
+    return sorted(keys)
+
+
+def _literal_pattern(literals):
+    alternation = "|".join(re.escape(s) for s in sorted(literals, key=len, reverse=True))
+    return re.compile(r"""(["'])(%s)\1""" % alternation)
+
+
+def code_files(web_dir):
+    return sorted(
+        os.path.join(web_dir, name) for name in os.listdir(web_dir)
+        if name.startswith("main.dart") and name.endswith(".js")
+    )
+
+
+def plan_renames(web_dir, keys, font_keys, variants=None):
+    """
+    Map key -> fingerprinted key for every key that can be rewritten safely.
+    `variants` maps manifest keys to their resolution variant paths, which
+    are only ever reached through the manifest and follow their key.
+    """
+    owners = {}
+    for key in keys:
+        for form in literal_forms(key):
+            owners.setdefault(form, set()).add(key)
+
+    # Which literal forms actually occur in the compiled code.
+    present = set()
+    pattern = _literal_pattern(owners)
+    for path in code_files(web_dir):
+        with open(path, encoding="utf-8") as f:
+            present.update(m.group(2) for m in pattern.finditer(f.read()))
+
+    renames, skipped = {}, {}
+    assets_dir = os.path.join(web_dir, "assets")
+    for key in keys:
+        forms = literal_forms(key)
+        ambiguous = [f for f in forms if f in present and len(owners[f]) > 1]
+        if ambiguous:
+            skipped[key] = f"ambiguous literal {ambiguous[0]!r}"
+        elif key in font_keys or any(f in present for f in forms):
+            renames[key] = fingerprinted_name(key, file_hash(os.path.join(assets_dir, key)))
+        else:
+            skipped[key] = "no literal reference (key built at runtime?)"
+    for key in list(renames):
+        for variant in (variants or {}).get(key, []):
+            if variant in skipped and os.path.isfile(os.path.join(assets_dir, variant)):
+                del skipped[variant]
+                renames[variant] = fingerprinted_name(variant, file_hash(os.path.join(assets_dir, variant)))
+    return renames, skipped
+
+
+def _rewrite_literals(text, mapping):
+    if not mapping:
+        return text, 0
+    pattern = _literal_pattern(mapping)
+    count = [0]
+
+    def replace(m):
+        count[0] += 1
+        return f"{m.group(1)}{mapping[m.group(2)]}{m.group(1)}"
+
+    return pattern.sub(replace, text), count[0]
+
+
+def literal_mapping(renames):
+    mapping = {}
+    for key, new in renames.items():
+        for old_form, new_form in zip(literal_forms(key), literal_forms(new)):
+            mapping[old_form] = new_form
+    return mapping
+
+
+def rewrite_manifest(manifest, renames):
+    """Rename keys and variant asset paths of a decoded AssetManifest."""
+    out = {}
+    for key, variants in manifest.items():
+        new_variants = variants
+        if isinstance(variants, list):
+            new_variants = []
+            for variant in variants:
+                if isinstance(variant, dict) and "asset" in variant:
+                    variant = dict(variant, asset=renames.get(variant["asset"], variant["asset"]))
+                elif isinstance(variant, str):
+                    variant = renames.get(variant, variant)
+                new_variants.append(variant)
+        out[renames.get(key, key)] = new_variants
+    return out
+
+
+def load_manifest(assets_dir):
+    """The decoded AssetManifest (binary form preferred), or {}."""
+    bin_path = os.path.join(assets_dir, "AssetManifest.bin")
+    if os.path.exists(bin_path):
+        with open(bin_path, "rb") as f:
+            return decode_message(f.read())
+    json_path = os.path.join(assets_dir, "AssetManifest.json")
+    if os.path.exists(json_path):
+        with open(json_path) as f:
+            return json.load(f)
+    return {}
+
+
+def manifest_variants(manifest):
+    out = {}
+    for key, variants in manifest.items():
+        paths = []
+        for variant in variants if isinstance(variants, list) else []:
+            path = variant.get("asset") if isinstance(variant, dict) else variant
+            if isinstance(path, str) and path != key:
+                paths.append(path)
+        out[key] = paths
+    return out
+
+
+def font_manifest_keys(assets_dir):
+    path = os.path.join(assets_dir, "FontManifest.json")
+    if not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        families = json.load(f)
+    return {font["asset"] for family in families for font in family.get("fonts", [])}
+
+
+def fingerprint_build(web_dir, dry_run=False):
+    assets_dir = os.path.join(web_dir, "assets")
+    record = os.path.join(assets_dir, RECORD_NAME)
+    if os.path.exists(record):
+        raise SystemExit(f"ERROR: {web_dir} is already fingerprinted ({record} exists)")
+
+    keys = list_assets(assets_dir)
+    fonts = font_manifest_keys(assets_dir)
+    variants = manifest_variants(load_manifest(assets_dir))
+    renames, skipped = plan_renames(web_dir, keys, fonts, variants)
+    print(f"  {len(keys)} assets: {len(renames)} fingerprinted, {len(skipped)} kept")
+    for key, reason in sorted(skipped.items()):
+        print(f"    kept {key}: {reason}")
+    if dry_run or not renames:
+        return renames
+
+    for key, new in renames.items():
+        os.rename(os.path.join(assets_dir, key), os.path.join(assets_dir, new))
+
+    # Files whose content changes below, so their RESOURCES hash does too.
+    rewritten = []
+    bin_path = os.path.join(assets_dir, "AssetManifest.bin")
+    if os.path.exists(bin_path):
+        with open(bin_path, "rb") as f:
+            manifest = rewrite_manifest(decode_message(f.read()), renames)
+        data = encode_message(manifest)
+        with open(bin_path, "wb") as f:
+            f.write(data)
+        rewritten.append(bin_path)
+        bin_json = os.path.join(assets_dir, "AssetManifest.bin.json")
+        if os.path.exists(bin_json):
+            with open(bin_json, "w") as f:
+                json.dump(base64.b64encode(data).decode("ascii"), f)
+            rewritten.append(bin_json)
+
+    json_path = os.path.join(assets_dir, "AssetManifest.json")
+    if os.path.exists(json_path):
+        with open(json_path) as f:
+            manifest = rewrite_manifest(json.load(f), renames)
+        with open(json_path, "w") as f:
+            json.dump(manifest, f, separators=(",", ":"))
+        rewritten.append(json_path)
+
+    font_path = os.path.join(assets_dir, "FontManifest.json")
+    if fonts:
+        with open(font_path) as f:
+            families = json.load(f)
+        for family in families:
+            for font in family.get("fonts", []):
+                font["asset"] = renames.get(font["asset"], font["asset"])
+        with open(font_path, "w") as f:
+            json.dump(families, f, separators=(",", ":"))
+        rewritten.append(font_path)
+
+    mapping = literal_mapping(renames)
+    for path in code_files(web_dir):
+        with open(path, encoding="utf-8") as f:
+            text, count = _rewrite_literals(f.read(), mapping)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        rewritten.append(path)
+        print(f"  {os.path.basename(path)}: {count} key literals rewritten")
+
+    worker = os.path.join(web_dir, "flutter_service_worker.js")
+    if os.path.exists(worker):
+        urls = {f"assets/{k}": f"assets/{v}" for k, v in renames.items()}
+        with open(worker, encoding="utf-8") as f:
+            text, count = _rewrite_literals(f.read(), urls)
+        text, rehashed = rehash_resources(text, web_dir, rewritten)
+        with open(worker, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"  flutter_service_worker.js: {count} resources renamed, {rehashed} rehashed")
+
+    with open(record, "w") as f:
+        json.dump(renames, f, indent=1, sort_keys=True)
+        f.write("\n")
+    return renames
+
+
+def ensure_header_rule(firebase_json):
+    """Add the immutable rule for fingerprinted assets if it is missing."""
+    with open(firebase_json) as f:
+        config = json.load(f)
+    headers = config.setdefault("hosting", {}).setdefault("headers", [])
+    if any(rule.get("regex") == FIREBASE_HEADER_RULE["regex"] for rule in headers):
+        return False
+    # Appended last so it takes precedence over the short-lived image rule.
+    headers.append(FIREBASE_HEADER_RULE)
+    with open(firebase_json, "w") as f:
+        json.dump(config, f, indent=4)
+        f.write("\n")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fingerprint Flutter web asset file names")
+    parser.add_argument("web_dir", nargs="?", default=os.path.join("build", "web"))
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be renamed")
+    parser.add_argument("--firebase-json", help="Ensure the immutable header rule in this firebase.json")
+    args = parser.parse_args()
+
+    if not os.path.isdir(os.path.join(args.web_dir, "assets")):
+        print(f"ERROR: {args.web_dir}/assets not found. Run flutter build web first.")
+        sys.exit(1)
+    if args.firebase_json and not os.path.isfile(args.firebase_json):
+        print(f"ERROR: {args.firebase_json} not found")
+        sys.exit(1)
+
+    print(f"Fingerprinting {args.web_dir}")
+    fingerprint_build(args.web_dir, dry_run=args.dry_run)
+    if args.firebase_json and not args.dry_run:
+        if ensure_header_rule(args.firebase_json):
+            print(f"  Added immutable header rule to {args.firebase_json}")
+
+
+if __name__ == "__main__":
+    main()
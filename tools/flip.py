@@ -0,0 +1,318 @@
+"""
+Batched perspective flip renderer for coin and card flip sheets.
+
+Squashing a frame horizontally fakes a flip without perspective, rim or
+back face. Here the sprite is a slab of `thickness` pixels spinning about
+its vertical axis in front of a pinhole camera. Every frame's camera rays
+are intersected with the slab in one broadcast: the near face gives a
+projective map into the front image (or, turned away, the back image,
+which for a coin defaults to the front read the right way round). The map is projective in x and linear in y within each output
+column, so a mesh of narrow column boxes follows it, and all frames are
+resampled in one bicubic MESH transform of a strip holding the whole
+stack. Where a ray crosses the slab beside the face it hits
+the rim; its coverage is a range maximum of the shape's alpha along the
+ray's path through the slab, looked up in a per-row sparse table, and it
+is shaded from the silhouette's edge normal with optional reeding.
+
+    python tools/flip.py coin.png --frames 24 --cols 6 --output /tmp/flip.png
+    python tools/flip.py coin.png --back tails.png --thickness 10 --output /tmp/flip.png
+    python tools/flip.py card.png --mirror-back --output /tmp/flip.png
+    python tools/flip.py --benchmark [coin.png] [--frames 24]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+try:
+    import numpy as np
+    from PIL import Image, ImageFilter
+except ImportError:
+    print("ERROR: Pillow and NumPy required. Run: pip install Pillow numpy")
+    sys.exit(1)
+
+from rotation import sheet_from_frames
+
+DEFAULT_IMAGE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "packages", "pinball_components", "assets", "images", "solana_coin", "idle.png",
+)
+
+# Direction towards the light (up-left, in front); the camera looks along +z.
+LIGHT = np.array([-0.45, -0.55, -0.7]) / np.linalg.norm([-0.45, -0.55, -0.7])
+
+# Columns between the front and back images in the shared sampling source,
+# so neither face bleeds into the other.
+GAP = 16
+
+# Width of the output column boxes of the face mesh.
+MESH_STEP = 4
+
+
+def _range_max_table(alpha):
+    """Sparse table of row-wise maxima: level k holds max(alpha[y, x:x + 2**k])."""
+    levels = [alpha]
+    while 2 ** len(levels) <= alpha.shape[1]:
+        prev, step = levels[-1], 2 ** (len(levels) - 1)
+        nxt = prev.copy()
+        nxt[:, :-step] = np.maximum(prev[:, :-step], prev[:, step:])
+        levels.append(nxt)
+    return np.stack(levels)
+
+
+def _edge_normals(alpha):
+    """
+    Outward face-space normals (nx, ny) of every row's left and right
+    silhouette edge, from how the edge moves between rows.
+    """
+    solid = alpha >= 128
+    h, w = alpha.shape
+    rows = np.flatnonzero(solid.any(axis=1))
+    cols = np.arange(w)
+    left = np.where(solid, cols, w).min(axis=1)[rows].astype(np.float64)
+    right = np.where(solid, cols, -1).max(axis=1)[rows].astype(np.float64)
+    normals = []
+    for edge, side in ((left, -1.0), (right, 1.0)):
+        slope = np.gradient(edge) if len(rows) > 1 else np.zeros(len(rows))
+        slope = np.interp(np.arange(h), rows, slope) if len(rows) else np.zeros(h)
+        norm = np.hypot(1, slope)
+        normals.append(np.stack([side / norm, -side * slope / norm], axis=1))
+    return normals
+
+
+def _face_mesh(u_of, lam, w, h, sx, frames, back_x):
+    """
+    MESH transform boxes mapping each frame's strip of the output onto the
+    front (or, for frames in `back_x`, back) image; u runs right to left
+    on a turned-away face, so the back is sampled backwards to read
+    the right way round. The map is
+    projective in x and linear in y per column, so narrow column boxes
+    with bilinear quads follow it closely.
+    """
+    mesh = []
+    for n in range(frames):
+        edges = np.arange(0, w * sx + 1, MESH_STEP)
+        if edges[-1] != w * sx:
+            edges = np.append(edges, w * sx)
+        lam_n = lam[n, 0, edges]
+        u = u_of(n, edges, lam_n)
+        with np.errstate(invalid="ignore"):
+            ok = np.isfinite(u) & (lam_n > 0) & (np.abs(u) < w / 2 + GAP / 2)
+        src_x = back_x[n] - u if back_x[n] else u + w / 2
+        ys = lam_n * h / 2
+        for i in range(len(edges) - 1):
+            if not (ok[i] and ok[i + 1]):
+                continue
+            x0, x1 = int(edges[i]), int(edges[i + 1])
+            top0, top1 = h / 2 - ys[i], h / 2 - ys[i + 1]
+            bot0, bot1 = h / 2 + ys[i], h / 2 + ys[i + 1]
+            mesh.append(((n * w * sx + x0, 0, n * w * sx + x1, h),
+                         (src_x[i], top0, src_x[i], bot0, src_x[i + 1], bot1, src_x[i + 1], top1)))
+    return mesh
+
+
+def flip_frames(img, frames=24, back=None, thickness=None, perspective=3.0, rim_color=None,
+                reeding=6.0, shading=0.35, supersample=2, angles=None, mirror_back=False):
+    """
+    Render a flip of `img` as an (N, H, W, 4) uint8 stack.
+
+    The sprite spins about its vertical axis through `angles` (degrees,
+    default one full turn over `frames`). `back` is the face shown when
+    turned away (default: the front, so a coin shows its logo on both
+    sides); `mirror_back` mirrors it, as the back of a see-through card.
+    `thickness` is in pixels (default 6% of the width) and `perspective`
+    the camera distance in frame sizes. `rim_color` defaults to the mean
+    colour along the silhouette; `reeding` is the period of the rim's
+    ridges in pixels (0 for a plain rim). `shading` scales how much a
+    face darkens as it turns from the light, and frames are rendered at
+    `supersample` times the width, the only axis the flip compresses.
+    """
+    img = img.convert("RGBA")
+    w, h = img.size
+    back = (img if back is None else back).convert("RGBA")
+    if mirror_back:
+        back = back.transpose(Image.FLIP_LEFT_RIGHT)
+    if back.size != (w, h):
+        back = back.resize((w, h), Image.LANCZOS)
+    if angles is None:
+        angles = [360 * i / frames for i in range(frames)]
+    frames = len(angles)
+    thickness = 0.06 * w if thickness is None else thickness
+    focal = perspective * max(w, h)
+    sx = max(1, int(supersample))
+
+    theta = np.radians(np.asarray(angles, dtype=np.float64))[:, None, None]
+    c, s = np.cos(theta), np.sin(theta)
+    side = np.where(c >= 0, 1.0, -1.0)
+    X = ((np.arange(w * sx) + 0.5) / sx - w / 2)[None, None, :]
+    X_edge = (np.arange(w * sx + 1) / sx - w / 2)[None, None, :]
+    Y = np.arange(h) + 0.5 - h / 2
+
+    # Ray from the camera (0, 0, -focal) through screen point (X, Y, 0) meets
+    # the plane n . P = d, with n the unit normal of the visible face, at
+    # lambda = (d - n . C) / (n . dir); on that plane the face coordinates
+    # are u = P . (c, 0, s) and v = P_y = lambda * Y. X holds the output
+    # pixel centres and X_edge the column edges the face mesh is built on.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        facing = side * (s * X - c * focal)
+        lam_near = (thickness / 2 - side * c * focal) / facing
+        lam_far = (-thickness / 2 - side * c * focal) / facing
+        lam_edge = (thickness / 2 - side * c * focal) / (side * (s * X_edge - c * focal))
+    slope = X * c + focal * s
+
+    # Faces: one MESH transform over a strip of all frames, sampling a
+    # source with the front and back side by side.
+    source = Image.new("RGBA", (2 * w + GAP, h), (0, 0, 0, 0))
+    source.paste(img, (0, 0))
+    source.paste(back, (w + GAP, 0))
+    back_x = [0 if side[n, 0, 0] > 0 else w + GAP + w / 2 for n in range(frames)]
+    edge_u = lambda n, e, lam: lam * (X_edge[0, 0, e] * c[n, 0, 0] + focal * s[n, 0, 0]) - focal * s[n, 0, 0]
+    mesh = _face_mesh(edge_u, lam_edge, w, h, sx, frames, back_x)
+    strip = source.transform((frames * w * sx, h), Image.MESH, mesh, Image.BICUBIC)
+    faces = np.asarray(strip).reshape(h, frames, w * sx, 4).swapaxes(0, 1).copy()
+
+    n_dot_l = side[:, 0, 0] * (s[:, 0, 0] * LIGHT[0] - c[:, 0, 0] * LIGHT[2])
+    lit = np.clip(1 + shading * (np.maximum(n_dot_l, 0) + LIGHT[2]), 0, 1.5)
+    gain = np.rint(lit * 256).astype(np.uint16)[:, None, None, None]
+    faces[..., :3] = np.minimum((faces[..., :3] * gain + 128) >> 8, 255)
+
+    # Rim: the ray's stretch inside the slab, lambda in [lo, hi], runs over
+    # face columns u(lambda); the rim covers the pixel where the shape
+    # has alpha anywhere along it. Only columns whose stretch is at least
+    # part of a pixel wide are looked up, and only uncovered pixels shaded.
+    with np.errstate(invalid="ignore"):
+        lo = np.maximum(np.fmin(lam_near, lam_far), 0)
+        hi = np.fmax(lam_near, lam_far)
+        # A camera within the slab (edge-on) sees it run on to infinity.
+        edge_on = np.abs(c * focal) < thickness / 2
+        hi = np.minimum(np.where(edge_on & ~(hi > lo), 1e6, np.where(np.isfinite(hi), hi, 0)), 1e6)
+    ends = np.stack([lo * slope - focal * s, hi * slope - focal * s])
+    u_lo, u_hi = ends.min(axis=0), ends.max(axis=0)
+    crossing = (hi > lo) & (u_hi > u_lo) & (u_hi >= -w / 2) & (u_lo <= w / 2)
+    n_idx, _, x_idx = np.nonzero(crossing)
+    if len(n_idx):
+        pick = lambda arr: np.broadcast_to(arr, crossing.shape)[n_idx, 0, x_idx][:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            centre = np.clip(focal * pick(s) / pick(slope), pick(lo), pick(hi))
+        rows = np.round(np.where(np.isfinite(centre), centre, 1.0) * Y + h / 2 - 0.5)
+        in_rows = (rows >= 0) & (rows < h)
+        rows = np.where(in_rows, rows, 0).astype(np.intp)
+        a = np.clip(np.round(pick(u_lo) + w / 2 - 0.5), 0, w - 1).astype(np.intp)
+        b = np.clip(np.round(pick(u_hi) + w / 2 - 0.5), 0, w - 1).astype(np.intp)
+        level = np.floor(np.log2(b - a + 1)).astype(np.intp)
+
+        alpha = np.asarray(img.getchannel("A"))
+        table = _range_max_table(alpha)
+        coverage = np.maximum(table[level, rows, a], table[level, rows, b - (1 << level) + 1])
+        # Scale by the stretch's width so a face-on frame has no rim halo.
+        rim_alpha = coverage * np.clip(pick(u_hi) - pick(u_lo), 0, 1) * in_rows
+        shown = (rim_alpha >= 0.5) & (faces[n_idx, :, x_idx, 3] < 255)
+        k, y = np.nonzero(shown)
+        rows, rim_alpha = rows[k, y], rim_alpha[k, y]
+        cs, ss, col_slope = pick(c)[k, 0], pick(s)[k, 0], pick(slope)[k, 0]
+
+        left_n, right_n = _edge_normals(alpha)
+        n2 = np.where((col_slope > 0)[:, None], left_n[rows], right_n[rows])
+        nx, ny = n2[:, 0], n2[:, 1]
+        diffuse = np.maximum(nx * cs * LIGHT[0] + ny * LIGHT[1] + nx * ss * LIGHT[2], 0)
+        half = (LIGHT + [0, 0, -1]) / np.linalg.norm(LIGHT + [0, 0, -1])
+        spec = np.maximum(nx * cs * half[0] + ny * half[1] + nx * ss * half[2], 0) ** 24
+        ridges = 1.0 if not reeding else 0.85 + 0.15 * np.cos(2 * np.pi * rows / reeding)
+        if rim_color is None:
+            # The ring of solid pixels just inside the silhouette.
+            eroded = np.asarray(img.getchannel("A").filter(ImageFilter.MinFilter(3)))
+            edge = (alpha >= 128) & (eroded < 128)
+            rim_color = np.asarray(img)[edge][:, :3].mean(axis=0) if edge.any() else (160, 160, 170)
+        shade = (0.35 + 0.65 * diffuse) * ridges
+        rim_rgb = np.asarray(rim_color, dtype=np.float64)[:3] * shade[:, None] + 255 * 0.6 * spec[:, None]
+
+        rim = np.zeros_like(faces)
+        rim[n_idx[k], y, x_idx[k], :3] = np.clip(rim_rgb + 0.5, 0, 255)
+        rim[n_idx[k], y, x_idx[k], 3] = rim_alpha + 0.5
+        # The face is in front of the rim.
+        layers = [Image.fromarray(arr.reshape(-1, w * sx, 4), "RGBA") for arr in (rim, faces)]
+        faces = np.asarray(Image.alpha_composite(*layers)).reshape(faces.shape)
+
+    if sx > 1:
+        strip = Image.fromarray(faces.reshape(-1, w * sx, 4), "RGBA").reduce((sx, 1))
+        faces = np.asarray(strip).reshape(frames, h, w, 4)
+    return faces
+
+
+def flip_sheet(img, cols=6, rows=4, frames=None, **options):
+    """flip_frames laid out as a cols x rows sheet."""
+    return sheet_from_frames(flip_frames(img, frames or cols * rows, **options), cols, rows)
+
+
+def _squash_sheet(base_img, cols, rows, min_scale=0.05):
+    """The horizontal LANCZOS squash the generators used, kept as the benchmark baseline."""
+    w, h = base_img.size
+    total = cols * rows
+    sheet = Image.new("RGBA", (cols * w, rows * h), (0, 0, 0, 0))
+    for i in range(total):
+        scale = max(abs(np.cos(2 * np.pi * i / total)), min_scale)
+        new_w = max(1, int(w * scale))
+        frame = base_img.resize((new_w, h), Image.LANCZOS)
+        canvas = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+        canvas.paste(frame, ((w - new_w) // 2, 0), frame)
+        sheet.paste(canvas, ((i % cols) * w, (i // cols) * h), canvas)
+    return sheet
+
+
+def benchmark(path, frames, cols, repeat=3):
+    """Print the best of `repeat` sheet build times against the squash baseline."""
+    base = Image.open(path).convert("RGBA")
+    rows = -(-frames // cols)
+    print(f"Benchmark: {os.path.basename(path)} {base.size[0]}x{base.size[1]}, {frames} frames")
+    runs = [("LANCZOS squash", lambda: _squash_sheet(base, cols, rows))]
+    for sx in (1, 2):
+        runs.append((f"flip (supersample={sx})",
+                     lambda sx=sx: flip_sheet(base, cols, rows, frames, supersample=sx)))
+    for label, fn in runs:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        print(f"  {label:26s} {best * 1000:8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perspective flip sprite sheets")
+    parser.add_argument("image", nargs="?", default=DEFAULT_IMAGE,
+                        help="Front face (default: solana_coin/idle.png)")
+    parser.add_argument("--back", help="Back face image, e.g. tails (default: the front)")
+    parser.add_argument("--mirror-back", action="store_true",
+                        help="Mirror the back face, as for a see-through card")
+    parser.add_argument("--frames", type=int, default=24)
+    parser.add_argument("--cols", type=int, default=6)
+    parser.add_argument("--thickness", type=float, help="Slab thickness in pixels (default: 6%% of the width)")
+    parser.add_argument("--perspective", type=float, default=3.0,
+                        help="Camera distance in frame sizes; larger is flatter")
+    parser.add_argument("--rim-color", help="RRGGBB (default: mean colour along the silhouette)")
+    parser.add_argument("--reeding", type=float, default=6.0, help="Rim ridge period in pixels, 0 for none")
+    parser.add_argument("--supersample", type=int, default=2)
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Compare time against the LANCZOS squash path")
+    parser.add_argument("--output", help="Write the flip sheet here")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.image, args.frames, args.cols)
+        return
+
+    if not args.output:
+        parser.error("--output is required unless --benchmark is given")
+    rim = args.rim_color and tuple(int(args.rim_color.lstrip("#")[i:i + 2], 16) for i in (0, 2, 4))
+    base = Image.open(args.image).convert("RGBA")
+    back = Image.open(args.back) if args.back else None
+    sheet = flip_sheet(base, args.cols, -(-args.frames // args.cols), args.frames, back=back,
+                       thickness=args.thickness, perspective=args.perspective, rim_color=rim,
+                       reeding=args.reeding, supersample=args.supersample, mirror_back=args.mirror_back)
+    sheet.save(args.output, "PNG")
+    print(f"Sheet saved: {args.output} ({sheet.size[0]}x{sheet.size[1]})")
+
+
+if __name__ == "__main__":
+    main()
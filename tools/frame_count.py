@@ -0,0 +1,180 @@
+"""
+Propose the smallest frame count for an animated sprite sheet.
+
+Measures the perceptual difference between frames of an existing sheet
+and finds the fewest evenly resampled frames whose playback stays within
+a visual-error threshold of the original at every original frame time,
+without the per-frame hold exceeding a stutter limit. Writes the reduced
+sheet plus a JSON timing sidecar and prints the matching Dart parameters.
+
+    python tools/frame_count.py packages/.../solana_coin/flip.png \\
+        --cols 6 --rows 4 --step-time 0.05 --output flip_reduced.png
+"""
+
+import argparse
+import json
+import os
+import sys
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    print("ERROR: Pillow and NumPy required. Run: pip install Pillow numpy")
+    sys.exit(1)
+
+from rotation import sheet_from_frames
+from sheet_layout import choose_grid, layout
+
+# Frames are compared at this size; the downscale stands in for the eye's
+# spatial integration at sprite size and keeps the comparison cheap.
+COMPARE_SIZE = 64
+
+
+def split_sheet(sheet, cols, rows, frames=None):
+    """Cut a sheet into an (N, H, W, 4) uint8 stack in row-major order."""
+    arr = np.asarray(sheet.convert("RGBA"))
+    cell_h, cell_w = arr.shape[0] // rows, arr.shape[1] // cols
+    arr = arr[:rows * cell_h, :cols * cell_w]
+    stack = arr.reshape(rows, cell_h, cols, cell_w, 4).transpose(0, 2, 1, 3, 4)
+    stack = stack.reshape(rows * cols, cell_h, cell_w, 4)
+    return stack[:frames] if frames else stack
+
+
+def perceptual_features(stack):
+    """Premultiplied luma and alpha per frame, box-downscaled, as (N, P)."""
+    n, h, w, _ = stack.shape
+    factor = max(1, max(h, w) // COMPARE_SIZE)
+    h2, w2 = h // factor * factor, w // factor * factor
+    f = stack[:, :h2, :w2].astype(np.float32) / 255.0
+    f = f.reshape(n, h2 // factor, factor, w2 // factor, factor, 4).mean(axis=(2, 4))
+    luma = (f[..., 0] * 0.299 + f[..., 1] * 0.587 + f[..., 2] * 0.114) * f[..., 3]
+    return np.concatenate([luma.reshape(n, -1), f[..., 3].reshape(n, -1)], axis=1)
+
+
+def difference_matrix(features):
+    """Pairwise perceptual difference (mean abs over pixels), (N, N)."""
+    return np.abs(features[:, None, :] - features[None, :, :]).mean(axis=2)
+
+
+def resample_plan(total, count, loop=True):
+    """Source frame indices for `count` evenly spaced frames out of `total`."""
+    if loop:
+        return [int(round(k * total / count)) % total for k in range(count)]
+    if count == 1:
+        return [0]
+    return [int(round(k * (total - 1) / (count - 1))) for k in range(count)]
+
+
+def playback_error(diff, plan, loop=True):
+    """Worst difference between each original frame and what a reduced
+    animation of the same duration shows at that moment."""
+    total, count = diff.shape[0], len(plan)
+    worst = 0.0
+    for i in range(total):
+        if loop:
+            k = min(count - 1, int(i * count / total + 1e-9))
+        else:
+            k = min(count - 1, int(round(i * (count - 1) / max(1, total - 1))))
+        worst = max(worst, float(diff[i, plan[k]]))
+    return worst
+
+
+def consecutive_differences(diff, loop=True):
+    total = diff.shape[0]
+    return [float(diff[i, (i + 1) % total]) for i in range(total if loop else total - 1)]
+
+
+def propose_frame_count(stack, step_time, threshold=None, relative=1.0,
+                        max_step_time=1 / 12, loop=True):
+    """
+    Smallest frame count (and its plan, step time, error and difference
+    matrix) that stays under the error threshold with a per-frame hold no
+    longer than `max_step_time`. Without an absolute `threshold` the limit
+    is `relative` times the largest difference between consecutive frames:
+    the reduced playback may never be further from the original than the
+    original already jumps in a single step.
+    """
+    total = stack.shape[0]
+    diff = difference_matrix(perceptual_features(stack))
+    if threshold is None:
+        consecutive = consecutive_differences(diff, loop)
+        threshold = relative * max(consecutive)
+    duration = step_time * (total if loop else total - 1)
+    for count in range(1, total + 1):
+        steps = count if loop else count - 1
+        new_step = duration / steps if steps else step_time
+        if new_step > max_step_time:
+            continue
+        plan = resample_plan(total, count, loop)
+        error = playback_error(diff, plan, loop)
+        if error <= threshold:
+            return count, plan, new_step, error, threshold, diff
+    return total, list(range(total)), step_time, 0.0, threshold, diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Propose a reduced frame count for a sprite sheet")
+    parser.add_argument("sheet")
+    parser.add_argument("--cols", type=int, required=True)
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--frames", type=int, help="Frames used (default: cols * rows)")
+    parser.add_argument("--step-time", type=float, required=True,
+                        help="Current playback stepTime in seconds")
+    parser.add_argument("--threshold", type=float,
+                        help="Max perceptual difference (0-1) from the original at any moment")
+    parser.add_argument("--relative", type=float, default=1.0,
+                        help="Without --threshold: limit as a multiple of the largest "
+                             "consecutive-frame difference (default 1.0)")
+    parser.add_argument("--max-step-time", type=float, default=1 / 12,
+                        help="Longest allowed per-frame hold, to avoid visible stutter")
+    parser.add_argument("--no-loop", action="store_true",
+                        help="Animation plays once; keep the first and last frames")
+    parser.add_argument("--out-cols", type=int,
+                        help="Columns of the reduced sheet (default: the grid choose_grid picks)")
+    parser.add_argument("--output", help="Write the reduced sheet (and a .json sidecar) here")
+    args = parser.parse_args()
+
+    sheet = Image.open(args.sheet)
+    stack = split_sheet(sheet, args.cols, args.rows, args.frames)
+    total = stack.shape[0]
+    loop = not args.no_loop
+    count, plan, step, error, threshold, diff = propose_frame_count(
+        stack, args.step_time, args.threshold, args.relative, args.max_step_time, loop,
+    )
+
+    consecutive = consecutive_differences(diff, loop)
+    print(f"{os.path.basename(args.sheet)}: {total} frames @ {args.step_time:.4f}s")
+    print(f"  Consecutive difference: min={min(consecutive):.4f} "
+          f"mean={sum(consecutive) / len(consecutive):.4f} max={max(consecutive):.4f}")
+    print(f"  Proposed: {count} frames @ {step:.4f}s (worst error {error:.4f}, "
+          f"threshold {threshold:.4f})")
+    print(f"  Source frames: {plan}")
+
+    if not args.output:
+        return
+
+    cell_h, cell_w = stack.shape[1:3]
+    if args.out_cols:
+        cols = min(count, args.out_cols)
+        rows = -(-count // cols)
+    else:
+        cols, rows = choose_grid(count, cell_w, cell_h)
+    reduced = sheet_from_frames(stack[plan], cols, rows)
+    reduced.save(args.output, "PNG")
+    timing = dict(layout(count, cols, rows, cell_w, cell_h),
+                  stepTime=round(step, 6), sourceFrames=plan)
+    sidecar = os.path.splitext(args.output)[0] + ".json"
+    with open(sidecar, "w") as f:
+        json.dump(timing, f, indent=2)
+        f.write("\n")
+    saved = 1 - (reduced.width * reduced.height) / float(sheet.width * sheet.height)
+    print(f"  Reduced sheet: {args.output} ({reduced.size[0]}x{reduced.size[1]}, "
+          f"{saved:.0%} fewer pixels)")
+    print(f"  Timing: {sidecar}")
+    print(f"  Dart: SpriteAnimationData.sequenced(amount: {count}, "
+          f"amountPerRow: {cols}, stepTime: {step:.4f}, ...)")
+
+
+if __name__ == "__main__":
+    main()
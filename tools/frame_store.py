@@ -0,0 +1,152 @@
+"""
+Shared-memory frame store for multi-process image work.
+
+Handing PIL images to a process pool pickles every frame both ways,
+which for pastes, matting or a cell-sized warp costs more than the work.
+A FrameStore keeps its frames in one multiprocessing.shared_memory block
+laid out as a sprite sheet, so only the block's name crosses the process
+boundary and workers read and write frames in place by index. Every view
+is zero-copy: frame(i) is a strided NumPy view of the cell, image(i) a
+PIL image mapped onto the same bytes with the sheet's row stride, and
+sheet() the whole block, so once the workers have filled their cells the
+sheet is already packed.
+
+    with FrameStore(32, 256, 256, cols=8) as store:
+        map_chunks(partial(render, angles=angles), 32, store)
+        sheet = store.sheet().copy()
+
+Views keep the block's buffer exported; drop them before the store is
+closed (closing with live views raises BufferError rather than leaving
+them dangling).
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    print("ERROR: Pillow and NumPy required. Run: pip install Pillow numpy")
+    sys.exit(1)
+
+
+class FrameStore:
+    """
+    `frames` RGBA cells of width x height in shared memory, `cols` per row
+    (default: one row). Created when `name` is None, otherwise attached to
+    the existing block of that name; the creating side unlinks it on exit.
+    """
+
+    def __init__(self, frames, width, height, cols=None, name=None):
+        self.frames, self.width, self.height = frames, width, height
+        self.cols = min(cols or frames, frames)
+        self.rows = -(-frames // self.cols)
+        self.stride = self.cols * width * 4
+        self.owner = name is None
+        if self.owner:
+            # A mapped cell spans height full strides from its first pixel,
+            # so cells left of the last column reach one row past the sheet.
+            # New blocks are zero-filled, so unwritten cells are transparent.
+            size = (self.rows * height + 1) * self.stride
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self.name = self._shm.name
+        self.array = np.ndarray((self.rows * height, self.cols * width, 4), dtype=np.uint8,
+                                buffer=self._shm.buf)
+
+    @property
+    def spec(self):
+        """Picklable description for attach() in another process."""
+        return self.name, self.frames, self.width, self.height, self.cols
+
+    @classmethod
+    def attach(cls, spec):
+        name, frames, width, height, cols = spec
+        return cls(frames, width, height, cols, name=name)
+
+    def _cell(self, i):
+        if not 0 <= i < self.frames:
+            raise IndexError(f"frame {i} out of range for {self.frames} frames")
+        return divmod(i, self.cols)
+
+    def _offset(self, i):
+        row, col = self._cell(i)
+        return row * self.height * self.stride + col * self.width * 4
+
+    def frame(self, i):
+        """(H, W, 4) uint8 view of frame i."""
+        row, col = self._cell(i)
+        h, w = self.height, self.width
+        return self.array[row * h:(row + 1) * h, col * w:(col + 1) * w]
+
+    def image(self, i, writable=False):
+        """
+        PIL view of frame i. Pillow marks mapped images read-only and
+        copies them on the first change; a `writable` view instead draws
+        and pastes straight into the cell.
+        """
+        view = self._shm.buf[self._offset(i):]
+        img = Image.frombuffer("RGBA", (self.width, self.height), view, "raw", "RGBA", self.stride, 1)
+        if writable:
+            img.readonly = 0
+        return img
+
+    def put(self, i, img):
+        """Copy `img` (cell-sized, any mode) into frame i."""
+        if img.size != (self.width, self.height):
+            raise ValueError(f"frame is {img.size[0]}x{img.size[1]}, "
+                             f"cells are {self.width}x{self.height}")
+        self.image(i, writable=True).paste(img if img.mode == "RGBA" else img.convert("RGBA"))
+
+    def sheet(self):
+        """PIL view of the whole sheet; copy() it to keep it past close()."""
+        size = (self.cols * self.width, self.rows * self.height)
+        return Image.frombuffer("RGBA", size, self._shm.buf, "raw", "RGBA", 0, 1)
+
+    def close(self):
+        self.array = None
+        self._shm.close()
+
+    def unlink(self):
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+
+def _run_chunk(job):
+    fn, specs, indices = job
+    stores = [FrameStore.attach(spec) for spec in specs]
+    try:
+        fn(indices, *stores)
+    finally:
+        for store in stores:
+            store.close()
+
+
+def map_chunks(fn, count, *stores, workers=None):
+    """
+    Call fn(indices, *stores) over range(count) split into one contiguous
+    chunk per worker process, each attaching the stores by name. `fn` must
+    be picklable (a module-level function or a partial of one). With one
+    worker, or one frame, it runs here on the stores as given.
+    """
+    workers = min(workers or os.cpu_count() or 1, count)
+    if workers <= 1:
+        fn(list(range(count)), *stores)
+        return
+    specs = [store.spec for store in stores]
+    jobs = [(fn, specs, chunk.tolist()) for chunk in np.array_split(np.arange(count), workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Consume results so exceptions raised in a worker propagate.
+        for _ in pool.map(_run_chunk, jobs):
+            pass
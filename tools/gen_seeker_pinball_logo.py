@@ -1,14 +1,34 @@
-"""Generate SEEKER PINBALL logo to replace io_pinball.png."""
-from PIL import Image, ImageDraw, ImageFont
-import numpy as np
+"""
+Generate SEEKER PINBALL logo to replace io_pinball.png.
+
+    python tools/gen_seeker_pinball_logo.py [--font impact.ttf] [--output out.png] [--shadow 6]
+"""
+
+import argparse
+import os
+import sys
+
+try:
+    import numpy as np
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    print("ERROR: Pillow and NumPy required. Run: pip install Pillow numpy")
+    sys.exit(1)
+
+from glow import paste_layer, soft_layer
 
 WIDTH, HEIGHT = 618, 270
-OUTPUT = r"D:\dev\seeker-pinball\assets\images\loading_game\io_pinball.png"
+OUTPUT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "assets", "images", "loading_game", "io_pinball.png"
+)
+FONT_PATH = r"C:\Windows\Fonts\impact.ttf"
 
 # Solana gradient colors
 PURPLE = (153, 69, 255)   # Solana purple
 GREEN = (20, 241, 149)    # Solana green/teal
 
+
 def make_gradient(width, height):
     arr = np.zeros((height, width, 4), dtype=np.uint8)
     for y in range(height):
@@ -19,43 +39,63 @@ def make_gradient(width, height):
         arr[y, :] = [r, g, b, 255]
     return Image.fromarray(arr, "RGBA")
 
-# Create text mask image (white text on black)
-text_img = Image.new("L", (WIDTH, HEIGHT), 0)
-draw = ImageDraw.Draw(text_img)
 
-font_path = r"C:\Windows\Fonts\impact.ttf"
-font_top = ImageFont.truetype(font_path, 120)
-font_bot = ImageFont.truetype(font_path, 100)
+def render_logo(width=WIDTH, height=HEIGHT, font_path=FONT_PATH, shadow=0):
+    """Two centered lines of gradient text on transparency, optionally over a soft shadow."""
+    # Create text mask image (white text on black)
+    text_img = Image.new("L", (width, height), 0)
+    draw = ImageDraw.Draw(text_img)
+
+    font_top = ImageFont.truetype(font_path, 120)
+    font_bot = ImageFont.truetype(font_path, 100)
+
+    bbox_s = draw.textbbox((0, 0), "SEEKER", font=font_top)
+    bbox_p = draw.textbbox((0, 0), "PINBALL", font=font_bot)
+
+    w_s = bbox_s[2] - bbox_s[0]
+    h_s = bbox_s[3] - bbox_s[1]
+    w_p = bbox_p[2] - bbox_p[0]
+    h_p = bbox_p[3] - bbox_p[1]
+
+    gap = 10
+    total_h = h_s + gap + h_p
+    y_offset = (height - total_h) // 2
+
+    x_s = (width - w_s) // 2
+    x_p = (width - w_p) // 2
+
+    draw.text((x_s - bbox_s[0], y_offset - bbox_s[1]), "SEEKER", fill=255, font=font_top)
+    draw.text((x_p - bbox_p[0], y_offset + h_s + gap - bbox_p[1]), "PINBALL", fill=255, font=font_bot)
 
-bbox_s = draw.textbbox((0, 0), "SEEKER", font=font_top)
-bbox_p = draw.textbbox((0, 0), "PINBALL", font=font_bot)
+    # Gradient colour, text as alpha
+    output_arr = np.array(make_gradient(width, height))
+    output_arr[:, :, 3] = np.array(text_img)
+    logo = Image.fromarray(output_arr, "RGBA")
+    if not shadow:
+        return logo
 
-w_s = bbox_s[2] - bbox_s[0]
-h_s = bbox_s[3] - bbox_s[1]
-w_p = bbox_p[2] - bbox_p[0]
-h_p = bbox_p[3] - bbox_p[1]
+    offset = max(1, int(shadow // 2))
+    box = text_img.getbbox()
 
-gap = 10
-total_h = h_s + gap + h_p
-y_offset = (HEIGHT - total_h) // 2
+    def paint(d, dx, dy):
+        d.bitmap((offset - dx, offset - dy), text_img, fill=255)
+    result = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    paste_layer(result, *soft_layer((box[0] + offset, box[1] + offset, box[2] + offset, box[3] + offset),
+                                    shadow, (0, 0, 0, 140), paint, result.size))
+    return Image.alpha_composite(result, logo)
 
-x_s = (WIDTH - w_s) // 2
-x_p = (WIDTH - w_p) // 2
 
-draw.text((x_s - bbox_s[0], y_offset - bbox_s[1]), "SEEKER", fill=255, font=font_top)
-draw.text((x_p - bbox_p[0], y_offset + h_s + gap - bbox_p[1]), "PINBALL", fill=255, font=font_bot)
+def main():
+    parser = argparse.ArgumentParser(description="Generate the SEEKER PINBALL loading logo")
+    parser.add_argument("--font", default=FONT_PATH, help="TrueType font (default: Impact)")
+    parser.add_argument("--output", default=OUTPUT)
+    parser.add_argument("--shadow", type=float, default=0, help="Drop shadow blur radius (default: none)")
+    args = parser.parse_args()
 
-# Create gradient and composite
-gradient = make_gradient(WIDTH, HEIGHT)
-gradient_pixels = np.array(gradient)
-text_pixels = np.array(text_img)
+    result = render_logo(font_path=args.font, shadow=args.shadow)
+    result.save(args.output)
+    print(f"Saved {args.output} ({result.size[0]}x{result.size[1]}, mode={result.mode})")
 
-output_arr = np.zeros((HEIGHT, WIDTH, 4), dtype=np.uint8)
-output_arr[:, :, 0] = gradient_pixels[:, :, 0]
-output_arr[:, :, 1] = gradient_pixels[:, :, 1]
-output_arr[:, :, 2] = gradient_pixels[:, :, 2]
-output_arr[:, :, 3] = text_pixels
 
-result = Image.fromarray(output_arr, "RGBA")
-result.save(OUTPUT)
-print(f"Saved {OUTPUT} ({result.size[0]}x{result.size[1]}, mode={result.mode})")
+if __name__ == "__main__":
+    main()
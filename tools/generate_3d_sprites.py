@@ -14,37 +14,31 @@ import os
 import sys
 import urllib.request
 import urllib.error
+from functools import partial
 from io import BytesIO
 
 try:
-    from PIL import Image, ImageDraw, ImageFilter, ImageEnhance
+    from PIL import Image, ImageDraw, ImageFilter
 except ImportError:
     print("ERROR: Pillow not installed. Run: pip install Pillow")
     sys.exit(1)
 
-# Gemini API config — keys loaded from tools/.env or environment
-def _load_env():
-    env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
-    if os.path.exists(env_path):
-        with open(env_path) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    k, v = line.split("=", 1)
-                    os.environ.setdefault(k.strip(), v.strip())
-
-_load_env()
-API_KEY = os.environ.get("GEMINI_API_KEY", "")
-BACKUP_KEY = os.environ.get("GEMINI_BACKUP_KEY", "")
-if not API_KEY:
-    print("ERROR: GEMINI_API_KEY not set. Add it to tools/.env or export it.")
-    sys.exit(1)
+import debug_writer
+from candidates import best_candidate
+from env_config import gemini_keys
+from flip import flip_sheet
+from glint import glint_sheet
+from rotation import rotate_sheet
+from sheet_layout import choose_grid, save_sheet
+from sprite_utils import fit_to_cell, remove_background
+
 API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-image:generateContent"
 
 ASSETS_DIR = os.path.join(
     os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
     "packages", "pinball_components", "assets", "images"
 )
+DEBUG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sprites_debug")
 
 
 def call_gemini(prompt, api_key):
@@ -80,113 +74,46 @@ def call_gemini(prompt, api_key):
     raise RuntimeError(f"No image in response: {json.dumps(result)[:500]}")
 
 
-def remove_background(img, threshold=220):
-    """Remove white/light background, replacing with transparency."""
-    img = img.convert("RGBA")
-    data = img.getdata()
-    new_data = []
-    for r, g, b, a in data:
-        # If pixel is close to white, make transparent
-        if r > threshold and g > threshold and b > threshold:
-            new_data.append((r, g, b, 0))
-        else:
-            # Partial transparency for near-white pixels (antialiasing)
-            brightness = (r + g + b) / 3
-            if brightness > threshold - 30:
-                fade = int(255 * (1 - (brightness - (threshold - 30)) / 30))
-                new_data.append((r, g, b, min(a, fade)))
-            else:
-                new_data.append((r, g, b, a))
-    img.putdata(new_data)
-    return img
-
-
-def crop_to_content(img, padding=5):
-    """Crop image to its non-transparent content with padding."""
-    bbox = img.getbbox()
-    if bbox is None:
-        return img
-    x0, y0, x1, y1 = bbox
-    x0 = max(0, x0 - padding)
-    y0 = max(0, y0 - padding)
-    x1 = min(img.width, x1 + padding)
-    y1 = min(img.height, y1 + padding)
-    return img.crop((x0, y0, x1, y1))
-
-
-def center_on_canvas(img, width, height):
-    """Center an image on a transparent canvas of given size."""
-    canvas = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-    # Scale to fit
-    scale = min(width / img.width, height / img.height) * 0.85
-    new_w = int(img.width * scale)
-    new_h = int(img.height * scale)
-    resized = img.resize((new_w, new_h), Image.LANCZOS)
-    x = (width - new_w) // 2
-    y = (height - new_h) // 2
-    canvas.paste(resized, (x, y), resized)
-    return canvas
-
-
-def make_rotation_sheet(base_img, cols, rows, cell_w, cell_h):
-    """Create a rotation sprite sheet by rotating a single frame."""
-    total = cols * rows
-    sheet = Image.new("RGBA", (cols * cell_w, rows * cell_h), (0, 0, 0, 0))
-
-    for i in range(total):
-        angle = -360 * i / total  # negative = clockwise
-        rotated = base_img.rotate(angle, resample=Image.BICUBIC, expand=False)
-        col = i % cols
-        row = i // cols
-        sheet.paste(rotated, (col * cell_w, row * cell_h), rotated)
-
-    return sheet
-
-
-def make_coin_idle_sheet(base_img, cols, cell_w, cell_h):
-    """Create idle coin sheet with subtle brightness variation (glint effect)."""
-    sheet = Image.new("RGBA", (cols * cell_w, cell_h), (0, 0, 0, 0))
-    brightnesses = [1.0, 1.08, 1.15, 1.08]
-
-    for i in range(cols):
-        frame = base_img.copy()
-        enhancer = ImageEnhance.Brightness(frame)
-        frame = enhancer.enhance(brightnesses[i % len(brightnesses)])
-        col = i % cols
-        sheet.paste(frame, (col * cell_w, 0), frame)
+def call_gemini_with_fallback(prompt):
+    """Call Gemini with the primary key, falling back to the backup key."""
+    for key in gemini_keys():
+        try:
+            img = call_gemini(prompt, key)
+            print(f"  Got image: {img.size}")
+            return img
+        except Exception as e:
+            print(f"  Error with key ...{key[-6:]}: {e}")
+    return None
 
-    return sheet
 
+def make_rotation_sheet(base_img, cols, rows, frames=None, supersample=1, workers=None):
+    """
+    Create a rotation sprite sheet by rotating a single frame.
 
-def make_coin_flip_sheet(base_img, cols, rows, cell_w, cell_h):
-    """Create coin flip by squishing horizontally to simulate rotation on vertical axis."""
-    total = cols * rows
-    sheet = Image.new("RGBA", (cols * cell_w, rows * cell_h), (0, 0, 0, 0))
-    import math
+    supersample=2 gives smoother edges but takes about 4x as long as 1x
+    (3.3 s against 0.8 s for 32 frames of a 512px head).
+    """
+    total = frames or cols * rows
+    angles = [-360 * i / total for i in range(total)]  # negative = clockwise
+    return rotate_sheet(base_img, angles, cols, rows, supersample, workers)
 
-    for i in range(total):
-        t = i / total
-        # Cosine gives the foreshortening: 1.0 = face-on, 0 = edge-on
-        scale_x = abs(math.cos(t * 2 * math.pi))
-        scale_x = max(scale_x, 0.05)  # never fully zero
 
-        new_w = max(1, int(cell_w * scale_x))
-        frame = base_img.resize((new_w, cell_h), Image.LANCZOS)
+def make_coin_idle_sheet(base_img, cols, rows=1, frames=None):
+    """Create idle coin sheet with a specular glint sweeping across the coin."""
+    return glint_sheet(base_img, cols, rows, frames, preset="coin")
 
-        canvas = Image.new("RGBA", (cell_w, cell_h), (0, 0, 0, 0))
-        x = (cell_w - new_w) // 2
-        canvas.paste(frame, (x, 0), frame)
 
-        col = i % cols
-        row = i // cols
-        sheet.paste(canvas, (col * cell_w, row * cell_h), canvas)
+def make_coin_flip_sheet(base_img, cols, rows, frames=None):
+    """Create coin flip: a perspective spin about the vertical axis with a shaded rim.
 
-    return sheet
+    Both faces carry the logo, so the back is the front, not its mirror.
+    """
+    return flip_sheet(base_img, cols, rows, frames, back=base_img)
 
 
-def make_phone_slide_sheet(base_img, cols, rows, cell_w, cell_h):
+def make_phone_slide_sheet(base_img, cols, rows, frames=None, cell_w=200, cell_h=300):
     """Create phone sliding in from right by shifting position across frames."""
-    total = cols * rows
+    total = frames or cols * rows
     sheet = Image.new("RGBA", (cols * cell_w, rows * cell_h), (0, 0, 0, 0))
 
     for i in range(total):
@@ -206,39 +133,39 @@ def make_phone_slide_sheet(base_img, cols, rows, cell_w, cell_h):
     return sheet
 
 
-def generate_and_save(name, prompt, output_path, build_sheet_fn, cell_w, cell_h):
-    """Generate a single image with Gemini, post-process, and build sprite sheet."""
+def generate_and_save(name, prompt, output_path, build_sheet_fn, cell_w, cell_h, frames,
+                      candidates=1, symmetric=False, matte=remove_background):
+    """
+    Generate a single image with Gemini, post-process, and build a sprite
+    sheet of `frames` cells on the grid choose_grid picks for the cell size.
+    `build_sheet_fn(img, cols, rows, frames)` builds the sheet.
+    """
     print(f"\nGenerating: {name}")
 
-    raw_img = None
-    for key in [API_KEY, BACKUP_KEY]:
-        try:
-            raw_img = call_gemini(prompt, key)
-            print(f"  Got image: {raw_img.size}")
-            break
-        except Exception as e:
-            print(f"  Error with key ...{key[-6:]}: {e}")
+    raw_img, processed = best_candidate(
+        lambda: call_gemini_with_fallback(prompt), matte, candidates,
+        symmetric=symmetric, label=name, log_dir=DEBUG_DIR,
+    )
 
     if raw_img is None:
         print(f"  FAILED - skipping {name}")
         return False
 
-    # Post-process: remove background, crop, center
-    processed = remove_background(raw_img)
-    processed = crop_to_content(processed)
-    processed = center_on_canvas(processed, cell_w, cell_h)
+    # Post-process: crop, fit and center (background already removed for scoring)
+    processed = fit_to_cell(processed, cell_w, cell_h, padding=5, scale_factor=0.85)
 
     # Save the base frame for debugging
     debug_path = output_path.replace(".png", "_base.png")
-    processed.save(debug_path, "PNG")
-    print(f"  Base frame saved: {debug_path}")
+    if debug_writer.save(processed, debug_path):
+        print(f"  Base frame queued: {debug_path}")
 
     # Build sprite sheet
-    sheet = build_sheet_fn(processed)
+    cols, rows = choose_grid(frames, cell_w, cell_h)
+    sheet = build_sheet_fn(processed, cols, rows, frames)
 
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    sheet.save(output_path, "PNG")
-    print(f"  Sheet saved: {output_path} ({sheet.size[0]}x{sheet.size[1]})")
+    save_sheet(sheet, output_path, frames, cols, rows)
+    print(f"  Sheet saved: {output_path} ({sheet.size[0]}x{sheet.size[1]}, "
+          f"{frames} frames on {cols}x{rows})")
     return True
 
 
@@ -249,7 +176,21 @@ def main():
                         choices=["toly_head", "coin_idle", "coin_flip", "phone_slide", "mineshaft", "all"],
                         default=["all"],
                         help="Specific sprites to generate")
+    parser.add_argument("--candidates", type=int, default=1,
+                        help="Request N images per sprite concurrently and keep the best scoring one")
+    parser.add_argument("--matte", choices=["border", "threshold"], default="border",
+                        help="Background removal: flood from the border (keeps interior highlights) "
+                             "or every light pixel")
+    parser.add_argument("--glint-frames", type=int, default=4,
+                        help="Frames in the coin idle glint sheet")
+    parser.add_argument("--supersample", type=int, default=1,
+                        help="Rotate the Toly head at this multiple of its size for smoother edges "
+                             "(2 is about 4x slower)")
+    debug_writer.add_argument(parser)
     args = parser.parse_args()
+    gemini_keys()  # resolve the key before any request thread starts
+    debug_writer.configure(args.debug)
+    matte = partial(remove_background, threshold=220, mode=args.matte)
 
     targets = args.sprites
     if "all" in targets:
@@ -267,8 +208,9 @@ def main():
             "shading and clean outlines. Single centered portrait on a plain white background. "
             "Head and shoulders only, front-facing view.",
             os.path.join(ASSETS_DIR, "android", "spaceship", "toly_head.png"),
-            lambda img: make_rotation_sheet(img, 8, 4, CELL, CELL),
-            CELL, CELL,
+            partial(make_rotation_sheet, supersample=args.supersample),
+            CELL, CELL, 32,
+            candidates=args.candidates, matte=matte,
         )
 
     # --- COIN IDLE ---
@@ -280,8 +222,9 @@ def main():
             "The coin is thick, metallic gold with beveled edges and a subtle shine highlight. "
             "Viewed straight-on from the front. Plain white background. Game asset style.",
             os.path.join(ASSETS_DIR, "solana_coin", "idle.png"),
-            lambda img: make_coin_idle_sheet(img, 4, CELL, CELL),
-            CELL, CELL,
+            make_coin_idle_sheet,
+            CELL, CELL, args.glint_frames,
+            candidates=args.candidates, symmetric=True, matte=matte,
         )
 
     # --- COIN FLIP ---
@@ -293,8 +236,9 @@ def main():
             "The coin is thick, metallic gold with beveled edges and a subtle shine highlight. "
             "Viewed straight-on from the front. Plain white background. Game asset style.",
             os.path.join(ASSETS_DIR, "solana_coin", "flip.png"),
-            lambda img: make_coin_flip_sheet(img, 6, 4, CELL, CELL),
-            CELL, CELL,
+            make_coin_flip_sheet,
+            CELL, CELL, 24,
+            candidates=args.candidates, symmetric=True, matte=matte,
         )
 
     # --- PHONE SLIDE ---
@@ -306,33 +250,28 @@ def main():
             "The hand grips the phone from the right side. Clean game asset style with smooth "
             "shading, colorful, on a plain white background.",
             os.path.join(ASSETS_DIR, "seeker_phone", "slide.png"),
-            lambda img: make_phone_slide_sheet(img, 8, 2, CELL, 300),
-            CELL, 300,
+            partial(make_phone_slide_sheet, cell_w=CELL, cell_h=300),
+            CELL, 300, 16,
+            candidates=args.candidates, matte=matte,
         )
 
     # --- MINESHAFT (static, no sheet needed) ---
     if "mineshaft" in targets:
         print("\nGenerating: mineshaft")
-        raw_img = None
-        for key in [API_KEY, BACKUP_KEY]:
-            try:
-                raw_img = call_gemini(
-                    "A 3D rendered mine entrance in isometric game art style. Dark cave opening "
-                    "framed by wooden support beams with gold ore veins visible in the surrounding rock. "
-                    "A rustic wooden sign reading 'ORE' hangs above the entrance. Small lanterns on the "
-                    "beams cast warm light. Gold nuggets scattered at the base. Colorful, polished, "
-                    "clean outlines, on a plain white background.",
-                    key,
-                )
-                print(f"  Got image: {raw_img.size}")
-                break
-            except Exception as e:
-                print(f"  Error with key ...{key[-6:]}: {e}")
+        mineshaft_prompt = (
+            "A 3D rendered mine entrance in isometric game art style. Dark cave opening "
+            "framed by wooden support beams with gold ore veins visible in the surrounding rock. "
+            "A rustic wooden sign reading 'ORE' hangs above the entrance. Small lanterns on the "
+            "beams cast warm light. Gold nuggets scattered at the base. Colorful, polished, "
+            "clean outlines, on a plain white background."
+        )
+        raw_img, processed = best_candidate(
+            lambda: call_gemini_with_fallback(mineshaft_prompt), matte,
+            args.candidates, label="mineshaft", log_dir=DEBUG_DIR,
+        )
 
         if raw_img:
-            processed = remove_background(raw_img)
-            processed = crop_to_content(processed)
-            processed = center_on_canvas(processed, CELL, 300)
+            processed = fit_to_cell(processed, CELL, 300, padding=5, scale_factor=0.85)
             out = os.path.join(ASSETS_DIR, "android", "mineshaft.png")
             os.makedirs(os.path.dirname(out), exist_ok=True)
             processed.save(out, "PNG")
@@ -6,9 +6,12 @@ Each letter is rendered inside a circle matching the original sprite dimensions.
 - Dimmed state: Dark muted circle with dim letter
 """
 
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from PIL import Image, ImageDraw, ImageFont
+import argparse
 import os
 
+from glow import blur_pyramid, paste_layer, soft_layer
+
 BASE_DIR = os.path.join(
     os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
     "packages", "pinball_components", "assets", "images", "google_word"
@@ -59,15 +62,12 @@ def make_sprite(letter, size, lit=True):
 
     if lit:
         # Outer glow layer (purple, slightly larger)
-        glow_img = Image.new("RGBA", (sw, sh), (0, 0, 0, 0))
-        glow_draw = ImageDraw.Draw(glow_img)
         glow_r = radius + scale * 2
-        glow_draw.ellipse(
-            [cx - glow_r, cy - glow_r, cx + glow_r, cy + glow_r],
-            fill=PURPLE + (100,)
-        )
-        glow_img = glow_img.filter(ImageFilter.GaussianBlur(radius=scale * 2))
-        img = Image.alpha_composite(img, glow_img)
+        glow_box = [cx - glow_r, cy - glow_r, cx + glow_r, cy + glow_r]
+
+        def paint_glow(d, dx, dy):
+            d.ellipse([glow_box[0] - dx, glow_box[1] - dy, glow_box[2] - dx, glow_box[3] - dy], fill=255)
+        paste_layer(img, *soft_layer(glow_box, scale * 2, PURPLE + (100,), paint_glow, img.size))
         draw = ImageDraw.Draw(img)
 
         # Main circle with gradient: green center fading to purple edge
@@ -139,11 +139,12 @@ def make_sprite(letter, size, lit=True):
 
     if lit:
         # Text shadow for depth
-        shadow = Image.new("RGBA", (sw, sh), (0, 0, 0, 0))
-        sd = ImageDraw.Draw(shadow)
-        sd.text((tx + scale, ty + scale), letter, font=font, fill=(0, 0, 0, 80))
-        shadow = shadow.filter(ImageFilter.GaussianBlur(radius=scale))
-        img = Image.alpha_composite(img, shadow)
+        sx, sy = tx + scale, ty + scale
+
+        def paint_shadow(d, dx, dy):
+            d.text((sx - dx, sy - dy), letter, font=font, fill=255)
+        shadow_box = (sx + bbox[0], sy + bbox[1], sx + bbox[2], sy + bbox[3])
+        paste_layer(img, *soft_layer(shadow_box, scale, (0, 0, 0, 80), paint_shadow, img.size))
         draw = ImageDraw.Draw(img)
 
     draw.text((tx, ty), letter, font=font, fill=letter_color)
@@ -157,7 +158,7 @@ def make_sprite(letter, size, lit=True):
         fill=255
     )
     if lit:
-        mask = mask.filter(ImageFilter.GaussianBlur(radius=scale))
+        mask = blur_pyramid(mask, scale)
     img.putalpha(Image.composite(img.split()[3], Image.new("L", (sw, sh), 0), mask))
 
     # Downscale with high-quality resampling
@@ -166,8 +167,12 @@ def make_sprite(letter, size, lit=True):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate the SEEKER letter sprites")
+    parser.add_argument("--output", default=BASE_DIR, help="google_word directory to write into")
+    args = parser.parse_args()
+
     for letter, folder, size in LETTERS:
-        out_dir = os.path.join(BASE_DIR, folder)
+        out_dir = os.path.join(args.output, folder)
         os.makedirs(out_dir, exist_ok=True)
 
         for state in ("lit", "dimmed"):
@@ -9,6 +9,7 @@ import os
 import sys
 import urllib.request
 import urllib.error
+from functools import partial
 from io import BytesIO
 
 try:
@@ -17,23 +18,11 @@ except ImportError:
     print("ERROR: Pillow not installed. Run: pip install Pillow")
     sys.exit(1)
 
-# Gemini API config — keys loaded from tools/.env or environment
-def _load_env():
-    env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
-    if os.path.exists(env_path):
-        with open(env_path) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    k, v = line.split("=", 1)
-                    os.environ.setdefault(k.strip(), v.strip())
-
-_load_env()
-API_KEY = os.environ.get("GEMINI_API_KEY", "")
-BACKUP_KEY = os.environ.get("GEMINI_BACKUP_KEY", "")
-if not API_KEY:
-    print("ERROR: GEMINI_API_KEY not set. Add it to tools/.env or export it.")
-    sys.exit(1)
+import debug_writer
+from candidates import best_candidate
+from env_config import gemini_keys
+from sprite_utils import fit_to_cell, remove_background
+
 API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-image:generateContent"
 
 ASSETS_DIR = os.path.join(
@@ -71,50 +60,30 @@ def call_gemini(prompt, api_key):
     raise RuntimeError(f"No image in response: {json.dumps(result)[:500]}")
 
 
-def remove_background(img, threshold=220):
-    img = img.convert("RGBA")
-    pixels = list(img.getdata())
-    new_data = []
-    for r, g, b, a in pixels:
-        if r > threshold and g > threshold and b > threshold:
-            new_data.append((r, g, b, 0))
-        else:
-            brightness = (r + g + b) / 3
-            if brightness > threshold - 30:
-                fade = int(255 * (1 - (brightness - (threshold - 30)) / 30))
-                new_data.append((r, g, b, min(a, fade)))
-            else:
-                new_data.append((r, g, b, a))
-    img.putdata(new_data)
-    return img
-
-
-def crop_to_content(img, padding=10):
-    bbox = img.getbbox()
-    if bbox is None:
-        return img
-    x0, y0, x1, y1 = bbox
-    x0 = max(0, x0 - padding)
-    y0 = max(0, y0 - padding)
-    x1 = min(img.width, x1 + padding)
-    y1 = min(img.height, y1 + padding)
-    return img.crop((x0, y0, x1, y1))
-
-
-def center_on_canvas(img, width, height):
-    canvas = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-    scale = min(width / img.width, height / img.height) * 0.9
-    new_w = int(img.width * scale)
-    new_h = int(img.height * scale)
-    resized = img.resize((new_w, new_h), Image.LANCZOS)
-    x = (width - new_w) // 2
-    y = (height - new_h) // 2
-    canvas.paste(resized, (x, y), resized)
-    return canvas
+def call_gemini_with_fallback(prompt):
+    for key in gemini_keys():
+        try:
+            img = call_gemini(prompt, key)
+            print(f"  Got image: {img.size}")
+            return img
+        except Exception as e:
+            print(f"  Error with key ...{key[-6:]}: {e}")
+    return None
 
 
 def main():
-    os.makedirs(DEBUG_DIR, exist_ok=True)
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate the SeekerPhone sprites")
+    parser.add_argument("--candidates", type=int, default=1,
+                        help="Request N images per state concurrently and keep the best scoring one")
+    parser.add_argument("--matte", choices=["border", "threshold"], default="border",
+                        help="Background removal: flood from the border (keeps interior highlights) "
+                             "or every light pixel")
+    debug_writer.add_argument(parser)
+    args = parser.parse_args()
+    gemini_keys()  # resolve the key before any request thread starts
+    debug_writer.configure(args.debug)
+    matte = partial(remove_background, threshold=220, mode=args.matte)
 
     # Generate the 3D phone with robotic arm - retracted state
     retracted_prompt = (
@@ -136,29 +105,22 @@ def main():
     )
 
     print("Generating 3D SeekerPhone with robotic arm (retracted)...")
-    result = None
-    for key in [API_KEY, BACKUP_KEY]:
-        try:
-            result = call_gemini(retracted_prompt, key)
-            print(f"  Got image: {result.size}")
-            break
-        except Exception as e:
-            print(f"  Error with key ...{key[-6:]}: {e}")
+    result, processed = best_candidate(
+        lambda: call_gemini_with_fallback(retracted_prompt), matte,
+        args.candidates, label="phone_retracted", log_dir=DEBUG_DIR,
+    )
 
     if result is None:
         print("FAILED retracted version!")
         sys.exit(1)
 
-    raw_path = os.path.join(DEBUG_DIR, "phone_retracted_raw.png")
-    result.save(raw_path, "PNG")
+    debug_writer.save(result, os.path.join(DEBUG_DIR, "phone_retracted_raw.png"), level=debug_writer.ALL)
 
-    processed = remove_background(result)
-    processed = crop_to_content(processed)
-    processed = center_on_canvas(processed, 512, 512)
+    processed = fit_to_cell(processed, 512, 512, padding=10, scale_factor=0.9)
 
     debug_path = os.path.join(DEBUG_DIR, "phone_retracted_processed.png")
-    processed.save(debug_path, "PNG")
-    print(f"  Saved: {debug_path}")
+    if debug_writer.save(processed, debug_path):
+        print(f"  Queued: {debug_path}")
 
     # Generate extended state (arm pushed out further)
     extended_prompt = (
@@ -181,26 +143,21 @@ def main():
     )
 
     print("Generating 3D SeekerPhone with robotic arm (extended)...")
-    result_ext = None
-    for key in [API_KEY, BACKUP_KEY]:
-        try:
-            result_ext = call_gemini(extended_prompt, key)
-            print(f"  Got image: {result_ext.size}")
-            break
-        except Exception as e:
-            print(f"  Error with key ...{key[-6:]}: {e}")
+    result_ext, processed_ext = best_candidate(
+        lambda: call_gemini_with_fallback(extended_prompt), matte,
+        args.candidates, label="phone_extended", log_dir=DEBUG_DIR,
+    )
 
     if result_ext is None:
         print("FAILED extended version, using retracted for both")
         result_ext = result
+        processed_ext = matte(result_ext)
 
-    processed_ext = remove_background(result_ext)
-    processed_ext = crop_to_content(processed_ext)
-    processed_ext = center_on_canvas(processed_ext, 512, 512)
+    processed_ext = fit_to_cell(processed_ext, 512, 512, padding=10, scale_factor=0.9)
 
     ext_debug = os.path.join(DEBUG_DIR, "phone_extended_processed.png")
-    processed_ext.save(ext_debug, "PNG")
-    print(f"  Saved: {ext_debug}")
+    if debug_writer.save(processed_ext, ext_debug):
+        print(f"  Queued: {ext_debug}")
 
     # Save assets
     phone_dir = os.path.join(ASSETS_DIR, "seeker_phone")
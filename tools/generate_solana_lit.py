@@ -6,6 +6,7 @@ import os
 import sys
 import urllib.request
 import urllib.error
+from functools import partial
 from io import BytesIO
 
 try:
@@ -14,21 +15,11 @@ except ImportError:
     print("ERROR: Pillow not installed.")
     sys.exit(1)
 
-def _load_env():
-    env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
-    if os.path.exists(env_path):
-        with open(env_path) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    k, v = line.split("=", 1)
-                    os.environ.setdefault(k.strip(), v.strip())
-
-_load_env()
-API_KEY = os.environ.get("GEMINI_API_KEY", "")
-if not API_KEY:
-    print("ERROR: GEMINI_API_KEY not set.")
-    sys.exit(1)
+import debug_writer
+from candidates import best_candidate
+from env_config import gemini_keys
+from sprite_utils import fit_to_cell, remove_background
+
 API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-image:generateContent"
 
 ASSETS_DIR = os.path.join(
@@ -46,7 +37,7 @@ def call_gemini(prompt):
             "temperature": 0.7,
         },
     }
-    url = f"{API_URL}?key={API_KEY}"
+    url = f"{API_URL}?key={gemini_keys()[0]}"
     data = json.dumps(payload).encode("utf-8")
     req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
     try:
@@ -64,50 +55,20 @@ def call_gemini(prompt):
     raise RuntimeError(f"No image in response: {json.dumps(result)[:500]}")
 
 
-def remove_background(img, threshold=215):
-    img = img.convert("RGBA")
-    data = img.getdata()
-    new_data = []
-    for r, g, b, a in data:
-        if r > threshold and g > threshold and b > threshold:
-            new_data.append((r, g, b, 0))
-        else:
-            brightness = (r + g + b) / 3
-            if brightness > threshold - 30:
-                fade = int(255 * (1 - (brightness - (threshold - 30)) / 30))
-                new_data.append((r, g, b, min(a, fade)))
-            else:
-                new_data.append((r, g, b, a))
-    img.putdata(new_data)
-    return img
-
-
-def crop_to_content(img, padding=5):
-    bbox = img.getbbox()
-    if bbox is None:
-        return img
-    x0, y0, x1, y1 = bbox
-    x0 = max(0, x0 - padding)
-    y0 = max(0, y0 - padding)
-    x1 = min(img.width, x1 + padding)
-    y1 = min(img.height, y1 + padding)
-    return img.crop((x0, y0, x1, y1))
-
-
-def center_on_canvas(img, width, height, scale_factor=0.88):
-    canvas = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-    scale = min(width / img.width, height / img.height) * scale_factor
-    new_w = int(img.width * scale)
-    new_h = int(img.height * scale)
-    resized = img.resize((new_w, new_h), Image.LANCZOS)
-    x = (width - new_w) // 2
-    y = (height - new_h) // 2
-    canvas.paste(resized, (x, y), resized)
-    return canvas
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate the lit Solana token")
+    parser.add_argument("--candidates", type=int, default=1,
+                        help="Request N images concurrently and keep the best scoring one")
+    parser.add_argument("--matte", choices=["border", "threshold"], default="border",
+                        help="Background removal: flood from the border (keeps interior highlights) "
+                             "or every light pixel")
+    debug_writer.add_argument(parser)
+    args = parser.parse_args()
+    gemini_keys()  # resolve the key before any request thread starts
+    debug_writer.configure(args.debug)
+    matte = partial(remove_background, threshold=215, mode=args.matte)
 
-
-if __name__ == "__main__":
-    os.makedirs(DEBUG_DIR, exist_ok=True)
     os.makedirs(ASSETS_DIR, exist_ok=True)
 
     prompt = """Generate a single high-quality 3D rendering of a Solana cryptocurrency token/coin that is GLOWING BRIGHTLY.
@@ -127,12 +88,20 @@ Requirements:
 - Photorealistic 3D render style with dramatic lighting"""
 
     print("Generating glowing Solana token with Gemini...")
-    raw = call_gemini(prompt)
-    raw.save(os.path.join(DEBUG_DIR, "token_lit_raw.png"))
-
-    processed = remove_background(raw)
-    processed = crop_to_content(processed)
-    processed = center_on_canvas(processed, 256, 256)
-    processed.save(os.path.join(DEBUG_DIR, "token_lit_processed.png"))
+    raw, processed = best_candidate(
+        lambda: call_gemini(prompt), matte, args.candidates,
+        symmetric=True, label="token_lit", log_dir=DEBUG_DIR,
+    )
+    if raw is None:
+        print("ERROR: No image generated!")
+        sys.exit(1)
+    debug_writer.save(raw, os.path.join(DEBUG_DIR, "token_lit_raw.png"), level=debug_writer.ALL)
+
+    processed = fit_to_cell(processed, 256, 256)
+    debug_writer.save(processed, os.path.join(DEBUG_DIR, "token_lit_processed.png"))
     processed.save(os.path.join(ASSETS_DIR, "lit.png"))
     print(f"Saved lit.png: {processed.size}")
+
+
+if __name__ == "__main__":
+    main()
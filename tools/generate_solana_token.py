@@ -7,33 +7,25 @@ import base64
 import json
 import os
 import sys
-import math
 import urllib.request
 import urllib.error
+from functools import partial
 from io import BytesIO
 
 try:
-    from PIL import Image, ImageEnhance, ImageFilter
+    from PIL import Image, ImageFilter
 except ImportError:
     print("ERROR: Pillow not installed. Run: pip install Pillow")
     sys.exit(1)
 
-# Gemini API config
-def _load_env():
-    env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
-    if os.path.exists(env_path):
-        with open(env_path) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    k, v = line.split("=", 1)
-                    os.environ.setdefault(k.strip(), v.strip())
-
-_load_env()
-API_KEY = os.environ.get("GEMINI_API_KEY", "")
-if not API_KEY:
-    print("ERROR: GEMINI_API_KEY not set. Add it to tools/.env or export it.")
-    sys.exit(1)
+import debug_writer
+from candidates import best_candidate
+from env_config import gemini_keys
+from flip import flip_sheet
+from glint import glint_sheet
+from sheet_layout import choose_grid, save_sheet
+from sprite_utils import fit_to_cell, remove_background
+
 API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-image:generateContent"
 
 ASSETS_DIR = os.path.join(
@@ -44,6 +36,7 @@ DEBUG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solana_deb
 
 CELL_W = 256
 CELL_H = 256
+FLIP_FRAMES = 8
 
 
 def call_gemini(prompt):
@@ -56,7 +49,7 @@ def call_gemini(prompt):
         },
     }
 
-    url = f"{API_URL}?key={API_KEY}"
+    url = f"{API_URL}?key={gemini_keys()[0]}"
     data = json.dumps(payload).encode("utf-8")
     req = urllib.request.Request(
         url, data=data,
@@ -79,109 +72,26 @@ def call_gemini(prompt):
     raise RuntimeError(f"No image in response: {json.dumps(result)[:500]}")
 
 
-def remove_background(img, threshold=215):
-    """Remove white/light background, replacing with transparency."""
-    img = img.convert("RGBA")
-    data = img.getdata()
-    new_data = []
-    for r, g, b, a in data:
-        if r > threshold and g > threshold and b > threshold:
-            new_data.append((r, g, b, 0))
-        else:
-            brightness = (r + g + b) / 3
-            if brightness > threshold - 30:
-                fade = int(255 * (1 - (brightness - (threshold - 30)) / 30))
-                new_data.append((r, g, b, min(a, fade)))
-            else:
-                new_data.append((r, g, b, a))
-    img.putdata(new_data)
-    return img
-
-
-def crop_to_content(img, padding=5):
-    """Crop image to its non-transparent content with padding."""
-    bbox = img.getbbox()
-    if bbox is None:
-        return img
-    x0, y0, x1, y1 = bbox
-    x0 = max(0, x0 - padding)
-    y0 = max(0, y0 - padding)
-    x1 = min(img.width, x1 + padding)
-    y1 = min(img.height, y1 + padding)
-    return img.crop((x0, y0, x1, y1))
-
-
-def center_on_canvas(img, width, height, scale_factor=0.88):
-    """Center an image on a transparent canvas of given size."""
-    canvas = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-    scale = min(width / img.width, height / img.height) * scale_factor
-    new_w = int(img.width * scale)
-    new_h = int(img.height * scale)
-    resized = img.resize((new_w, new_h), Image.LANCZOS)
-    x = (width - new_w) // 2
-    y = (height - new_h) // 2
-    canvas.paste(resized, (x, y), resized)
-    return canvas
-
-
-def make_idle_sheet(base_img, cols=4):
-    """Create idle sheet with subtle glint animation."""
-    sheet = Image.new("RGBA", (cols * CELL_W, CELL_H), (0, 0, 0, 0))
-    brightnesses = [1.0, 1.06, 1.12, 1.06]
-
-    for i in range(cols):
-        frame = base_img.copy()
-        enhancer = ImageEnhance.Brightness(frame)
-        frame = enhancer.enhance(brightnesses[i])
-        sheet.paste(frame, (i * CELL_W, 0), frame)
-
-    return sheet
-
-
-def make_lit_sheet(base_img, cols=4):
-    """Create lit/glowing version of the token."""
-    sheet = Image.new("RGBA", (cols * CELL_W, CELL_H), (0, 0, 0, 0))
-    brightnesses = [1.25, 1.35, 1.45, 1.35]
-
-    for i in range(cols):
-        frame = base_img.copy()
-        enhancer = ImageEnhance.Brightness(frame)
-        frame = enhancer.enhance(brightnesses[i])
-        # Add color boost
-        enhancer2 = ImageEnhance.Color(frame)
-        frame = enhancer2.enhance(1.3)
-        sheet.paste(frame, (i * CELL_W, 0), frame)
-
-    return sheet
-
-
-def make_flip_sheet(base_img, cols=8, rows=1):
-    """Create coin flip by squishing horizontally to simulate Y-axis rotation."""
-    total = cols * rows
-    sheet = Image.new("RGBA", (cols * CELL_W, rows * CELL_H), (0, 0, 0, 0))
-
-    for i in range(total):
-        t = i / total
-        squeeze = abs(math.cos(t * 2 * math.pi))
-        squeeze = max(squeeze, 0.08)  # don't go fully flat
-
-        new_w = max(1, int(CELL_W * squeeze))
-        frame = base_img.resize((new_w, CELL_H), Image.LANCZOS)
-
-        canvas = Image.new("RGBA", (CELL_W, CELL_H), (0, 0, 0, 0))
-        x = (CELL_W - new_w) // 2
-        canvas.paste(frame, (x, 0), frame)
-
-        col = i % cols
-        row = i // cols
-        sheet.paste(canvas, (col * CELL_W, row * CELL_H), canvas)
-
-    return sheet
-
-
-def generate_token():
+def make_idle_sheet(base_img, cols=4, rows=1, frames=None):
+    """Create idle sheet with a specular glint sweeping across the token."""
+    return glint_sheet(base_img, cols, rows, frames, preset="coin")
+
+
+def make_lit_sheet(base_img, cols=4, rows=1, frames=None):
+    """Create lit/glowing version of the token, with a broader glint."""
+    return glint_sheet(base_img, cols, rows, frames, preset="coin_lit")
+
+
+def make_flip_sheet(base_img, cols=8, rows=1, frames=None):
+    """Create coin flip: a perspective spin about the Y axis with a shaded rim.
+
+    Both faces carry the logo, so the back is the front, not its mirror.
+    """
+    return flip_sheet(base_img, cols, rows, frames, back=base_img)
+
+
+def generate_token(candidates=1, matte=partial(remove_background, threshold=215), glint_frames=4):
     """Generate the 3D Solana token using Gemini."""
-    os.makedirs(DEBUG_DIR, exist_ok=True)
     os.makedirs(ASSETS_DIR, exist_ok=True)
 
     prompt = """Generate a single high-quality 3D rendering of a Solana cryptocurrency token/coin.
@@ -200,36 +110,56 @@ Requirements:
 - Photorealistic 3D render style"""
 
     print("Generating 3D Solana token with Gemini...")
-    raw_img = call_gemini(prompt)
-    raw_img.save(os.path.join(DEBUG_DIR, "token_raw.png"))
+    raw_img, processed = best_candidate(
+        lambda: call_gemini(prompt), matte, candidates,
+        symmetric=True, label="token", log_dir=DEBUG_DIR,
+    )
+    if raw_img is None:
+        print("ERROR: No token image generated!")
+        sys.exit(1)
+    debug_writer.save(raw_img, os.path.join(DEBUG_DIR, "token_raw.png"), level=debug_writer.ALL)
     print(f"  Raw image: {raw_img.size}")
 
-    # Process: remove background, crop, center
-    processed = remove_background(raw_img)
-    processed = crop_to_content(processed)
-    processed = center_on_canvas(processed, CELL_W, CELL_H)
-    processed.save(os.path.join(DEBUG_DIR, "token_processed.png"))
+    # Process: crop, fit and center (background already removed for scoring)
+    processed = fit_to_cell(processed, CELL_W, CELL_H)
+    debug_writer.save(processed, os.path.join(DEBUG_DIR, "token_processed.png"))
     print(f"  Processed: {processed.size}")
 
-    # Generate sprite sheets
-    print("Creating idle sprite sheet...")
-    idle = make_idle_sheet(processed)
-    idle.save(os.path.join(ASSETS_DIR, "idle.png"))
-    print(f"  idle.png: {idle.size}")
-
-    print("Creating lit sprite sheet...")
-    lit = make_lit_sheet(processed)
-    lit.save(os.path.join(ASSETS_DIR, "lit.png"))
-    print(f"  lit.png: {lit.size}")
-
-    print("Creating flip sprite sheet...")
-    flip = make_flip_sheet(processed)
-    flip.save(os.path.join(ASSETS_DIR, "flip.png"))
-    print(f"  flip.png: {flip.size}")
+    # Generate sprite sheets, each on the grid choose_grid picks
+    sheets = [
+        ("idle", make_idle_sheet, glint_frames),
+        ("lit", make_lit_sheet, glint_frames),
+        ("flip", make_flip_sheet, FLIP_FRAMES),
+    ]
+    for name, make_sheet, frames in sheets:
+        print(f"Creating {name} sprite sheet...")
+        cols, rows = choose_grid(frames, CELL_W, CELL_H)
+        sheet = make_sheet(processed, cols, rows, frames)
+        save_sheet(sheet, os.path.join(ASSETS_DIR, f"{name}.png"), frames, cols, rows)
+        print(f"  {name}.png: {sheet.size}, {frames} frames on {cols}x{rows}")
 
     print("\nDone! Assets saved to:", ASSETS_DIR)
-    print("Debug images saved to:", DEBUG_DIR)
+    if debug_writer.writer().level:
+        print("Debug images saved to:", DEBUG_DIR)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate Solana token sprite sheets")
+    parser.add_argument("--candidates", type=int, default=1,
+                        help="Request N images concurrently and keep the best scoring one")
+    parser.add_argument("--matte", choices=["border", "threshold"], default="border",
+                        help="Background removal: flood from the border (keeps interior highlights) "
+                             "or every light pixel")
+    parser.add_argument("--glint-frames", type=int, default=4,
+                        help="Frames in the idle and lit glint sheets")
+    debug_writer.add_argument(parser)
+    args = parser.parse_args()
+    gemini_keys()  # resolve the key before any request thread starts
+    debug_writer.configure(args.debug)
+    matte = partial(remove_background, threshold=215, mode=args.matte)
+    generate_token(candidates=args.candidates, matte=matte, glint_frames=args.glint_frames)
 
 
 if __name__ == "__main__":
-    generate_token()
+    main()
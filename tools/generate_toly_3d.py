@@ -10,6 +10,7 @@ import os
 import sys
 import urllib.request
 import urllib.error
+from functools import partial
 from io import BytesIO
 
 try:
@@ -18,23 +19,11 @@ except ImportError:
     print("ERROR: Pillow not installed. Run: pip install Pillow")
     sys.exit(1)
 
-# Gemini API config — keys loaded from tools/.env or environment
-def _load_env():
-    env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
-    if os.path.exists(env_path):
-        with open(env_path) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    k, v = line.split("=", 1)
-                    os.environ.setdefault(k.strip(), v.strip())
-
-_load_env()
-API_KEY = os.environ.get("GEMINI_API_KEY", "")
-BACKUP_KEY = os.environ.get("GEMINI_BACKUP_KEY", "")
-if not API_KEY:
-    print("ERROR: GEMINI_API_KEY not set. Add it to tools/.env or export it.")
-    sys.exit(1)
+import debug_writer
+from candidates import best_candidate
+from env_config import gemini_keys
+from sprite_utils import fit_to_cell, remove_background
+
 API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-image:generateContent"
 
 REFERENCE_URL = "https://pbs.twimg.com/media/G71jKB4XEAAtIaV.jpg"
@@ -97,50 +86,31 @@ def call_gemini_with_image(prompt, ref_image, api_key):
     raise RuntimeError(f"No image in response: {json.dumps(result)[:500]}")
 
 
-def remove_background(img, threshold=220):
-    img = img.convert("RGBA")
-    pixels = list(img.getdata())
-    new_data = []
-    for r, g, b, a in pixels:
-        if r > threshold and g > threshold and b > threshold:
-            new_data.append((r, g, b, 0))
-        else:
-            brightness = (r + g + b) / 3
-            if brightness > threshold - 30:
-                fade = int(255 * (1 - (brightness - (threshold - 30)) / 30))
-                new_data.append((r, g, b, min(a, fade)))
-            else:
-                new_data.append((r, g, b, a))
-    img.putdata(new_data)
-    return img
-
-
-def crop_to_content(img, padding=10):
-    bbox = img.getbbox()
-    if bbox is None:
-        return img
-    x0, y0, x1, y1 = bbox
-    x0 = max(0, x0 - padding)
-    y0 = max(0, y0 - padding)
-    x1 = min(img.width, x1 + padding)
-    y1 = min(img.height, y1 + padding)
-    return img.crop((x0, y0, x1, y1))
-
-
-def center_on_canvas(img, size):
-    canvas = Image.new("RGBA", (size, size), (0, 0, 0, 0))
-    scale = min(size / img.width, size / img.height) * 0.9
-    new_w = int(img.width * scale)
-    new_h = int(img.height * scale)
-    resized = img.resize((new_w, new_h), Image.LANCZOS)
-    x = (size - new_w) // 2
-    y = (size - new_h) // 2
-    canvas.paste(resized, (x, y), resized)
-    return canvas
+def call_gemini_with_fallback(prompt, ref_img):
+    for key in gemini_keys():
+        try:
+            img = call_gemini_with_image(prompt, ref_img, key)
+            print(f"  Got image: {img.size}")
+            return img
+        except Exception as e:
+            print(f"  Error with key ...{key[-6:]}: {e}")
+    return None
 
 
 def main():
-    os.makedirs(DEBUG_DIR, exist_ok=True)
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate the 3D Toly figurine")
+    parser.add_argument("--candidates", type=int, default=1,
+                        help="Request N images concurrently and keep the best scoring one")
+    parser.add_argument("--matte", choices=["border", "threshold"], default="border",
+                        help="Background removal: flood from the border (keeps interior highlights) "
+                             "or every light pixel")
+    debug_writer.add_argument(parser)
+    args = parser.parse_args()
+    gemini_keys()  # resolve the key before any request thread starts
+    debug_writer.configure(args.debug)
+    matte = partial(remove_background, threshold=220, mode=args.matte)
+
     ref_img = download_reference()
 
     prompt = (
@@ -165,14 +135,10 @@ def main():
     )
 
     print("\nGenerating 3D Toly figurine...")
-    result = None
-    for key in [API_KEY, BACKUP_KEY]:
-        try:
-            result = call_gemini_with_image(prompt, ref_img, key)
-            print(f"  Got image: {result.size}")
-            break
-        except Exception as e:
-            print(f"  Error with key ...{key[-6:]}: {e}")
+    result, processed = best_candidate(
+        lambda: call_gemini_with_fallback(prompt, ref_img), matte,
+        args.candidates, label="toly_3d", log_dir=DEBUG_DIR,
+    )
 
     if result is None:
         print("FAILED to generate image!")
@@ -180,17 +146,15 @@ def main():
 
     # Save raw result
     raw_path = os.path.join(DEBUG_DIR, "toly_3d_raw.png")
-    result.save(raw_path, "PNG")
-    print(f"  Raw saved: {raw_path}")
+    if debug_writer.save(result, raw_path, level=debug_writer.ALL):
+        print(f"  Raw queued: {raw_path}")
 
-    # Post-process
-    processed = remove_background(result)
-    processed = crop_to_content(processed)
-    processed = center_on_canvas(processed, 512)
+    # Post-process (background already removed for scoring)
+    processed = fit_to_cell(processed, 512, padding=10, scale_factor=0.9)
 
     debug_path = os.path.join(DEBUG_DIR, "toly_3d_processed.png")
-    processed.save(debug_path, "PNG")
-    print(f"  Processed saved: {debug_path}")
+    if debug_writer.save(processed, debug_path):
+        print(f"  Processed queued: {debug_path}")
 
     # Save as the game asset (single static image, not spritesheet)
     os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
@@ -12,6 +12,7 @@ import os
 import sys
 import urllib.request
 import urllib.error
+from functools import partial
 from io import BytesIO
 
 try:
@@ -20,23 +21,14 @@ except ImportError:
     print("ERROR: Pillow not installed. Run: pip install Pillow")
     sys.exit(1)
 
-# Gemini API config — keys loaded from tools/.env or environment
-def _load_env():
-    env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
-    if os.path.exists(env_path):
-        with open(env_path) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    k, v = line.split("=", 1)
-                    os.environ.setdefault(k.strip(), v.strip())
-
-_load_env()
-API_KEY = os.environ.get("GEMINI_API_KEY", "")
-BACKUP_KEY = os.environ.get("GEMINI_BACKUP_KEY", "")
-if not API_KEY:
-    print("ERROR: GEMINI_API_KEY not set. Add it to tools/.env or export it.")
-    sys.exit(1)
+import debug_writer
+from candidates import best_candidate
+from env_config import gemini_keys
+from frame_interp import interpolate_pair
+from frame_store import FrameStore, map_chunks
+from sheet_layout import choose_grid, save_sheet
+from sprite_utils import fit_to_cell, remove_background
+
 API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-image:generateContent"
 
 REFERENCE_URL = "https://pbs.twimg.com/media/G71jKB4XEAAtIaV.jpg"
@@ -50,9 +42,8 @@ DEBUG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "toly_debug
 
 # Sprite sheet config
 CELL = 256  # pixels per frame
-COLS = 8
-ROWS = 4
-TOTAL_FRAMES = COLS * ROWS  # 32 frames for full 360 rotation
+TOTAL_FRAMES = 32  # full 360 rotation
+COLS, ROWS = choose_grid(TOTAL_FRAMES, CELL, CELL)
 
 
 def download_reference():
@@ -120,51 +111,6 @@ def call_gemini_with_image(prompt, ref_image, api_key):
     raise RuntimeError(f"No image in response: {json.dumps(result)[:500]}")
 
 
-def remove_background(img, threshold=220):
-    """Remove white/light background to transparency."""
-    img = img.convert("RGBA")
-    data = img.getdata()
-    new_data = []
-    for r, g, b, a in data:
-        if r > threshold and g > threshold and b > threshold:
-            new_data.append((r, g, b, 0))
-        else:
-            brightness = (r + g + b) / 3
-            if brightness > threshold - 30:
-                fade = int(255 * (1 - (brightness - (threshold - 30)) / 30))
-                new_data.append((r, g, b, min(a, fade)))
-            else:
-                new_data.append((r, g, b, a))
-    img.putdata(new_data)
-    return img
-
-
-def crop_to_content(img, padding=5):
-    """Crop to non-transparent content."""
-    bbox = img.getbbox()
-    if bbox is None:
-        return img
-    x0, y0, x1, y1 = bbox
-    x0 = max(0, x0 - padding)
-    y0 = max(0, y0 - padding)
-    x1 = min(img.width, x1 + padding)
-    y1 = min(img.height, y1 + padding)
-    return img.crop((x0, y0, x1, y1))
-
-
-def center_on_canvas(img, size):
-    """Center image on a square transparent canvas."""
-    canvas = Image.new("RGBA", (size, size), (0, 0, 0, 0))
-    scale = min(size / img.width, size / img.height) * 0.88
-    new_w = int(img.width * scale)
-    new_h = int(img.height * scale)
-    resized = img.resize((new_w, new_h), Image.LANCZOS)
-    x = (size - new_w) // 2
-    y = (size - new_h) // 2
-    canvas.paste(resized, (x, y), resized)
-    return canvas
-
-
 # The rotation angles we need and their descriptions
 # 0° = front, 90° = left side, 180° = back, 270° = right side
 VIEWS = [
@@ -179,7 +125,7 @@ VIEWS = [
 ]
 
 
-def generate_view(ref_img, angle, view_desc, idx):
+def generate_view(ref_img, angle, view_desc, idx, total=len(VIEWS)):
     """Generate a single view of the Toly head at a given angle."""
     is_back = 135 <= angle <= 225
 
@@ -207,9 +153,9 @@ def generate_view(ref_img, angle, view_desc, idx):
         f"\n- Clean, crisp cartoon style with bold outlines"
     )
 
-    print(f"  Generating view {idx+1}/8: {angle}° ({view_desc[:40]}...)")
+    print(f"  Generating view {idx+1}/{total}: {angle}° ({view_desc[:40]}...)")
 
-    for key in [API_KEY, BACKUP_KEY]:
+    for key in gemini_keys():
         try:
             result = call_gemini_with_image(prompt, ref_img, key)
             print(f"    Got image: {result.size}")
@@ -220,8 +166,16 @@ def generate_view(ref_img, angle, view_desc, idx):
     return None
 
 
-def interpolate_frames(frame_a, frame_b, steps):
-    """Create intermediate frames by cross-fading between two key frames."""
+def interpolate_frames(frame_a, frame_b, steps, mode="flow"):
+    """
+    Create intermediate frames between two key frames.
+
+    "flow" warps both key frames along a dense optical flow field so the
+    head turns instead of ghosting; "blend" is the plain cross-fade.
+    """
+    if mode == "flow":
+        return interpolate_pair(frame_a, frame_b, steps)
+
     frames = []
     for i in range(steps):
         t = (i + 1) / (steps + 1)
@@ -230,32 +184,64 @@ def interpolate_frames(frame_a, frame_b, steps):
     return frames
 
 
+def _tween_chunk(gaps, store, keys, steps, mode):
+    """Fill the cells after each key frame in `gaps` with its in-betweens."""
+    for gap in gaps:
+        start, end = keys[gap], keys[(gap + 1) % len(keys)]
+        tweens = interpolate_frames(store.image(start), store.image(end), steps, mode=mode)
+        for k, frame in enumerate(tweens):
+            if start + 1 + k < store.frames:
+                store.put(start + 1 + k, frame)
+
+
 def main():
-    os.makedirs(DEBUG_DIR, exist_ok=True)
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate the Toly head rotation sheet")
+    parser.add_argument("--candidates", type=int, default=1,
+                        help="Request N images per view concurrently and keep the best scoring one")
+    parser.add_argument("--matte", choices=["border", "threshold"], default="border",
+                        help="Background removal: flood from the border (keeps interior highlights) "
+                             "or every light pixel")
+    parser.add_argument("--key-views", type=int, choices=[4, 8], default=8,
+                        help="Number of views to generate; the rest are interpolated. With 4 the "
+                             "views are 90 degrees apart and flow cannot recover what the turn "
+                             "uncovers (ears, back of the head), so expect smearing there")
+    parser.add_argument("--interpolation", choices=["flow", "blend"], default="flow",
+                        help="In-between synthesis: optical-flow warp or cross-fade (use blend "
+                             "if the warped in-betweens tear)")
+    parser.add_argument("--workers", type=int,
+                        help="Processes for the in-betweens (default: CPU count)")
+    debug_writer.add_argument(parser)
+    args = parser.parse_args()
+    gemini_keys()  # resolve the key before any request thread starts
+    debug_writer.configure(args.debug)
+    matte = partial(remove_background, threshold=220, mode=args.matte)
+    views = VIEWS[::len(VIEWS) // args.key_views]
 
     # Download reference
     ref_img = download_reference()
     ref_path = os.path.join(DEBUG_DIR, "reference.jpg")
-    ref_img.save(ref_path)
-    print(f"  Saved reference to {ref_path}")
+    if debug_writer.save(ref_img, ref_path, level=debug_writer.ALL):
+        print(f"  Queued reference for {ref_path}")
 
-    # Generate 8 key views
+    # Generate key views (every 45° by default, every 90° with --key-views 4)
     key_frames = []
-    for idx, (angle, desc) in enumerate(VIEWS):
-        result = generate_view(ref_img, angle, desc, idx)
+    for idx, (angle, desc) in enumerate(views):
+        result, processed = best_candidate(
+            lambda: generate_view(ref_img, angle, desc, idx, len(views)), matte,
+            args.candidates, label=f"view_{angle}deg", log_dir=DEBUG_DIR,
+        )
         if result is None:
             print(f"  FAILED to generate {angle}° view, will interpolate")
             key_frames.append(None)
             continue
 
-        # Post-process
-        processed = remove_background(result)
-        processed = crop_to_content(processed)
-        processed = center_on_canvas(processed, CELL)
+        # Post-process (background already removed for scoring)
+        processed = fit_to_cell(processed, CELL)
 
         # Save debug frame
         debug_path = os.path.join(DEBUG_DIR, f"frame_{idx:02d}_{angle}deg.png")
-        processed.save(debug_path, "PNG")
+        debug_writer.save(processed, debug_path)
 
         key_frames.append(processed)
 
@@ -274,29 +260,23 @@ def main():
 
     # Interpolate between key frames to get 32 total frames
     # 8 key frames -> 3 interpolated frames between each pair + key frame = 32
-    all_frames = []
-    interp_per_gap = (TOTAL_FRAMES // len(key_frames)) - 1  # 3 between each
-
-    for i in range(len(key_frames)):
-        all_frames.append(key_frames[i])
-        next_i = (i + 1) % len(key_frames)
-        tweens = interpolate_frames(key_frames[i], key_frames[next_i], interp_per_gap)
-        all_frames.extend(tweens)
-
-    # Trim to exact frame count if needed
-    all_frames = all_frames[:TOTAL_FRAMES]
-    print(f"\nTotal frames: {len(all_frames)}")
-
-    # Assemble sprite sheet
-    sheet = Image.new("RGBA", (COLS * CELL, ROWS * CELL), (0, 0, 0, 0))
-    for i, frame in enumerate(all_frames):
-        col = i % COLS
-        row = i // COLS
-        sheet.paste(frame, (col * CELL, row * CELL), frame)
-
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-    sheet.save(OUTPUT_PATH, "PNG")
-    print(f"\nSprite sheet saved: {OUTPUT_PATH} ({sheet.size[0]}x{sheet.size[1]})")
+    # (4 key frames -> 7 between each pair)
+    # The frames are built in place in a shared sheet: key frames go into
+    # their cells and one worker process per gap writes the in-betweens
+    # after them, so the sheet is packed when the last gap finishes.
+    interp_per_gap = (TOTAL_FRAMES // len(key_frames)) - 1
+    keys = [i * (interp_per_gap + 1) for i in range(len(key_frames))]
+    with FrameStore(TOTAL_FRAMES, CELL, CELL, COLS) as store:
+        for cell, frame in zip(keys, key_frames):
+            store.put(cell, frame)
+        job = partial(_tween_chunk, keys=keys, steps=interp_per_gap, mode=args.interpolation)
+        map_chunks(job, len(keys), store, workers=args.workers)
+        print(f"\nTotal frames: {TOTAL_FRAMES}")
+
+        sheet = store.sheet()
+        save_sheet(sheet, OUTPUT_PATH, TOTAL_FRAMES, COLS, ROWS)
+        print(f"\nSprite sheet saved: {OUTPUT_PATH} ({sheet.size[0]}x{sheet.size[1]}, {COLS}x{ROWS})")
+        del sheet
     print("Done!")
 
 
@@ -0,0 +1,231 @@
+"""
+Specular glint animation for idle and lit sprite sheets.
+
+Instead of flickering the whole sprite with a per-frame brightness
+enhancer, a highlight moves across the sprite's alpha mask: a soft
+diagonal band sweeping from one side to the other, or a radial hotspot
+orbiting the centre. The highlights of all frames are evaluated in one
+broadcast over a coarse sampling grid, and each frame blends towards a
+single precomputed full-shine frame only where its highlight is non-zero,
+with more shine on bright pixels so metal catches the light and dark
+faces stay dark. Steady brightness and saturation changes (the lit look)
+are applied once to the base frame rather than once per frame.
+
+    python tools/glint.py coin.png --preset coin --frames 8 --output /tmp/idle.png
+    python tools/glint.py --benchmark [image.png] [--frames 8]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+try:
+    import numpy as np
+    from PIL import Image, ImageChops, ImageEnhance
+except ImportError:
+    print("ERROR: Pillow and NumPy required. Run: pip install Pillow numpy")
+    sys.exit(1)
+
+DEFAULT_IMAGE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "packages", "pinball_components", "assets", "images", "solana_coin", "idle.png",
+)
+
+# style, angle (band direction or orbit start, degrees), width (fraction of
+# the sprite), strength, and the steady gain/saturation of the base frame.
+PRESETS = {
+    "coin": dict(style="band", angle=35, width=0.16, strength=0.55),
+    "coin_lit": dict(style="band", angle=35, width=0.2, strength=0.7, gain=1.3, saturation=1.3),
+    "phone": dict(style="band", angle=60, width=0.1, strength=0.6),
+    "orbit": dict(style="radial", angle=135, width=0.3, strength=0.5),
+}
+
+PROFILE_STEP = 4
+
+
+def highlight(u, v, frame, frames, style="band", angle=35, width=0.16, bins=1024):
+    """
+    uint8 highlight profile at normalized sprite coordinates (u, v) for
+    frame numbers `frame`, all broadcast against each other.
+
+    u and v span -0.5..0.5 over the sprite's bbox; outside it the band
+    is clamped, which only lands on transparent pixels. A band sweeps
+    perpendicular to `angle` from fully off one side to just before fully
+    off the other, so the loop restarts seamlessly; it only depends on the
+    projection onto the sweep direction, so each frame's profile is
+    tabulated over `bins` projection steps and gathered. A radial hotspot
+    makes one orbit starting at `angle`.
+    """
+    theta = np.radians(angle)
+    if style == "band":
+        # Projections onto the sweep direction span at most -0.71..0.71.
+        proj = u * np.float32(np.cos(theta)) + v * np.float32(np.sin(theta))
+        steps = np.linspace(-0.71, 0.71, bins, dtype=np.float32)
+        reach = 0.71 + 2 * width
+        t = np.arange(frames, dtype=np.float32)[:, None] / frames
+        d = (steps[None] - (-reach + 2 * reach * t)) / np.float32(width)
+        table = np.rint(255 * np.exp(-2 * d * d)).astype(np.uint8).ravel()
+        index = np.clip(np.rint((proj + 0.71) * ((bins - 1) / 1.42)), 0, bins - 1).astype(np.int32)
+        return np.take(table, index + frame.astype(np.int32) * bins)
+    if style == "radial":
+        phi = theta + 2 * np.pi * np.asarray(frame, dtype=np.float64) / frames
+        cx, cy = (0.3 * np.cos(phi)).astype(np.float32), (0.3 * np.sin(phi)).astype(np.float32)
+        d2 = ((u - cx) ** 2 + (v - cy) ** 2) / np.float32(width * width)
+        return (255 * np.exp(-2 * d2) + 0.5).astype(np.uint8)
+    raise ValueError(f"unknown glint style {style!r}")
+
+
+def glint_layers(img, cols=4, rows=1, frames=None, style="band", angle=35, width=0.16,
+                 strength=0.55, tint=(255, 255, 255)):
+    """
+    (profiles, step, shone) for a cols x rows glint sheet of the RGBA `img`.
+
+    `profiles` is an L image of every frame's highlight, evaluated in one
+    broadcast straight into sheet layout. Highlights are tens of pixels
+    wide, so they are sampled only every `step` pixels (PROFILE_STEP where
+    the frame size allows) and upsampled by frame_mask. `shone` is the
+    frame at full shine: `img` moved towards `tint` by its specular
+    weight, the sprite's coverage biased towards bright areas so metal
+    catches the light and dark faces stay dark.
+    """
+    frames = frames or cols * rows
+    w, h = img.size
+    step = next(f for f in (PROFILE_STEP, 2, 1) if h % f == 0 and w % f == 0)
+    hs, ws = h // step, w // step
+
+    bbox = img.getchannel("A").getbbox() or (0, 0, w, h)
+    x0, y0, x1, y1 = bbox
+    span = np.float32(max(x1 - x0, y1 - y0))
+    u = ((np.arange(ws, dtype=np.float32) + 0.5) * step - (x0 + x1) / 2) / span
+    v = ((np.arange(hs, dtype=np.float32) + 0.5) * step - (y0 + y1) / 2) / span
+    # Frame numbers run along (row, col); pixels along (y, x).
+    frame = np.minimum(np.arange(rows * cols), frames - 1).reshape(rows, 1, cols, 1)
+    profiles = highlight(u[None, None, None, :], v[None, :, None, None], frame, frames, style, angle, width)
+    profiles = Image.fromarray(profiles.reshape(rows * hs, cols * ws), "L")
+
+    # Specular weight from the (ITU-R 601) luma through a LUT, times alpha.
+    bias = [round((0.3 + 0.7 * l / 255) * strength * 255) for l in range(256)]
+    weight = ImageChops.multiply(img.convert("L").point(bias), img.getchannel("A"))
+    shone = Image.composite(Image.new("RGBA", img.size, tuple(tint) + (0,)), img, weight)
+    shone.putalpha(img.getchannel("A"))
+    return profiles, step, shone
+
+
+def frame_mask(profiles, step, col, row, size):
+    """
+    (mask, (x, y)) of one frame's highlight at full size, cropped to where
+    it is non-zero, or None if the highlight is off the sprite.
+    """
+    w, h = size
+    ws, hs = w // step, h // step
+    cell = profiles.crop((col * ws, row * hs, (col + 1) * ws, (row + 1) * hs))
+    box = cell.getbbox()
+    if not box:
+        return None
+    # Bilinear reaches half a sample beyond the last non-zero one.
+    x0, y0 = max(0, box[0] * step - step // 2), max(0, box[1] * step - step // 2)
+    x1, y1 = min(w, box[2] * step + step // 2), min(h, box[3] * step + step // 2)
+    mask = cell.resize((x1 - x0, y1 - y0), Image.BILINEAR,
+                       box=(x0 / step, y0 / step, x1 / step, y1 / step))
+    return mask, (x0, y0)
+
+
+def glint_sheet(img, cols=4, rows=1, frames=None, preset="coin", **overrides):
+    """
+    Glint frames of `img` laid out as a cols x rows sheet.
+
+    Each frame is the base blended towards the full-shine frame by its
+    highlight, and only inside the highlight's bounding box.
+    Cells past `frames` are left transparent.
+    """
+    frames = frames or cols * rows
+    options = dict(PRESETS[preset], **overrides)
+    gain, saturation = options.pop("gain", 1.0), options.pop("saturation", 1.0)
+    base = img if img.mode == "RGBA" else img.convert("RGBA")
+    if gain != 1.0:
+        base = ImageEnhance.Brightness(base).enhance(gain)
+    if saturation != 1.0:
+        base = ImageEnhance.Color(base).enhance(saturation)
+
+    profiles, step, shone = glint_layers(base, cols, rows, frames, **options)
+    w, h = base.size
+    sheet = Image.new("RGBA", (cols * w, rows * h), (0, 0, 0, 0))
+    for i in range(frames):
+        col, row = i % cols, i // cols
+        sheet.paste(base, (col * w, row * h))
+        found = frame_mask(profiles, step, col, row, base.size)
+        if found:
+            mask, (x, y) = found
+            # Both layers share the alpha, so the blend leaves it unchanged.
+            shine = shone.crop((x, y, x + mask.width, y + mask.height))
+            sheet.paste(shine, (col * w + x, row * h + y), mask)
+    return sheet
+
+
+def _enhancer_sheet(base_img, brightnesses, color=None):
+    """The per-frame ImageEnhance path the generators used, kept as the benchmark baseline."""
+    w, h = base_img.size
+    sheet = Image.new("RGBA", (len(brightnesses) * w, h), (0, 0, 0, 0))
+    for i, b in enumerate(brightnesses):
+        frame = ImageEnhance.Brightness(base_img.copy()).enhance(b)
+        if color:
+            frame = ImageEnhance.Color(frame).enhance(color)
+        sheet.paste(frame, (i * w, 0), frame)
+    return sheet
+
+
+def benchmark(path, frames, repeat=20):
+    """Print the best of `repeat` sheet build times for both paths."""
+    base = Image.open(path).convert("RGBA")
+    print(f"Benchmark: {os.path.basename(path)} {base.size[0]}x{base.size[1]}, {frames} frames")
+    cycle = [1.25, 1.35, 1.45, 1.35]
+    runs = [
+        ("ImageEnhance (idle)", lambda: _enhancer_sheet(base, [1.0, 1.06, 1.12, 1.06] * (frames // 4 or 1))),
+        ("ImageEnhance (lit)", lambda: _enhancer_sheet(base, cycle * (frames // 4 or 1), 1.3)),
+        ("glint (coin)", lambda: glint_sheet(base, frames, preset="coin")),
+        ("glint (coin_lit)", lambda: glint_sheet(base, frames, preset="coin_lit")),
+        ("glint (orbit)", lambda: glint_sheet(base, frames, preset="orbit")),
+    ]
+    for label, fn in runs:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        print(f"  {label:22s} {best * 1000:8.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Specular glint sprite sheets")
+    parser.add_argument("image", nargs="?", default=DEFAULT_IMAGE,
+                        help="Base frame (default: solana_coin/idle.png)")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="coin")
+    parser.add_argument("--frames", type=int, default=4)
+    parser.add_argument("--cols", type=int, help="Sheet columns (default: one row)")
+    parser.add_argument("--style", choices=["band", "radial"])
+    parser.add_argument("--angle", type=float)
+    parser.add_argument("--width", type=float)
+    parser.add_argument("--strength", type=float)
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Compare time against the per-frame ImageEnhance path")
+    parser.add_argument("--output", help="Write the glint sheet here")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.image, args.frames)
+        return
+
+    if not args.output:
+        parser.error("--output is required unless --benchmark is given")
+    overrides = {k: getattr(args, k) for k in ("style", "angle", "width", "strength")
+                 if getattr(args, k) is not None}
+    cols = args.cols or args.frames
+    base = Image.open(args.image).convert("RGBA")
+    sheet = glint_sheet(base, cols, -(-args.frames // cols), args.frames, args.preset, **overrides)
+    sheet.save(args.output, "PNG")
+    print(f"Sheet saved: {args.output} ({sheet.size[0]}x{sheet.size[1]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Glow and drop-shadow layers.
+
+A glow or shadow is a single colour whose alpha is the blurred coverage of
+a shape. Only the shape's bounding box plus the blur margin is rendered,
+and large radii are blurred on a downsampled pyramid level and upsampled
+back, which for a soft glow is indistinguishable from a full-resolution
+Gaussian at a fraction of the cost.
+
+    layer, pos = soft_layer((x0, y0, x1, y1), 25, (153, 69, 255, 80),
+                            lambda draw, dx, dy: draw.ellipse([x0 - dx, y0 - dy, x1 - dx, y1 - dy], fill=255))
+    paste_layer(img, layer, pos)
+"""
+
+import math
+import sys
+
+try:
+    import numpy as np
+    from PIL import Image, ImageDraw, ImageFilter
+except ImportError:
+    print("ERROR: Pillow and NumPy required. Run: pip install Pillow numpy")
+    sys.exit(1)
+
+from tiles import blur_halo
+
+# Pyramid levels are added while the blur radius left at the reduced
+# level stays at least this large; below it the upsampling would show.
+MIN_LEVEL_RADIUS = 4.0
+
+
+def pyramid_levels(radius, min_radius=MIN_LEVEL_RADIUS):
+    levels = 0
+    while radius / 2 ** (levels + 1) >= min_radius:
+        levels += 1
+    return levels
+
+
+def blur_pyramid(mask, radius, min_radius=MIN_LEVEL_RADIUS):
+    """
+    GaussianBlur(radius) of an L image, run 2**k times smaller for large radii.
+
+    The 2**k box reduction and the bilinear upsample together add a
+    variance of about 4**k / 4 full-size pixels, which is taken off the
+    blur at the reduced level so the overall spread matches `radius`.
+    Sizes should be multiples of 2**k to keep the levels aligned.
+    """
+    levels = pyramid_levels(radius, min_radius)
+    if not levels:
+        return mask.filter(ImageFilter.GaussianBlur(radius=radius))
+    factor = 2 ** levels
+    small = mask.reduce(factor)
+    reduced = math.sqrt(max((radius / factor) ** 2 - 0.25, 0.25))
+    small = small.filter(ImageFilter.GaussianBlur(radius=reduced))
+    return small.resize(mask.size, Image.BILINEAR)
+
+
+def soft_layer(bbox, radius, color, paint, canvas=None, min_radius=MIN_LEVEL_RADIUS, exact=False):
+    """
+    Blurred single-colour layer for a shape inside `bbox`.
+
+    `paint(draw, dx, dy)` draws the shape's coverage (fill=255) onto an L
+    image whose (0, 0) is canvas point (dx, dy). Returns the RGBA layer,
+    covering `bbox` plus the blur margin, and its canvas position. Colour
+    channels are scaled by coverage like a blurred layer drawn on
+    transparent black, so it composites the same way. With a `canvas`
+    size the shape is clipped to it and its edges extend outwards, as a
+    blur of the whole canvas would have done.
+
+    With `exact` the shape is drawn in `color` and the RGBA layer blurred
+    at full resolution, which matches a GaussianBlur of the whole canvas
+    bit for bit; the pyramid path stays within about 2/255 of it.
+    """
+    factor = 1 if exact else 2 ** pyramid_levels(radius, min_radius)
+    margin = blur_halo(radius)
+    x0, y0 = int(math.floor(bbox[0])) - margin, int(math.floor(bbox[1])) - margin
+    x1, y1 = int(math.ceil(bbox[2])) + margin, int(math.ceil(bbox[3])) + margin
+    if canvas is not None:
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(canvas[0], x1), min(canvas[1], y1)
+    w, h = x1 - x0, y1 - y0
+
+    mask = Image.new("L", (w, h), 0)
+    paint(ImageDraw.Draw(mask), x0, y0)
+    if exact:
+        layer = np.zeros((h, w, 4), dtype=np.uint8)
+        layer[np.asarray(mask) > 0] = color
+        return Image.fromarray(layer, "RGBA").filter(ImageFilter.GaussianBlur(radius=radius)), (x0, y0)
+    if w % factor or h % factor:
+        padded = np.pad(np.asarray(mask), ((0, -h % factor), (0, -w % factor)), mode="edge")
+        mask = Image.fromarray(padded, "L")
+    coverage = np.asarray(blur_pyramid(mask, radius, min_radius), dtype=np.uint16)[:h, :w]
+
+    layer = np.empty((h, w, 4), dtype=np.uint8)
+    for c in range(4):
+        layer[:, :, c] = (coverage * color[c] + 127) // 255
+    return Image.fromarray(layer, "RGBA"), (x0, y0)
+
+
+def paste_layer(img, layer, pos):
+    """Alpha-composite `layer` onto the RGBA `img` in place, its (0, 0) at `pos`."""
+    x, y = pos
+    left, top = max(0, -x), max(0, -y)
+    right = min(layer.width, img.width - x)
+    bottom = min(layer.height, img.height - y)
+    if left >= right or top >= bottom:
+        return img
+    img.alpha_composite(layer, dest=(x + left, y + top), source=(left, top, right, bottom))
+    return img
@@ -0,0 +1,263 @@
+"""
+List the golden tests a set of changed assets can make stale.
+
+Each changed file is resolved through the generated `Assets` classes to
+its accessor chain. Dart sources under lib/ that reference the chain (or
+reach a theme asset through a CharacterTheme getter) are the components
+that load it; classes defined there, and up to --depth more levels of
+lib classes that construct them, are the affected components. A test is
+selected when it has a `matchesGoldenFile` and references an affected
+asset or constructs an affected component. The result is the minimal `flutter test` invocation
+per package, with the golden PNGs each test owns:
+
+    python tools/golden_impact.py packages/pinball_components/assets/images/solana_coin/flip.png
+    python tools/golden_impact.py packages/pinball_components/assets/images/google_word/
+    python tools/golden_impact.py --since HEAD~1      # assets changed since a revision
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+from dart_assets import REPO_ROOT, PACKAGES, app_package, load_accessors, package_dir, theme_getters, uses_chain
+
+_IMPORT_ALIAS_RE = re.compile(r"import 'package:(\w+)/[\w/]+\.dart' as (\w+);")
+_IMPORT_RE = re.compile(r"import 'package:(\w+)/[\w/]+\.dart'(?: (?:show|hide) [\w, ]+)?;")
+_ASSET_REF_RE = re.compile(r"(?:\b(\w+)\.)?\bAssets\.([\w.]+)")
+_DEFINITION_RE = re.compile(r"^(?:abstract |sealed |base |final )*(?:class|mixin|enum|extension) (?!on\b)(\w+)", re.M)
+_CONSTRUCTOR_RE = re.compile(r"\b([A-Z]\w*)(?:\.\w+)?\(")
+_GOLDEN_RE = re.compile(r"matchesGoldenFile\(\s*(.+?)\s*,?\s*\)", re.S)
+_STRING_CONST_RE = re.compile(r"(\w+) =\s*'([^'$]*)';")
+
+
+def package_of_file(path, root=REPO_ROOT):
+    """(package, package-relative path) of a repo file; package None is the app."""
+    rel = os.path.relpath(os.path.abspath(path), root).replace(os.sep, "/")
+    parts = rel.split("/")
+    if parts[0] == "packages" and len(parts) > 2:
+        return parts[1], "/".join(parts[2:])
+    return None, rel
+
+
+def dart_files(kind, root=REPO_ROOT):
+    """(package, path) of the Dart files under lib/ or test/ of every package."""
+    packages = [None]
+    packages_dir = os.path.join(root, "packages")
+    if os.path.isdir(packages_dir):
+        packages += sorted(os.listdir(packages_dir))
+    for package in packages:
+        base = os.path.join(package_dir(package, root), kind)
+        for dirpath, _, names in os.walk(base):
+            for name in sorted(names):
+                if name.endswith(".dart") and not name.endswith(".gen.dart"):
+                    yield package, os.path.join(dirpath, name)
+
+
+class DartSource:
+    """Asset references, definitions and constructed classes of one Dart file."""
+
+    def __init__(self, package, path, accessors, themes, app_name):
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        self.package = package
+        self.path = path
+        self.text = text
+        code = re.sub(r"//.*", "", text)
+        # Joined across line breaks inside accessor chains only, so `return
+        # Assets...` keeps its word boundary.
+        collapsed = re.sub(r"\s*\.\s*", ".", code)
+
+        def local(name):
+            return None if name == app_name else name
+
+        aliases = {alias: local(pkg) for pkg, alias in _IMPORT_ALIAS_RE.findall(code)}
+        imported = [local(pkg) for pkg in _IMPORT_RE.findall(code)]
+        candidates = [package] + [p for p in imported if p != package and p in accessors]
+
+        self.refs = set()
+        for alias, used in _ASSET_REF_RE.findall(collapsed):
+            if alias in aliases:
+                owners = [aliases[alias]]
+            else:
+                owners = candidates
+            for owner in owners:
+                chains = accessors.get(owner, {})
+                if any(uses_chain(used, chain) for chain in chains):
+                    self.refs.add((owner, used))
+                    break
+        # Theme assets are reached as `characterTheme.ball`,
+        # `state.character.leaderboardIcon`, `const DashTheme().animation`...
+        for getters in themes.values():
+            for getter, chain in getters.items():
+                if re.search(rf"\w*(?:[Tt]heme|[Cc]haracter)\w*(?:\(\))?\.{getter}\b", collapsed):
+                    self.refs.add(("pinball_theme", chain))
+
+        self.defines = set(_DEFINITION_RE.findall(code))
+        # Only constructed classes count as rendered; type mentions such as
+        # `whereType<Ball>()` or a contact callback's parameter do not.
+        self.constructs = set(_CONSTRUCTOR_RE.findall(code))
+
+    def uses_assets(self, changed):
+        return any(
+            owner == package and uses_chain(used, chain)
+            for owner, used in self.refs
+            for package, chain in changed
+        )
+
+    def goldens(self):
+        """Golden PNG paths this test compares against, relative to the repo."""
+        constants = dict(_STRING_CONST_RE.findall(self.text))
+        base = os.path.dirname(self.path)
+        out = []
+        for expr in _GOLDEN_RE.findall(self.text):
+            value = re.sub(r"\$\{(\w+)\}|\$(\w+)", lambda m: constants.get(m.group(1) or m.group(2), "*"), expr)
+            value = value.strip().strip("'\"")
+            out.append(os.path.relpath(os.path.normpath(os.path.join(base, value)), REPO_ROOT).replace(os.sep, "/"))
+        return sorted(set(out))
+
+
+def changed_assets(paths, accessors, root=REPO_ROOT):
+    """(package, chain) of every accessor under the given files or directories."""
+    by_path = {
+        package: {path: chain for chain, path in chains.items()}
+        for package, chains in accessors.items()
+    }
+    changed, unknown = set(), []
+    for path in paths:
+        package, rel = package_of_file(os.path.join(root, path) if not os.path.isabs(path) else path, root)
+        rel = rel.rstrip("/")
+        hits = {
+            (package, chain) for asset, chain in by_path.get(package, {}).items()
+            if asset == rel or asset.startswith(rel + "/")
+        }
+        if hits:
+            changed |= hits
+        else:
+            unknown.append(path)
+    return changed, unknown
+
+
+def git_changed(revision, root=REPO_ROOT):
+    result = subprocess.run(
+        ["git", "diff", "--name-only", revision, "--"],
+        cwd=root, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=False,
+    )
+    if result.returncode != 0:
+        print(f"ERROR: git diff failed: {result.stderr.strip()}")
+        sys.exit(1)
+    return [line for line in result.stdout.splitlines() if "/assets/" in f"/{line}"]
+
+
+def impact(changed, depth=1, root=REPO_ROOT):
+    """(components {class: file}, tests [(package, file, goldens, reason)])."""
+    accessors = load_accessors(root)
+    themes = theme_getters(root)
+    app_name = app_package(root)
+
+    sources = [DartSource(p, f, accessors, themes, app_name) for p, f in dart_files("lib", root)]
+    affected = {}
+    frontier = [s for s in sources if s.uses_assets(changed)]
+    for level in range(depth + 1):
+        names = set()
+        for source in frontier:
+            for name in source.defines:
+                if name not in affected:
+                    affected[name] = source.path
+                    names.add(name)
+        if level == depth or not names:
+            break
+        frontier = [s for s in sources if s.constructs & names and not s.defines <= set(affected)]
+
+    tests = []
+    for package, path in dart_files("test", root):
+        if not path.endswith("_test.dart"):
+            continue
+        with open(path, encoding="utf-8") as f:
+            if "matchesGoldenFile" not in f.read():
+                continue
+        source = DartSource(package, path, accessors, themes, app_name)
+        if source.uses_assets(changed):
+            reason = "loads a changed asset"
+        else:
+            used = sorted(source.constructs & set(affected))
+            if not used:
+                continue
+            reason = "renders " + ", ".join(used[:4]) + (", ..." if len(used) > 4 else "")
+        tests.append((package, path, source.goldens(), reason))
+    return affected, tests
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Golden tests affected by changed assets")
+    parser.add_argument("paths", nargs="*", help="Changed asset files or directories (repo paths or asset keys)")
+    parser.add_argument("--since", help="Use the assets changed since this git revision")
+    parser.add_argument("--depth", type=int, default=1,
+                        help="Levels of lib classes using an affected component to follow")
+    parser.add_argument("--update", action="store_true", help="Print commands with --update-goldens")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args()
+
+    paths = list(args.paths)
+    if args.since:
+        paths += git_changed(args.since)
+    if not paths:
+        if args.since:
+            print(f"No assets changed since {args.since}")
+            return
+        parser.error("give changed asset paths or --since")
+
+    accessors = load_accessors()
+    changed, unknown = changed_assets(paths, accessors)
+    affected, tests = impact(changed, args.depth)
+
+    by_package = {}
+    for package, path, _, _ in tests:
+        base = package_dir(package)
+        by_package.setdefault(package, []).append(os.path.relpath(path, base).replace(os.sep, "/"))
+    flag = " --update-goldens" if args.update else ""
+    commands = []
+    for package in PACKAGES + tuple(p for p in by_package if p not in PACKAGES):
+        if package in by_package:
+            files = " ".join(by_package.pop(package))
+            prefix = f"cd packages/{package} && " if package else ""
+            commands.append(f"({prefix}flutter test{flag} {files})" if package else f"flutter test{flag} {files}")
+
+    if args.json:
+        print(json.dumps({
+            "changed": sorted(f"{p or 'app'}:Assets.{c}" for p, c in changed),
+            "unresolved": unknown,
+            "components": {name: os.path.relpath(path, REPO_ROOT) for name, path in sorted(affected.items())},
+            "tests": [
+                {"file": os.path.relpath(path, REPO_ROOT), "goldens": goldens, "reason": reason}
+                for _, path, goldens, reason in tests
+            ],
+            "commands": commands,
+        }, indent=2))
+        return
+
+    print(f"Changed assets: {len(changed)} accessors")
+    for package, chain in sorted(changed, key=lambda c: (c[0] or "", c[1])):
+        print(f"  {package or 'app'}: Assets.{chain}")
+    for path in unknown:
+        print(f"  WARNING: no accessor for {path}")
+
+    print(f"\nAffected components: {len(affected)}")
+    for name, path in sorted(affected.items()):
+        print(f"  {name:32s} {os.path.relpath(path, REPO_ROOT)}")
+
+    print(f"\nGolden tests to run: {len(tests)}")
+    for _, path, goldens, reason in tests:
+        print(f"  {os.path.relpath(path, REPO_ROOT)}  ({reason})")
+        for golden in goldens:
+            print(f"      {golden}")
+    if commands:
+        print("\nRun:")
+        for command in commands:
+            print(f"  {command}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Diagnose asset 404s in a hosting log export.
+
+Streams the CSV row by row (plain or .gz, any size, constant memory),
+groups failing requests by normalized path pattern, flags prefix bugs
+(doubled `packages/<pkg>/` runs, the app package addressed as a package,
+package assets requested outside `assets/`) and maps every failing URL
+back to the real file in the repo together with the URL Flutter web
+actually serves it from.
+
+    python tools/log_404s.py pinball-log-export-2026-02-14T21-54-29.csv
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+from collections import Counter
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Distinct URLs remembered per pattern; counts are always exact.
+MAX_EXAMPLES = 20
+
+
+def app_package_name(root=REPO_ROOT):
+    """The `name:` of the app's pubspec.yaml (the root package)."""
+    with open(os.path.join(root, "pubspec.yaml")) as f:
+        for line in f:
+            if line.startswith("name:"):
+                return line.split(":", 1)[1].strip()
+    return None
+
+
+def open_log(path):
+    """Open a CSV export as text, transparently decompressing .gz."""
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+
+def iter_requests(path, statuses):
+    """Yield (path, timestamp) for rows whose status is in `statuses`."""
+    csv.field_size_limit(sys.maxsize)
+    with open_log(path) as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        col_path = header.index("requestPath")
+        col_status = header.index("responseStatusCode")
+        col_time = header.index("TimeUTC") if "TimeUTC" in header else None
+        for row in reader:
+            if len(row) <= max(col_path, col_status):
+                continue
+            if row[col_status] not in statuses:
+                continue
+            yield row[col_path], row[col_time] if col_time is not None else ""
+
+
+def split_path(request_path):
+    """Path segments without host, query string or fragment."""
+    path = request_path.split("?", 1)[0].split("#", 1)[0]
+    segments = [s for s in path.split("/") if s]
+    # Exports prefix the host (www.example.app/...); real paths never start
+    # with a dotted segment followed by more path.
+    if len(segments) > 1 and "." in segments[0] and segments[0] not in ("assets", "packages"):
+        segments = segments[1:]
+    return segments
+
+
+def path_pattern(segments):
+    """Collapse the file name to `*.ext` so siblings group together."""
+    if not segments:
+        return "/"
+    name = segments[-1]
+    ext = os.path.splitext(name)[1]
+    return "/".join(segments[:-1] + ["*" + ext if ext else name])
+
+
+def _collapse_runs(segments):
+    """Remove immediately repeated runs of two or more segments."""
+    segments = list(segments)
+    found = []
+    changed = True
+    while changed:
+        changed = False
+        for k in range(len(segments) // 2, 1, -1):
+            for i in range(len(segments) - 2 * k + 1):
+                if segments[i:i + k] == segments[i + k:i + 2 * k]:
+                    found.append("/".join(segments[i:i + k]))
+                    del segments[i + k:i + 2 * k]
+                    changed = True
+                    break
+            if changed:
+                break
+    return segments, found
+
+
+def diagnose(segments, app_name):
+    """
+    Classify a failing asset path. Returns (issues, package, relative path),
+    where package is None for the app itself and relative path is the
+    asset key inside that package.
+    """
+    issues = []
+    segs = list(segments)
+    if segs[:1] == ["assets"]:
+        segs = segs[1:]
+    elif segs[:1] == ["packages"]:
+        issues.append("missing assets/ base")
+
+    segs, runs = _collapse_runs(segs)
+    for run in runs:
+        issues.append(f"doubled prefix {run}/")
+
+    package = None
+    if len(segs) > 2 and segs[0] == "packages":
+        package = segs[1]
+        segs = segs[2:]
+        if package == app_name:
+            issues.append(f"app package addressed as packages/{app_name}/")
+            package = None
+    return issues, package, "/".join(segs)
+
+
+class AssetIndex:
+    """Lazily built suffix lookup over packages/*/assets and assets/."""
+
+    def __init__(self, root=REPO_ROOT):
+        self.root = root
+        self._by_name = None
+
+    def _build(self):
+        self._by_name = {}
+        dirs = [os.path.join(self.root, "assets")]
+        packages = os.path.join(self.root, "packages")
+        if os.path.isdir(packages):
+            dirs += [os.path.join(packages, p, "assets") for p in sorted(os.listdir(packages))]
+        for base in dirs:
+            for dirpath, _, files in os.walk(base):
+                for name in files:
+                    rel = os.path.relpath(os.path.join(dirpath, name), self.root)
+                    self._by_name.setdefault(name, []).append(rel.replace(os.sep, "/"))
+
+    def resolve(self, package, rel):
+        """Repo-relative file for an asset key, or None."""
+        base = self.root if package is None else os.path.join(self.root, "packages", package)
+        candidate = os.path.join(base, *rel.split("/"))
+        if os.path.isfile(candidate):
+            return os.path.relpath(candidate, self.root).replace(os.sep, "/")
+        # Fall back to the longest path-suffix match anywhere in the tree.
+        if self._by_name is None:
+            self._build()
+        parts = rel.split("/")
+        best, best_len = None, 0
+        for path in self._by_name.get(parts[-1], []):
+            candidate_parts = path.split("/")
+            n = 0
+            while n < min(len(parts), len(candidate_parts)) and parts[-1 - n] == candidate_parts[-1 - n]:
+                n += 1
+            if n > best_len:
+                best, best_len = path, n
+        return best
+
+
+def served_url(package, rel):
+    """Path Flutter web serves an asset key from."""
+    if package is None:
+        return f"assets/{rel}"
+    return f"assets/packages/{package}/{rel}"
+
+
+def analyze(path, statuses=("404",), app_name=None, index=None):
+    """Stream the export and aggregate failures per pattern."""
+    app_name = app_name or app_package_name()
+    index = index or AssetIndex()
+    groups = {}
+    total = 0
+    for request_path, timestamp in iter_requests(path, set(statuses)):
+        total += 1
+        segments = split_path(request_path)
+        pattern = path_pattern(segments)
+        group = groups.get(pattern)
+        if group is None:
+            group = groups[pattern] = {
+                "pattern": pattern,
+                "count": 0,
+                "first": timestamp,
+                "last": timestamp,
+                "issues": Counter(),
+                "urls": Counter(),
+                "resolved": {},
+            }
+        group["count"] += 1
+        if timestamp:
+            group["first"] = min(group["first"] or timestamp, timestamp)
+            group["last"] = max(group["last"], timestamp)
+
+        url = "/".join(segments)
+        if url in group["urls"] or len(group["urls"]) < MAX_EXAMPLES:
+            group["urls"][url] += 1
+        if url in group["resolved"] or len(group["resolved"]) >= MAX_EXAMPLES:
+            continue
+        issues, package, rel = diagnose(segments, app_name)
+        group["issues"].update(issues)
+        fixed = index.resolve(package, rel) if rel else None
+        group["resolved"][url] = {
+            "issues": issues,
+            "file": fixed,
+            "url": served_url(package, rel) if fixed else None,
+        }
+    return total, sorted(groups.values(), key=lambda g: g["count"], reverse=True)
+
+
+def print_report(total, groups):
+    print(f"{total} failing requests, {len(groups)} patterns")
+    for group in groups:
+        print()
+        print(f"  {group['count']:6d}  {group['pattern']}")
+        if group["first"]:
+            print(f"          seen {group['first']} .. {group['last']}")
+        for issue in sorted(group["issues"]):
+            print(f"          ! {issue}")
+        for url, hits in group["urls"].most_common():
+            info = group["resolved"].get(url)
+            if info and info["file"]:
+                print(f"    {hits:4d}  {url}")
+                print(f"          -> {info['file']}  (served at {info['url']})")
+            elif info and info["issues"]:
+                print(f"    {hits:4d}  {url}  (no matching file)")
+            else:
+                print(f"    {hits:4d}  {url}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diagnose asset 404s in a hosting log export")
+    parser.add_argument("log", help="CSV export (.csv or .csv.gz, - for stdin)")
+    parser.add_argument("--status", action="append",
+                        help="Status codes to analyze (repeatable, default 404)")
+    parser.add_argument("--json", help="Also write the grouped report as JSON here")
+    args = parser.parse_args()
+
+    total, groups = analyze(args.log, tuple(args.status or ["404"]))
+    print_report(total, groups)
+
+    if args.json:
+        for group in groups:
+            group["issues"] = dict(group["issues"])
+            group["urls"] = dict(group["urls"])
+        with open(args.json, "w") as f:
+            json.dump({"total": total, "groups": groups}, f, indent=2)
+            f.write("\n")
+        print(f"\nReport: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""
+Columnar local store and analytics for hosting log exports.
+
+`ingest` streams one or more CSV exports into a directory of NumPy column
+chunks with dictionary-encoded strings. Every ingested export is recorded
+by fingerprint, so re-running ingest over a folder only parses new files.
+Queries load just the columns they need:
+
+    python tools/log_store.py ingest pinball-log-export-*.csv
+    gunzip -c export.csv.gz | python tools/log_store.py ingest -
+    python tools/log_store.py latency --by class,region
+    python tools/log_store.py cache --top 20
+    python tools/log_store.py devices
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: NumPy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from log_404s import open_log, split_path
+
+# Ignored by git (see .gitignore); pass --store to keep it elsewhere.
+DEFAULT_STORE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "log_store")
+
+# Rows per chunk file; bounds ingest memory regardless of export size.
+CHUNK_ROWS = 250_000
+
+# Dictionary-encoded string columns, stored as uint32 codes.
+DICT_COLUMNS = ("path", "class", "region", "cache", "type", "device")
+
+ASSET_CLASSES = {
+    "image": (".png", ".jpg", ".jpeg", ".webp", ".gif", ".svg", ".ico"),
+    "audio": (".mp3", ".ogg", ".opus", ".wav", ".m4a"),
+    "script": (".js", ".mjs", ".map"),
+    "wasm": (".wasm",),
+    "font": (".ttf", ".otf", ".woff", ".woff2"),
+    "style": (".css",),
+    "data": (".json", ".bin", ".txt"),
+    "html": (".html", ""),
+}
+
+# vercelCache states that were served without going to the origin.
+CACHE_HITS = ("HIT", "STALE", "PRERENDER")
+
+MOBILE_MARKERS = ("iPhone", "iPad", "Android", "Mobile")
+BOT_MARKERS = ("bot", "Bot", "crawler", "spider", "compatible;")
+
+
+def asset_class(path):
+    ext = os.path.splitext(path)[1].lower()
+    for name, exts in ASSET_CLASSES.items():
+        if ext in exts:
+            return name
+    return "other"
+
+
+def device_class(user_agent):
+    if any(m in user_agent for m in BOT_MARKERS):
+        return "bot"
+    if any(m in user_agent for m in MOBILE_MARKERS):
+        return "mobile"
+    return "desktop" if user_agent else "unknown"
+
+
+def fingerprint(path):
+    """Size plus a hash of the first MiB: identifies an export without a full read."""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        h.update(f.read(1 << 20))
+    return f"{os.path.getsize(path)}:{h.hexdigest()}"
+
+
+class LogStore:
+    """A directory of column chunks plus a JSON manifest and dictionaries."""
+
+    def __init__(self, root=DEFAULT_STORE):
+        self.root = root
+        self.manifest_path = os.path.join(root, "manifest.json")
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {
+                "sources": {},
+                "chunks": [],
+                "dictionaries": {c: [] for c in DICT_COLUMNS},
+            }
+        self._lookup = {
+            c: {v: i for i, v in enumerate(values)}
+            for c, values in self.manifest["dictionaries"].items()
+        }
+
+    def _save_manifest(self):
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.manifest, f, indent=1)
+            f.write("\n")
+        os.replace(tmp, self.manifest_path)
+
+    def _code(self, column, value):
+        lookup = self._lookup[column]
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(lookup)
+            self.manifest["dictionaries"][column].append(value)
+        return code
+
+    def _write_chunk(self, buf):
+        name = f"chunk_{len(self.manifest['chunks']):05d}.npz"
+        np.savez(
+            os.path.join(self.root, name),
+            time=np.asarray(buf["time"], dtype=np.int64),
+            duration=np.asarray(buf["duration"], dtype=np.float32),
+            status=np.asarray(buf["status"], dtype=np.int16),
+            **{c: np.asarray(buf[c], dtype=np.uint32) for c in DICT_COLUMNS},
+        )
+        self.manifest["chunks"].append({"file": name, "rows": len(buf["time"])})
+
+    def ingest(self, path):
+        """Append an export ("-" for stdin). Returns the row count, or None if already stored."""
+        if path == "-":
+            # Spool stdin to a file so it is fingerprinted like any export.
+            os.makedirs(self.root, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=self.root, suffix=".csv", delete=False) as tmp:
+                shutil.copyfileobj(sys.stdin.buffer, tmp)
+            try:
+                return self._ingest(tmp.name, "<stdin>")
+            finally:
+                os.unlink(tmp.name)
+        return self._ingest(path, os.path.basename(path))
+
+    def _ingest(self, path, name):
+        key = fingerprint(path)
+        if key in self.manifest["sources"]:
+            return None
+        os.makedirs(self.root, exist_ok=True)
+
+        csv.field_size_limit(sys.maxsize)
+        rows = 0
+        first_chunk = len(self.manifest["chunks"])
+        with open_log(path) as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            col = {name: i for i, name in enumerate(header)}
+
+            def field(row, name):
+                i = col.get(name)
+                return row[i] if i is not None and i < len(row) else ""
+
+            buf = {c: [] for c in ("time", "duration", "status") + DICT_COLUMNS}
+            for row in reader:
+                segments = split_path(field(row, "requestPath"))
+                url = "/".join(segments)
+                duration = field(row, "durationMs")
+                stamp = field(row, "timestampInMs")
+                status = field(row, "responseStatusCode")
+                buf["time"].append(int(stamp) if stamp.isdigit() else 0)
+                buf["duration"].append(float(duration) if duration else np.nan)
+                buf["status"].append(int(status) if status.isdigit() else 0)
+                buf["path"].append(self._code("path", url))
+                buf["class"].append(self._code("class", asset_class(url)))
+                buf["region"].append(self._code("region", field(row, "region")))
+                buf["cache"].append(self._code("cache", field(row, "vercelCache").upper()))
+                buf["type"].append(self._code("type", field(row, "type")))
+                buf["device"].append(self._code("device", device_class(field(row, "requestUserAgent"))))
+                rows += 1
+                if len(buf["time"]) >= CHUNK_ROWS:
+                    self._write_chunk(buf)
+                    buf = {c: [] for c in buf}
+            if buf["time"]:
+                self._write_chunk(buf)
+
+        self.manifest["sources"][key] = {
+            "file": name,
+            "rows": rows,
+            "chunks": [first_chunk, len(self.manifest["chunks"])],
+        }
+        self._save_manifest()
+        return rows
+
+    def columns(self, *names):
+        """Concatenate the named columns over every chunk."""
+        parts = {n: [] for n in names}
+        for chunk in self.manifest["chunks"]:
+            with np.load(os.path.join(self.root, chunk["file"])) as data:
+                for n in names:
+                    parts[n].append(data[n])
+        return {
+            n: np.concatenate(p) if p else np.zeros(0)
+            for n, p in parts.items()
+        }
+
+    def values(self, column):
+        return self.manifest["dictionaries"][column]
+
+
+def served(status):
+    """Mask of 2xx/304 responses; 404s and errors return early and skew latency down."""
+    return ((status >= 200) & (status < 300)) | (status == 304)
+
+
+def _served_only(cols, all_statuses):
+    """`cols` cut to served rows (reported), or None if none are left."""
+    if all_statuses:
+        return cols
+    keep = served(cols["status"])
+    print(f"{int(keep.sum())} of {keep.size} requests served (2xx/304); "
+          f"--all-statuses includes the rest")
+    if not keep.any():
+        return None
+    return {c: v[keep] for c, v in cols.items()}
+
+
+def _percentiles(durations):
+    durations = durations[~np.isnan(durations)]
+    if durations.size == 0:
+        return None
+    return np.percentile(durations, [50, 95, 99])
+
+
+def latency_report(store, by=("class",), all_statuses=False):
+    cols = store.columns("duration", "status", *by)
+    if cols["duration"].size == 0:
+        print("Store is empty")
+        return
+    cols = _served_only(cols, all_statuses)
+    if cols is None:
+        return
+    keys = np.stack([cols[c] for c in by], axis=1)
+    groups, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    header = "  ".join(f"{c:12s}" for c in by)
+    print(f"{header}  {'requests':>8s}  {'p50':>8s}  {'p95':>8s}  {'p99':>8s}")
+    rows = []
+    for g, codes in enumerate(groups):
+        durations = cols["duration"][inverse == g]
+        pct = _percentiles(durations)
+        labels = [store.values(c)[code] or "-" for c, code in zip(by, codes)]
+        rows.append((durations.size, labels, pct))
+    for count, labels, pct in sorted(rows, key=lambda r: r[0], reverse=True):
+        label = "  ".join(f"{l:12s}" for l in labels)
+        if pct is None:
+            print(f"{label}  {count:8d}  {'-':>8s}  {'-':>8s}  {'-':>8s}")
+        else:
+            print(f"{label}  {count:8d}  {pct[0]:6.1f}ms  {pct[1]:6.1f}ms  {pct[2]:6.1f}ms")
+
+
+def cache_report(store, top=20):
+    cols = store.columns("path", "cache")
+    if cols["path"].size == 0:
+        print("Store is empty")
+        return
+    states = store.values("cache")
+    hit_codes = [i for i, s in enumerate(states) if s in CACHE_HITS]
+    known_codes = [i for i, s in enumerate(states) if s]
+    paths = store.values("path")
+    n = len(paths)
+    requests = np.bincount(cols["path"], minlength=n)
+    hits = np.bincount(cols["path"], weights=np.isin(cols["cache"], hit_codes), minlength=n)
+    known = np.bincount(cols["path"], weights=np.isin(cols["cache"], known_codes), minlength=n)
+
+    total_known = known.sum()
+    overall = f"{hits.sum() / total_known:.1%}" if total_known else "n/a"
+    print(f"{int(requests.sum())} requests, {int(total_known)} with a cache state, "
+          f"hit ratio {overall}")
+    # Misses cost the most where a path is requested often and rarely hit.
+    misses = known - hits
+    order = np.lexsort((-requests, -misses))[:top]
+    print(f"  {'requests':>8s}  {'hit ratio':>9s}  {'misses':>6s}  path")
+    for i in order:
+        if requests[i] == 0:
+            continue
+        ratio = f"{hits[i] / known[i]:9.1%}" if known[i] else f"{'-':>9s}"
+        print(f"  {int(requests[i]):8d}  {ratio}  {int(misses[i]):6d}  {paths[i]}")
+
+
+def device_report(store, all_statuses=False):
+    cols = store.columns("duration", "status", "device", "class")
+    if cols["duration"].size == 0:
+        print("Store is empty")
+        return
+    cols = _served_only(cols, all_statuses)
+    if cols is None:
+        return
+    devices = store.values("device")
+    classes = store.values("class")
+    print(f"{'device':10s}  {'class':8s}  {'requests':>8s}  {'total':>10s}  {'p50':>8s}  {'p95':>8s}")
+    for d, device in enumerate(devices):
+        on_device = cols["device"] == d
+        for c in [None] + list(range(len(classes))):
+            mask = on_device if c is None else on_device & (cols["class"] == c)
+            if not mask.any():
+                continue
+            durations = cols["duration"][mask]
+            pct = _percentiles(durations)
+            total = float(np.nansum(durations))
+            label = "all" if c is None else classes[c]
+            p50 = f"{pct[0]:6.1f}ms" if pct is not None else f"{'-':>8s}"
+            p95 = f"{pct[1]:6.1f}ms" if pct is not None else f"{'-':>8s}"
+            print(f"{device:10s}  {label:8s}  {int(mask.sum()):8d}  {total:8.0f}ms  {p50}  {p95}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hosting log analytics")
+    parser.add_argument("--store", default=DEFAULT_STORE, help="Store directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("ingest", help="Add exports (already ingested files are skipped)")
+    p.add_argument("logs", nargs="+")
+
+    p = sub.add_parser("latency", help="p50/p95/p99 durationMs per group")
+    p.add_argument("--by", default="class,region",
+                   help=f"Comma-separated grouping columns from {', '.join(DICT_COLUMNS)}")
+    p.add_argument("--all-statuses", action="store_true",
+                   help="Include 404s and errors, not just 2xx/304 responses")
+
+    p = sub.add_parser("cache", help="Cache hit ratio per path, worst first")
+    p.add_argument("--top", type=int, default=20)
+
+    p = sub.add_parser("devices", help="Mobile vs desktop load cost")
+    p.add_argument("--all-statuses", action="store_true",
+                   help="Include 404s and errors, not just 2xx/304 responses")
+    args = parser.parse_args()
+
+    store = LogStore(args.store)
+    if args.command == "ingest":
+        for path in args.logs:
+            rows = store.ingest(path)
+            name = "<stdin>" if path == "-" else os.path.basename(path)
+            if rows is None:
+                print(f"  {name}: already ingested, skipped")
+            else:
+                print(f"  {name}: {rows} rows")
+        total = sum(c["rows"] for c in store.manifest["chunks"])
+        print(f"Store: {args.store} ({total} rows, {len(store.manifest['chunks'])} chunks)")
+    elif args.command == "latency":
+        by = tuple(c.strip() for c in args.by.split(",") if c.strip())
+        unknown = [c for c in by if c not in DICT_COLUMNS]
+        if unknown:
+            parser.error(f"unknown column(s): {', '.join(unknown)}")
+        latency_report(store, by, args.all_statuses)
+    elif args.command == "cache":
+        cache_report(store, args.top)
+    else:
+        device_report(store, args.all_statuses)
+
+
+if __name__ == "__main__":
+    main()
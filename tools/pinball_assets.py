@@ -0,0 +1,94 @@
+"""
+Single entry point for the asset tools.
+
+Every tool stays a standalone script; this only dispatches to its `main()`.
+Tool modules are imported when their command runs, so `--help` and the
+pure-analysis commands start without loading PIL, NumPy or the HTTP stack,
+and the Gemini key is only looked up by the commands that call Gemini.
+
+    python tools/pinball_assets.py --help
+    python tools/pinball_assets.py log-404s export.csv
+    python tools/pinball_assets.py diff HEAD~1 . --top 10
+"""
+
+import importlib
+import os
+import sys
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+GROUPS = ["generate", "post-process", "pack", "analyze", "audit"]
+
+# command: (module, group, help)
+COMMANDS = {
+    "3d-sprites": ("generate_3d_sprites", "generate", "3D sprite sheets for board components (Gemini)"),
+    "seeker-phone": ("generate_seeker_phone", "generate", "Seeker phone pushed by a robotic arm (Gemini)"),
+    "solana-lit": ("generate_solana_lit", "generate", "Lit Solana logo sprites (Gemini)"),
+    "solana-token": ("generate_solana_token", "generate", "3D Solana token sprite (Gemini)"),
+    "toly-3d": ("generate_toly_3d", "generate", "3D Toly bust (Gemini)"),
+    "toly-head": ("generate_toly_head", "generate", "Toly head rotation sheet (Gemini)"),
+    "seeker-letters": ("generate_seeker_letters", "generate", "SEEKER letter sprites"),
+    "logo": ("gen_seeker_pinball_logo", "generate", "SEEKER PINBALL loading logo"),
+    "marquee": ("replace_marquee", "generate", "Solana-themed backbox marquee"),
+    "frame-interp": ("frame_interp", "post-process", "Motion-aware in-between frames"),
+    "frame-count": ("frame_count", "post-process", "Smallest frame count for a sheet"),
+    "rotation": ("rotation", "post-process", "Batched rotation sheets"),
+    "tiles": ("tiles", "post-process", "Band-wise threshold/gradient/mask/composite/blur"),
+    "recolor": ("recolor", "post-process", "Palette variants from tools/themes.json"),
+    "glint": ("glint", "post-process", "Specular glint idle/lit sheets"),
+    "flip": ("flip", "post-process", "Perspective coin/card flip sheets"),
+    "audio-trim": ("audio_trim", "post-process", "Trim silence and normalize loudness"),
+    "audio-sprite": ("audio_sprite", "pack", "Pack SFX into audio sprites"),
+    "fingerprint": ("fingerprint_assets", "pack", "Content-fingerprint a web build"),
+    "preload-plan": ("preload_plan", "pack", "Tiered preload plan"),
+    "diff": ("asset_diff", "analyze", "Perceptual diff of images or asset trees"),
+    "golden-impact": ("golden_impact", "analyze", "Golden tests made stale by changed assets"),
+    "log-404s": ("log_404s", "analyze", "Diagnose asset 404s in a hosting log"),
+    "log-store": ("log_store", "analyze", "Columnar store for hosting logs"),
+    "analyze-marquee": ("analyze_marquee", "analyze", "Sample the marquee's decorative area"),
+    "analyze-taper": ("analyze_taper", "analyze", "Per-row marquee artwork boundaries"),
+    "analyze-taper2": ("analyze_taper2", "analyze", "analyze-taper every 10 rows"),
+    "inner-edge": ("find_inner_edge", "analyze", "Inner edge of the marquee artwork"),
+    "check-marquee": ("check_marquee", "analyze", "Marquee size and mode"),
+    "audit": ("asset_audit", "audit", "Dead and duplicate assets"),
+    "budget": ("asset_budget", "audit", "Image inventory and decode-memory budgets"),
+    "sheet-layout": ("sheet_layout", "audit", "Sheet grid choice and Dart sequenced() check"),
+}
+
+
+def usage():
+    lines = ["usage: pinball_assets <command> [args...]", ""]
+    for group in GROUPS:
+        lines.append(f"{group}:")
+        for name, (_, command_group, text) in COMMANDS.items():
+            if command_group == group:
+                lines.append(f"  {name:<17} {text}")
+        lines.append("")
+    lines.append("Run `pinball_assets <command> --help` for the options of a command.")
+    return "\n".join(lines)
+
+
+def run(command, args):
+    """Import the command's module and run its main() with `args` as argv."""
+    module_name = COMMANDS[command][0]
+    if TOOLS_DIR not in sys.path:
+        sys.path.insert(0, TOOLS_DIR)
+    sys.argv = [f"pinball_assets {command}"] + list(args)
+    return importlib.import_module(module_name).main()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help", "help"):
+        print(usage())
+        return 0
+    command = argv[0]
+    if command not in COMMANDS:
+        print(f"ERROR: unknown command {command!r}\n", file=sys.stderr)
+        print(usage(), file=sys.stderr)
+        return 2
+    return run(command, argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+"""
+Tiered preload plan for the game's images.
+
+Parses PinballGameAssetsX.imageAssets in lib/game/game_assets.dart,
+resolves every entry through the generated `Assets` classes to its file,
+reads byte size and decoded dimensions, and estimates a load cost per
+asset from a slow mobile link plus the server latency recorded in the
+hosting-log store (see log_store.py). Each image is put in a tier by the
+Dart sources that draw it:
+
+  critical  read from the image cache by a component while the board
+            mounts; AssetsManagerCubit holds the game until these load
+  attract   first drawn once a character is chosen (the ball, the arcade
+            backgrounds); loaded while the board sits in attract mode
+  lazy      first drawn during play or after game over (score popups,
+            the turbo flame, the game over displays); prefetched last
+
+Components in attract and lazy sources load their images on mount, so
+those tiers may still be loading when they are needed. Within a tier
+images are ordered largest-first, which finishes a parallel load lane set
+soonest. The plan is written as Dart:
+
+    python tools/preload_plan.py            # writes lib/gen/preload_plan.gen.dart
+    python tools/preload_plan.py --dry-run  # report only
+"""
+
+import argparse
+import os
+import re
+import sys
+
+try:
+    from PIL import Image
+except ImportError:
+    print("ERROR: Pillow not installed. Run: pip install Pillow")
+    sys.exit(1)
+
+from dart_assets import REPO_ROOT, app_package, asset_file, asset_key, load_accessors, theme_getters, uses_chain
+from golden_impact import DartSource, dart_files
+
+GAME_ASSETS = os.path.join(REPO_ROOT, "lib", "game", "game_assets.dart")
+OUTPUT = os.path.join(REPO_ROOT, "lib", "gen", "preload_plan.gen.dart")
+
+# Concurrent loads in AssetsManagerCubit (_throttleSize).
+LOAD_LANES = 3
+
+_COMPONENTS = "packages/pinball_components/lib/src/components/"
+
+# Sources whose components are not mounted with the board, and when they
+# first draw. Every other source that names an image reads it from the
+# cache while the board mounts, which makes the image critical.
+SOURCE_TIERS = {
+    # Spawned, or switched to the chosen character, after Play.
+    _COMPONENTS + "ball/ball.dart": "attract",
+    _COMPONENTS + "arcade_background/arcade_background.dart": "attract",
+    "lib/game/behaviors/ball_spawning_behavior.dart": "attract",
+    "lib/game/behaviors/bonus_ball_spawning_behavior.dart": "attract",
+    # Added during play.
+    _COMPONENTS + "score_component/score_component.dart": "lazy",
+    _COMPONENTS + "ball/behaviors/ball_turbo_charging_behavior.dart": "lazy",
+    _COMPONENTS + "solana_token/solana_token.dart": "lazy",
+    # Backbox displays after game over.
+    "lib/game/components/backbox/displays/initials_input_display.dart": "lazy",
+    "lib/game/components/backbox/displays/game_over_info_display.dart": "lazy",
+    "lib/game/components/backbox/displays/share_display.dart": "lazy",
+}
+# Sources that name images without drawing them.
+IGNORED_SOURCES = {
+    "lib/game/game_assets.dart",
+    "lib/leaderboard/models/leader_board_entry.dart",
+}
+# Drawn on the first frame by a deferred source: the arcade background
+# shows the default character's until one is chosen.
+CRITICAL_OVERRIDES = {"images.dash.background"}
+
+TIERS = ("critical", "attract", "lazy")
+
+
+def preload_entries(path=GAME_ASSETS):
+    """(package, accessor chain, expression) for each key in imageAssets."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    aliases = dict(
+        (alias, package)
+        for package, alias in re.findall(r"import 'package:(\w+)/\w+\.dart' as (\w+);", text)
+    )
+    theme_vars = dict(re.findall(r"const (\w+) = (\w+)\(\);", text))
+    themes = theme_getters()
+
+    body = re.sub(r"\s+", "", text)
+    entries = []
+    for expr in re.findall(r"([\w.]+)\.keyName", body):
+        head, _, rest = expr.partition(".")
+        if head in aliases and rest.startswith("Assets."):
+            entries.append((aliases[head], rest[len("Assets."):], expr))
+        elif head in theme_vars:
+            chain = themes.get(theme_vars[head], {}).get(rest)
+            entries.append(("pinball_theme", chain, expr))
+        elif head == "Assets":
+            entries.append((None, rest, expr))
+        else:
+            entries.append((None, None, expr))
+    return entries
+
+
+def drawing_sources(root=REPO_ROOT):
+    """DartSource of every lib/ file that may draw an image."""
+    accessors, themes, app = load_accessors(root), theme_getters(root), app_package(root)
+    sources = []
+    for package, path in dart_files("lib", root):
+        rel = os.path.relpath(path, root).replace(os.sep, "/")
+        # pinball_theme only defines the theme getters.
+        if rel in IGNORED_SOURCES or package == "pinball_theme":
+            continue
+        source = DartSource(package, path, accessors, themes, app)
+        source.rel = rel
+        sources.append(source)
+    return sources
+
+
+def tier_for(package, chain, sources):
+    """(tier, sources drawing the image); lazy if nothing draws it."""
+    users = sorted(
+        s.rel for s in sources
+        if any(owner == package and uses_chain(used, chain) for owner, used in s.refs)
+    )
+    if chain in CRITICAL_OVERRIDES:
+        return "critical", users
+    tiers = {SOURCE_TIERS.get(rel, "critical") for rel in users}
+    return next((t for t in TIERS if t in tiers), "lazy"), users
+
+
+def server_latency(store_dir):
+    """
+    {url path: p50 ms} plus a mobile image p95 fallback from the log store,
+    over served (2xx/304) requests only.
+    """
+    if not store_dir or not os.path.exists(os.path.join(store_dir, "manifest.json")):
+        return {}, None
+    import numpy as np
+    from log_store import LogStore, served
+
+    store = LogStore(store_dir)
+    cols = store.columns("path", "duration", "status", "class", "device")
+    keep = served(cols["status"])
+    cols = {c: v[keep] for c, v in cols.items()}
+    paths = store.values("path")
+    per_path = {}
+    for code in np.unique(cols["path"]):
+        durations = cols["duration"][cols["path"] == code]
+        durations = durations[~np.isnan(durations)]
+        if durations.size:
+            per_path[paths[code]] = float(np.median(durations))
+
+    classes, devices = store.values("class"), store.values("device")
+    mask = np.ones(cols["duration"].shape, dtype=bool)
+    if "image" in classes:
+        mask &= cols["class"] == classes.index("image")
+    if "mobile" in devices:
+        mask &= cols["device"] == devices.index("mobile")
+    durations = cols["duration"][mask]
+    durations = durations[~np.isnan(durations)]
+    fallback = float(np.percentile(durations, 95)) if durations.size else None
+    return per_path, fallback
+
+
+def estimate_ms(size, url, per_path, fallback, rtt_ms, kbps):
+    server = per_path.get(url, fallback or 0.0)
+    return rtt_ms + server + size * 8 / kbps
+
+
+def makespan(costs, lanes=LOAD_LANES):
+    """Time until `lanes` parallel loaders finish `costs` in list order."""
+    finish = [0.0] * lanes
+    for cost in costs:
+        i = finish.index(min(finish))
+        finish[i] += cost
+    return max(finish) if costs else 0.0
+
+
+def build_plan(store_dir=None, rtt_ms=150.0, kbps=1600.0):
+    accessors = load_accessors()
+    per_path, fallback = server_latency(store_dir)
+    sources = drawing_sources()
+    items, problems = [], []
+    for package, chain, expr in preload_entries():
+        path = accessors.get(package, {}).get(chain) if chain else None
+        if path is None:
+            problems.append(f"could not resolve {expr}")
+            continue
+        file_path = asset_file(package, path)
+        if not os.path.exists(file_path):
+            problems.append(f"{expr} -> missing {file_path}")
+            continue
+        size = os.path.getsize(file_path)
+        with Image.open(file_path) as img:
+            width, height = img.size
+        key = asset_key(package, path)
+        tier, users = tier_for(package, chain, sources)
+        if not users:
+            problems.append(f"{expr} is not drawn by any lib/ source")
+        items.append({
+            "key": key,
+            "chain": chain,
+            "expr": expr,
+            "bytes": size,
+            "width": width,
+            "height": height,
+            "tier": tier,
+            "sources": users,
+            "ms": estimate_ms(size, f"assets/{key}", per_path, fallback, rtt_ms, kbps),
+        })
+    return items, problems
+
+
+def write_dart(items, path=OUTPUT):
+    lines = [
+        "/// GENERATED CODE - DO NOT MODIFY BY HAND",
+        "/// *****************************************************",
+        "///  tools/preload_plan.py",
+        "/// *****************************************************",
+        "",
+        "// coverage:ignore-file",
+        "// ignore_for_file: type=lint",
+        "",
+        "/// Keys of `PinballGameAssetsX.imageAssets` grouped by when they are",
+        "/// first drawn. Each tier is ordered largest-first.",
+        "abstract class PreloadPlan {",
+    ]
+    docs = {
+        "critical": "Read from the cache while the board mounts.",
+        "attract": "First drawn once a character is chosen.",
+        "lazy": "First drawn during play or after game over.",
+    }
+    for tier in TIERS:
+        tier_items = [i for i in items if i["tier"] == tier]
+        total = sum(i["bytes"] for i in tier_items)
+        if tier != TIERS[0]:
+            lines.append("")
+        lines.append(f"  /// {docs[tier]} {len(tier_items)} images, {total / 1024:.0f} KB.")
+        lines.append(f"  static const {tier} = <String>[")
+        for i in tier_items:
+            lines.append(f"    // {i['width']}x{i['height']}, {i['bytes'] / 1024:.0f} KB")
+            lines.append(f"    '{i['key']}',")
+        lines.append("  ];")
+    lines.append("}")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a tiered preload plan")
+    parser.add_argument("--store", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "log_store"),
+                        help="Hosting-log store from log_store.py (optional)")
+    parser.add_argument("--rtt-ms", type=float, default=150.0, help="Round trip of the modelled link")
+    parser.add_argument("--kbps", type=float, default=1600.0,
+                        help="Bandwidth of the modelled link (default: slow 4G)")
+    parser.add_argument("--output", default=OUTPUT)
+    parser.add_argument("--dry-run", action="store_true", help="Report without writing Dart")
+    args = parser.parse_args()
+
+    items, problems = build_plan(args.store, args.rtt_ms, args.kbps)
+    for problem in problems:
+        print(f"  WARNING: {problem}")
+
+    flat_ms = makespan([i["ms"] for i in items])
+    ordered = [
+        i for tier in TIERS
+        for i in sorted((i for i in items if i["tier"] == tier), key=lambda i: i["bytes"], reverse=True)
+    ]
+
+    print(f"{len(ordered)} images, {sum(i['bytes'] for i in ordered) / 1024:.0f} KB "
+          f"({args.kbps:.0f} kbps, {args.rtt_ms:.0f}ms RTT, {LOAD_LANES} lanes)")
+    elapsed = 0.0
+    for tier in TIERS:
+        tier_items = [i for i in ordered if i["tier"] == tier]
+        elapsed += makespan([i["ms"] for i in tier_items])
+        print(f"  {tier:8s} {len(tier_items):3d} images "
+              f"{sum(i['bytes'] for i in tier_items) / 1024:7.0f} KB  ready at ~{elapsed / 1000:5.1f}s")
+    critical_ms = makespan([i["ms"] for i in ordered if i["tier"] == "critical"])
+    # A model of the link, not a measurement: AssetsManagerCubit logs the
+    # real times ("Board assets loaded in ...") in the browser console.
+    print(f"  Modelled time to board: ~{flat_ms / 1000:.1f}s (every image) "
+          f"-> ~{critical_ms / 1000:.1f}s (critical tier)")
+
+    if args.dry_run:
+        for i in ordered:
+            print(f"    {i['tier']:8s} {i['bytes'] / 1024:6.0f} KB {i['width']:5d}x{i['height']:<5d} {i['chain']}"
+                  f"  ({', '.join(os.path.basename(u) for u in i['sources']) or 'not drawn'})")
+        return
+    write_dart(ordered, args.output)
+    print(f"Plan saved: {os.path.relpath(args.output, REPO_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Recolor existing sprites into palette variants from a theme spec.
+
+Each variant names a source image and a chain of colour operations:
+1D curves, 1D/3D .cube LUTs, saturation/value scaling, a global hue
+shift, and hue-band and palette remaps that move hue ranges to new hues
+while keeping each pixel's relative saturation and value, so shading
+survives. Alpha passes through untouched and fully transparent pixels
+are left alone.
+
+The chain only runs on the distinct opaque colours of a sheet (a few
+thousand even for large sheets); the result is scattered back with one
+gather. The colour decomposition is shared by every variant of the same
+source, so extra variants cost milliseconds and need no Gemini call.
+
+    python tools/recolor.py                      # all variants in tools/themes.json
+    python tools/recolor.py --only solana_coin_gold_lit --output-dir /tmp/variants
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    print("ERROR: Pillow and NumPy required. Run: pip install Pillow numpy")
+    sys.exit(1)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPEC_PATH = os.path.join(REPO_ROOT, "tools", "themes.json")
+
+
+def load_cube(path):
+    """
+    (dims, table, domain_min, domain_max) of a .cube LUT. The table is
+    (n, 3) for 1D and (n, n, n, 3) indexed [b][g][r] for 3D, since red
+    varies fastest in the file.
+    """
+    size, dims, lo, hi, rows = None, None, [0.0] * 3, [1.0] * 3, []
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            if not parts or parts[0].startswith("#") or parts[0] == "TITLE":
+                continue
+            if parts[0] == "LUT_1D_SIZE":
+                size, dims = int(parts[1]), 1
+            elif parts[0] == "LUT_3D_SIZE":
+                size, dims = int(parts[1]), 3
+            elif parts[0] == "DOMAIN_MIN":
+                lo = [float(v) for v in parts[1:4]]
+            elif parts[0] == "DOMAIN_MAX":
+                hi = [float(v) for v in parts[1:4]]
+            else:
+                rows.append([float(v) for v in parts[:3]])
+    if dims is None:
+        raise ValueError(f"{path}: no LUT_1D_SIZE or LUT_3D_SIZE")
+    table = np.array(rows, dtype=np.float64)
+    expected = size if dims == 1 else size ** 3
+    if len(table) != expected:
+        raise ValueError(f"{path}: {len(table)} entries, expected {expected}")
+    lo, hi = np.array(lo), np.array(hi)
+    if dims == 3:
+        table = table.reshape(size, size, size, 3)
+    return dims, table, lo, hi
+
+
+def apply_cube(rgb, cube):
+    """Look `rgb` (n, 3) floats in 0..1 up in a loaded .cube, linearly interpolated."""
+    dims, table, lo, hi = cube
+    size = len(table)
+    pos = np.clip((rgb - lo) / (hi - lo), 0, 1) * (size - 1)
+    i0 = np.minimum(pos.astype(int), size - 2)
+    t = pos - i0
+    if dims == 1:
+        out = np.empty_like(rgb)
+        for c in range(3):
+            out[:, c] = table[i0[:, c], c] * (1 - t[:, c]) + table[i0[:, c] + 1, c] * t[:, c]
+        return out
+    (r0, g0, b0), (tr, tg, tb) = i0.T, t.T[:, :, None]
+    out = 0
+    for db, wb in ((0, 1 - tb), (1, tb)):
+        for dg, wg in ((0, 1 - tg), (1, tg)):
+            for dr, wr in ((0, 1 - tr), (1, tr)):
+                out = out + table[b0 + db, g0 + dg, r0 + dr] * (wb * wg * wr)
+    return out
+
+
+def rgb_to_hsv(rgb):
+    """(n, 3) RGB in 0..1 to hue in degrees, saturation and value in 0..1."""
+    r, g, b = rgb.T
+    v = rgb.max(axis=1)
+    c = v - rgb.min(axis=1)
+    s = np.where(v > 0, c / np.where(v > 0, v, 1), 0)
+    safe = np.where(c > 0, c, 1)
+    h = np.where(v == r, (g - b) / safe % 6,
+                 np.where(v == g, (b - r) / safe + 2, (r - g) / safe + 4))
+    return np.where(c > 0, h * 60, 0), s, v
+
+
+def hsv_to_rgb(h, s, v):
+    k = lambda n: (n + h / 60) % 6
+    f = lambda n: v - v * s * np.clip(np.minimum(k(n), 4 - k(n)), 0, 1)
+    return np.stack([f(5), f(3), f(1)], axis=1)
+
+
+def _hex(color):
+    color = color.lstrip("#")
+    return np.array([int(color[i:i + 2], 16) for i in (0, 2, 4)]) / 255.0
+
+
+def remap_bands(rgb, bands, min_saturation=0.1):
+    """
+    Move hue bands: [(from_hue, to_hue, half_width, saturation_scale, value_scale, spread)].
+
+    Each band pulls a pixel by a cosine falloff of its hue distance and
+    moves it to to_hue plus `spread` times its offset from from_hue, so
+    shading carries over and hue variation inside the band is kept (1),
+    narrowed, or flattened onto one hue (0). A pixel near several bands
+    lands on the circular weighted mean of their destinations, with its own
+    hue taking whatever weight is left; unsaturated pixels (greys, whites,
+    blacks) have no hue and stay put.
+    """
+    h, s, v = rgb_to_hsv(rgb)
+    chroma = np.clip(s / min_saturation, 0, 1)
+    weights = []
+    for src, _, half, _, _, _ in bands:
+        dist = np.abs((h - src + 180) % 360 - 180)
+        weights.append(np.where(dist < half, 0.5 + 0.5 * np.cos(np.pi * dist / half), 0) * chroma)
+    keep = np.maximum(0, 1 - sum(weights))
+    total = keep + sum(weights)
+
+    x, y = keep * np.cos(np.radians(h)), keep * np.sin(np.radians(h))
+    sat, val = keep.copy(), keep.copy()
+    for weight, (src, dst, _, sat_scale, val_scale, spread) in zip(weights, bands):
+        moved = np.radians(dst + spread * ((h - src + 180) % 360 - 180))
+        x += weight * np.cos(moved)
+        y += weight * np.sin(moved)
+        sat += weight * sat_scale
+        val += weight * val_scale
+    h = np.degrees(np.arctan2(y, x)) % 360
+    s = np.clip(s * sat / total, 0, 1)
+    v = np.clip(v * val / total, 0, 1)
+    return hsv_to_rgb(h, s, v)
+
+
+def _step(op, base_dir):
+    kind = op["op"]
+    if kind == "curves":
+        curves = [(ch, *zip(*sorted(op[ch]))) for ch in ("rgb", "r", "g", "b") if ch in op]
+
+        def step(rgb):
+            out = rgb * 255
+            for ch, xs, ys in curves:
+                for c in (range(3) if ch == "rgb" else ["rgb".index(ch)]):
+                    out[:, c] = np.interp(out[:, c], xs, ys)
+            return out / 255
+        return step
+    if kind == "cube":
+        cube = load_cube(os.path.join(base_dir, op["path"]))
+        return lambda rgb: apply_cube(rgb, cube)
+    if kind in ("saturation", "value", "hue_shift"):
+        amount = float(op["amount"])
+
+        def step(rgb):
+            h, s, v = rgb_to_hsv(rgb)
+            if kind == "saturation":
+                s = np.clip(s * amount, 0, 1)
+            elif kind == "value":
+                v = np.clip(v * amount, 0, 1)
+            else:
+                h = (h + amount) % 360
+            return hsv_to_rgb(h, s, v)
+        return step
+    if kind == "hue_remap":
+        band = (float(op["from"]), float(op["to"]), float(op.get("width", 60)) / 2,
+                float(op.get("saturation", 1.0)), float(op.get("value", 1.0)),
+                float(op.get("spread", 1.0)))
+        return lambda rgb: remap_bands(rgb, [band], float(op.get("min_saturation", 0.1)))
+    if kind == "palette":
+        # Colour pairs: each source colour's hue band takes on the target's
+        # hue, and its saturation and value scale by target / source.
+        bands = []
+        for src, dst in op["map"]:
+            (sh, ss, sv), (dh, ds, dv) = (rgb_to_hsv(_hex(c)[None, :]) for c in (src, dst))
+            bands.append((sh[0], dh[0], float(op.get("width", 60)) / 2,
+                          ds[0] / max(ss[0], 1e-6), dv[0] / max(sv[0], 1e-6),
+                          float(op.get("spread", 1.0))))
+        return lambda rgb: remap_bands(rgb, bands, float(op.get("min_saturation", 0.1)))
+    raise ValueError(f"unknown colour operation {kind!r}")
+
+
+def compile_ops(ops, base_dir=REPO_ROOT):
+    """A function mapping (n, 3) RGB floats in 0..1 through the spec's operations."""
+    steps = [_step(op, base_dir) for op in ops]
+
+    def run(rgb):
+        for step in steps:
+            rgb = step(rgb)
+        return rgb
+    return run
+
+
+def color_index(arr):
+    """(colors, inverse, opaque): distinct RGB of the visible pixels and where each came from."""
+    opaque = arr[:, :, 3] > 0
+    visible = arr[opaque]
+    packed = (visible[:, 0].astype(np.uint32) << 16) | (visible[:, 1].astype(np.uint32) << 8) | visible[:, 2]
+    packed, inverse = np.unique(packed, return_inverse=True)
+    colors = np.stack([(packed >> 16) & 255, (packed >> 8) & 255, packed & 255], axis=1)
+    return colors.astype(np.uint8), inverse, opaque
+
+
+def recolor(arr, fn, index=None):
+    """Copy of the RGBA array `arr` with every visible colour mapped through `fn`."""
+    colors, inverse, opaque = index or color_index(arr)
+    mapped = np.clip(np.rint(fn(colors / 255.0) * 255), 0, 255).astype(np.uint8)
+    out = arr.copy()
+    out[opaque, :3] = mapped[inverse]
+    return out
+
+
+def render(spec, names=None, output_dir=None, base_dir=REPO_ROOT):
+    """Write the spec's variants (or those in `names`); returns [(name, path, seconds)]."""
+    variants = spec["variants"]
+    names = names or list(variants)
+    missing = [n for n in names if n not in variants]
+    if missing:
+        raise KeyError(f"unknown variants: {', '.join(missing)}")
+    output_dir = output_dir or os.path.join(base_dir, spec.get("output_dir", "build/recolor"))
+    os.makedirs(output_dir, exist_ok=True)
+
+    sources = {}
+    results = []
+    for name in names:
+        variant = variants[name]
+        start = time.perf_counter()
+        source = variant["source"]
+        if source not in sources:
+            with Image.open(os.path.join(base_dir, source)) as img:
+                arr = np.array(img.convert("RGBA"))
+            sources[source] = (arr, color_index(arr))
+        arr, index = sources[source]
+        out = recolor(arr, compile_ops(variant["ops"], base_dir), index)
+        path = os.path.join(output_dir, variant.get("output", f"{name}.png"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        Image.fromarray(out, "RGBA").save(path)
+        results.append((name, path, time.perf_counter() - start))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render palette variants from a theme spec")
+    parser.add_argument("spec", nargs="?", default=SPEC_PATH)
+    parser.add_argument("--only", nargs="+", metavar="VARIANT", help="Render just these variants")
+    parser.add_argument("--output-dir", help="Override the spec's output_dir")
+    parser.add_argument("--list", action="store_true", help="List the variants and exit")
+    args = parser.parse_args()
+
+    with open(args.spec) as f:
+        spec = json.load(f)
+    if args.list:
+        for name, variant in spec["variants"].items():
+            print(f"  {name:<28} {variant['source']}")
+        return
+
+    start = time.perf_counter()
+    for name, path, seconds in render(spec, args.only, args.output_dir):
+        print(f"  {name:<28} {seconds * 1000:6.1f} ms  -> {os.path.relpath(path, REPO_ROOT)}")
+    total = time.perf_counter() - start
+    count = len(args.only or spec["variants"])
+    print(f"{count} variants in {total:.2f}s ({count / total:.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
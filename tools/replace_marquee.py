@@ -2,59 +2,93 @@
 Replace marquee artwork with Solana-themed design.
 Fills the exact inner frame polygon with a dark gradient,
 Solana logo, and text. Frame, display panel, speakers preserved.
+The image is painted in row bands (see tiles.py), so scratch memory
+stays bounded by the band height.
+
+    python tools/replace_marquee.py [--input marquee.png] [--output out.png] [--tile-height 256]
 """
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
-import numpy as np
 
-MARQUEE_PATH = r'D:\dev\seeker-pinball\packages\pinball_components\assets\images\backbox\marquee.png'
+import argparse
+import os
+import random
+import sys
+import threading
+
+try:
+    import numpy as np
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    print("ERROR: Pillow and NumPy required. Run: pip install Pillow numpy")
+    sys.exit(1)
+
+from glow import paste_layer, soft_layer
+from tiles import DEFAULT_TILE_HEIGHT, composite_arrays, map_bands
+
+MARQUEE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "packages", "pinball_components", "assets", "images", "backbox", "marquee.png"
+)
 
 PURPLE = (153, 69, 255)
 GREEN = (20, 241, 149)
 
-orig = Image.open(MARQUEE_PATH).convert('RGBA')
-W, H = orig.size
-orig_arr = np.array(orig)
-brightness = np.max(orig_arr[:,:,:3], axis=2)
-
-# ---- Map exact inner frame edges ----
-# Scan each row for first/last bright pixel (artwork boundary)
-top_y = 133
-bot_y = 1143
-INSET = 3  # pixels inset from frame edge for clean boundary
-
-edges = {}
-for y in range(top_y, bot_y + 1):
-    row_bright = brightness[y, :] > 100
-    indices = np.where(row_bright)[0]
-    if len(indices) > 0:
-        edges[y] = (indices[0] + INSET, indices[-1] - INSET)
-
-# ---- Create artwork mask (exact trapezoid shape) ----
-mask = Image.new('L', (W, H), 0)
-md = ImageDraw.Draw(mask)
-# Build polygon from edges
-left_pts = [(edges[y][0], y) for y in range(top_y, bot_y + 1) if y in edges]
-right_pts = [(edges[y][1], y) for y in range(bot_y, top_y - 1, -1) if y in edges]
-polygon = left_pts + right_pts
-md.polygon(polygon, fill=255)
-mask_arr = np.array(mask)
-
-print(f"Artwork polygon: {len(polygon)} points, y={top_y}-{bot_y}")
-
-# ---- Create new artwork layer ----
-art = Image.new('RGBA', (W, H), (0, 0, 0, 0))
-art_arr = np.array(art)
-
-# Dark gradient background: deep navy-purple
-# Top: darker, Bottom: slightly lighter, with radial center glow
-for y in range(top_y, bot_y + 1):
-    if y not in edges:
-        continue
-    left, right = edges[y]
-    t_y = (y - top_y) / max(bot_y - top_y, 1)  # 0=top, 1=bottom
-
-    for x in range(left, right + 1):
-        t_x = (x - left) / max(right - left, 1)  # 0=left, 1=right
+# Inner artwork rows of the frame and the inset from its edge.
+TOP_Y = 133
+BOT_Y = 1143
+INSET = 3
+
+FONT_CANDIDATES = ["C:/Windows/Fonts/segoeuib.ttf", "C:/Windows/Fonts/arialbd.ttf"]
+
+LOGO_W = 500
+LOGO_Y = 320
+
+
+def frame_edges(arr, top_y=TOP_Y, bot_y=BOT_Y, inset=INSET,
+                tile_height=DEFAULT_TILE_HEIGHT, workers=None):
+    """{row: (left, right)} of the artwork inside the frame, by first/last bright pixel."""
+    edges = {}
+
+    def scan(y0, y1, top, bottom):
+        lo, hi = max(y0, top_y), min(y1, bot_y + 1)
+        if lo >= hi:
+            return
+        bright = arr[lo:hi, :, :3].max(axis=2) > 100
+        first = bright.argmax(axis=1)
+        last = bright.shape[1] - 1 - bright[:, ::-1].argmax(axis=1)
+        for i in np.flatnonzero(bright.any(axis=1)):
+            edges[lo + i] = (int(first[i]) + inset, int(last[i]) - inset)
+
+    map_bands(scan, len(arr), tile_height, workers=workers)
+    return edges
+
+
+def artwork_polygon(edges, top_y=TOP_Y, bot_y=BOT_Y):
+    """Polygon of the trapezoid the edges describe."""
+    left_pts = [(edges[y][0], y) for y in range(top_y, bot_y + 1) if y in edges]
+    right_pts = [(edges[y][1], y) for y in range(bot_y, top_y - 1, -1) if y in edges]
+    return left_pts + right_pts
+
+
+def _shifted(points, dy):
+    return [(x, y - dy) for x, y in points]
+
+
+def band_mask(polygon, width, y0, y1):
+    """L mask of `polygon` for image rows [y0, y1)."""
+    mask = Image.new("L", (width, y1 - y0), 0)
+    ImageDraw.Draw(mask).polygon(_shifted(polygon, y0), fill=255)
+    return np.asarray(mask)
+
+
+def paint_background(edges, width, y0, y1, top_y=TOP_Y, bot_y=BOT_Y):
+    """Dark navy-purple gradient with a radial purple glow above center, rows [y0, y1)."""
+    art = np.zeros((y1 - y0, width, 4), dtype=np.uint8)
+    cy = (top_y + bot_y) * 0.42  # slightly above center
+    for y in range(max(y0, top_y), min(y1, bot_y + 1)):
+        if y not in edges:
+            continue
+        left, right = edges[y]
+        t_y = (y - top_y) / max(bot_y - top_y, 1)  # 0=top, 1=bottom
 
         # Base dark gradient (top to bottom)
         base_r = int(8 + 12 * t_y)
@@ -63,194 +97,256 @@ for y in range(top_y, bot_y + 1):
 
         # Radial center glow (subtle purple)
         cx = (left + right) / 2
-        cy = (top_y + bot_y) * 0.42  # slightly above center
-        dx = (x - cx) / ((right - left) / 2)
+        dx = (np.arange(left, right + 1) - cx) / ((right - left) / 2)
         dy = (y - cy) / ((bot_y - top_y) / 2)
-        dist = (dx*dx + dy*dy) ** 0.5
-        glow = max(0, 1 - dist * 0.9) * 0.3
-
-        r = min(255, int(base_r + 40 * glow))
-        g = min(255, int(base_g + 15 * glow))
-        b = min(255, int(base_b + 60 * glow))
-
-        art_arr[y, x] = [r, g, b, 255]
-
-art = Image.fromarray(art_arr, 'RGBA')
-ad = ImageDraw.Draw(art)
-print("Background gradient painted")
-
-# ---- Add subtle stars ----
-import random
-random.seed(42)
-for _ in range(80):
-    sy = random.randint(top_y + 20, bot_y - 20)
-    if sy not in edges:
-        continue
-    left, right = edges[sy]
-    sx = random.randint(left + 20, right - 20)
-    size = random.choice([1, 1, 1, 2, 2, 3])
-    alpha = random.randint(60, 180)
-    ad.ellipse([sx-size, sy-size, sx+size, sy+size],
-               fill=(255, 255, 255, alpha))
-
-print("Stars added")
-
-# ---- Solana logo (large, centered) ----
-overlay = Image.new('RGBA', (W, H), (0, 0, 0, 0))
-od = ImageDraw.Draw(overlay)
-
-center_x = W // 2
-logo_w = 500
-logo_x = center_x - logo_w // 2
-logo_y = 320
-bar_h = int(logo_w * 0.10)
-gap = int(bar_h * 0.6)
-slant = int(logo_w * 0.14)
-
-def draw_bar(draw_obj, yp, fwd=True):
-    if fwd:
-        p = [(logo_x+slant,yp),(logo_x+logo_w,yp),
-             (logo_x+logo_w-slant,yp+bar_h),(logo_x,yp+bar_h)]
-    else:
-        p = [(logo_x,yp),(logo_x+logo_w-slant,yp),
-             (logo_x+logo_w,yp+bar_h),(logo_x+slant,yp+bar_h)]
-    draw_obj.polygon(p, fill=(255,255,255,255))
-
-b1y = logo_y
-b2y = logo_y + bar_h + gap
-b3y = logo_y + 2 * (bar_h + gap)
-
-draw_bar(od, b1y, True)
-draw_bar(od, b2y, False)
-draw_bar(od, b3y, True)
-
-# Apply gradient to logo
-ov_arr = np.array(overlay)
-lt, lb = b1y - 2, b3y + bar_h + 2
-ll, lr = logo_x - 2, logo_x + logo_w + 2
-for y in range(max(0, lt), min(H, lb)):
-    for x in range(max(0, ll), min(W, lr)):
-        r, g, b, a = ov_arr[y, x]
-        if r > 200 and a > 200:
-            dm = (lr - ll) + (lb - lt)
-            dp = (x - ll) + (lb - y)
-            t = max(0.0, min(1.0, dp / dm))
-            ov_arr[y, x] = [
-                int(PURPLE[0]*(1-t) + GREEN[0]*t),
-                int(PURPLE[1]*(1-t) + GREEN[1]*t),
-                int(PURPLE[2]*(1-t) + GREEN[2]*t), 255]
-
-overlay = Image.fromarray(ov_arr, 'RGBA')
-
-# Logo glow (soft light behind logo)
-glow_layer = Image.new('RGBA', (W, H), (0, 0, 0, 0))
-gd = ImageDraw.Draw(glow_layer)
-for yp, fwd in [(b1y, True), (b2y, False), (b3y, True)]:
-    if fwd:
-        p = [(logo_x+slant,yp),(logo_x+logo_w,yp),
-             (logo_x+logo_w-slant,yp+bar_h),(logo_x,yp+bar_h)]
-    else:
-        p = [(logo_x,yp),(logo_x+logo_w-slant,yp),
-             (logo_x+logo_w,yp+bar_h),(logo_x+slant,yp+bar_h)]
-    gd.polygon(p, fill=(PURPLE[0], PURPLE[1], PURPLE[2], 80))
-glow_layer = glow_layer.filter(ImageFilter.GaussianBlur(radius=25))
-
-# Drop shadow
-shadow = Image.new('RGBA', (W, H), (0, 0, 0, 0))
-sd = ImageDraw.Draw(shadow)
-for yp, fwd in [(b1y, True), (b2y, False), (b3y, True)]:
-    off = 5
-    if fwd:
-        p = [(logo_x+slant+off,yp+off),(logo_x+logo_w+off,yp+off),
-             (logo_x+logo_w-slant+off,yp+bar_h+off),(logo_x+off,yp+bar_h+off)]
-    else:
-        p = [(logo_x+off,yp+off),(logo_x+logo_w-slant+off,yp+off),
-             (logo_x+logo_w+off,yp+bar_h+off),(logo_x+slant+off,yp+bar_h+off)]
-    sd.polygon(p, fill=(0, 0, 0, 100))
-shadow = shadow.filter(ImageFilter.GaussianBlur(radius=8))
-
-art = Image.alpha_composite(art, glow_layer)
-art = Image.alpha_composite(art, shadow)
-art = Image.alpha_composite(art, overlay)
-ad = ImageDraw.Draw(art)
-print("Solana logo added")
-
-# ---- Text ----
-ft = None
-for fp in ['C:/Windows/Fonts/segoeuib.ttf', 'C:/Windows/Fonts/arialbd.ttf']:
-    try:
-        ft = ImageFont.truetype(fp, 100)
-        fs = ImageFont.truetype(fp, 50)
-        print(f'Font: {fp}')
-        break
-    except:
-        continue
-
-text_y = b3y + bar_h + 40
-
-# "SEEKER" shadow
-ad.text((center_x + 3, text_y + 3), 'SEEKER', font=ft,
-        fill=(0, 0, 0, 120), anchor='mt')
-# "SEEKER" white base
-ad.text((center_x, text_y), 'SEEKER', font=ft,
-        fill=(255, 255, 255, 255), anchor='mt')
-
-# Apply gradient to SEEKER text
-bb = ft.getbbox('SEEKER')
-tw, th = bb[2] - bb[0], bb[3] - bb[1]
-tl = center_x - tw // 2
-art_arr = np.array(art)
-for y in range(max(0, int(text_y) - 5), min(H, int(text_y) + th + 15)):
-    for x in range(max(0, tl - 10), min(W, tl + tw + 10)):
-        r, g, b, a = art_arr[y, x]
-        if r > 220 and g > 220 and b > 220 and a > 200:
-            t = max(0.0, min(1.0, (x - tl) / max(tw, 1)))
-            art_arr[y, x] = [
-                int(PURPLE[0]*(1-t) + GREEN[0]*t),
-                int(PURPLE[1]*(1-t) + GREEN[1]*t),
-                int(PURPLE[2]*(1-t) + GREEN[2]*t), 255]
-art = Image.fromarray(art_arr, 'RGBA')
-ad = ImageDraw.Draw(art)
-
-# "PINBALL" below
-ty2 = int(text_y) + th + 12
-ad.text((center_x + 2, ty2 + 2), 'PINBALL', font=fs,
-        fill=(0, 0, 0, 80), anchor='mt')
-ad.text((center_x, ty2), 'PINBALL', font=fs,
-        fill=(GREEN[0], GREEN[1], GREEN[2], 220), anchor='mt')
-
-# ---- Subtle horizontal line accents ----
-line_y1 = logo_y - 60
-line_y2 = ty2 + 80
-for ly in [line_y1, line_y2]:
-    if ly not in edges:
-        continue
-    left, right = edges[ly]
-    mid = (left + right) // 2
-    line_w = (right - left) // 3
-    ad.line([(mid - line_w, ly), (mid + line_w, ly)],
-            fill=(PURPLE[0], PURPLE[1], PURPLE[2], 40), width=1)
-
-print("Text and accents added")
-
-# ---- Composite: original + new artwork (masked to inner area) ----
-# Apply mask to artwork layer
-art_arr = np.array(art)
-# Zero out artwork outside the mask
-for c in range(4):
-    art_arr[:, :, c] = (art_arr[:, :, c].astype(float) * (mask_arr / 255.0)).astype(np.uint8)
-art_masked = Image.fromarray(art_arr, 'RGBA')
-
-# Start with original, paste artwork over the inner area
-result = orig.copy()
-# First, clear the inner area in original to transparent (so artwork replaces it)
-result_arr = np.array(result)
-# Set inner area pixels to black transparent
-result_arr[mask_arr > 0] = [0, 0, 0, 0]
-result = Image.fromarray(result_arr, 'RGBA')
-
-# Composite
-result = Image.alpha_composite(result, art_masked)
-
-result.save(MARQUEE_PATH, 'PNG')
-print('Done!')
+        dist = np.sqrt(dx * dx + dy * dy)
+        glow = np.maximum(0, 1 - dist * 0.9) * 0.3
+
+        row = art[y - y0, left:right + 1]
+        row[:, 0] = np.minimum(255, (base_r + 40 * glow).astype(int))
+        row[:, 1] = np.minimum(255, (base_g + 15 * glow).astype(int))
+        row[:, 2] = np.minimum(255, (base_b + 60 * glow).astype(int))
+        row[:, 3] = 255
+    return art
+
+
+def star_field(edges, top_y=TOP_Y, bot_y=BOT_Y, count=80, seed=42):
+    """[(box, fill)] of the background stars."""
+    rng = random.Random(seed)
+    stars = []
+    for _ in range(count):
+        sy = rng.randint(top_y + 20, bot_y - 20)
+        if sy not in edges:
+            continue
+        left, right = edges[sy]
+        sx = rng.randint(left + 20, right - 20)
+        size = rng.choice([1, 1, 1, 2, 2, 3])
+        alpha = rng.randint(60, 180)
+        stars.append(([sx-size, sy-size, sx+size, sy+size], (255, 255, 255, alpha)))
+    return stars
+
+
+def bar_polygon(x, y, width, height, slant, forward, offset=0):
+    """One slanted bar of the Solana logo."""
+    x, y = x + offset, y + offset
+    if forward:
+        return [(x+slant, y), (x+width, y), (x+width-slant, y+height), (x, y+height)]
+    return [(x, y), (x+width-slant, y), (x+width, y+height), (x+slant, y+height)]
+
+
+def gradient_fill(arr, y0, box, is_base, t_of):
+    """Recolour pixels of the band `arr` (image rows from y0) in `box` matching `is_base`."""
+    x0, by0, x1, by1 = box
+    H, W = arr.shape[:2]
+    lo, hi = max(0, by0 - y0), min(H, by1 - y0)
+    x0, x1 = max(0, x0), min(W, x1)
+    if lo >= hi or x0 >= x1:
+        return
+    region = arr[lo:hi, x0:x1]
+    r, g, b, a = (region[:, :, c] for c in range(4))
+    base = is_base(r, g, b, a)
+    ys, xs = np.nonzero(base)
+    t = t_of(xs + x0, ys + lo + y0)
+    for c in range(3):
+        region[ys, xs, c] = (PURPLE[c]*(1-t) + GREEN[c]*t).astype(int)
+    region[ys, xs, 3] = 255
+
+
+def logo_layout(center_x, logo_w=LOGO_W, logo_y=LOGO_Y):
+    """Bar polygons, shadow polygons and gradient box of the Solana logo, plus its bottom."""
+    logo_x = center_x - logo_w // 2
+    bar_h = int(logo_w * 0.10)
+    gap = int(bar_h * 0.6)
+    slant = int(logo_w * 0.14)
+    bars = [(logo_y, True), (logo_y + bar_h + gap, False), (logo_y + 2 * (bar_h + gap), True)]
+    b1y, b3y = bars[0][0], bars[2][0]
+    return {
+        "bars": [bar_polygon(logo_x, yp, logo_w, bar_h, slant, fwd) for yp, fwd in bars],
+        "shadows": [bar_polygon(logo_x, yp, logo_w, bar_h, slant, fwd, offset=5) for yp, fwd in bars],
+        "box": (logo_x - 2, b1y - 2, logo_x + logo_w + 2, b3y + bar_h + 2),
+        "bottom": b3y + bar_h,
+    }
+
+
+def polygons_layer(polygons, radius, color, canvas):
+    """
+    Soft layer of filled polygons; only their bbox plus the blur margin is
+    rendered. It is blurred at full resolution, so it matches a blur of
+    the whole canvas exactly; around the logo that costs next to nothing.
+    """
+    points = [pt for poly in polygons for pt in poly]
+    bbox = (min(x for x, _ in points), min(y for _, y in points),
+            max(x for x, _ in points), max(y for _, y in points))
+
+    def paint(draw, dx, dy):
+        for poly in polygons:
+            draw.polygon([(x - dx, y - dy) for x, y in poly], fill=255)
+    return soft_layer(bbox, radius, color, paint, canvas, exact=True)
+
+
+def logo_glows(layout, canvas):
+    """[(layer, position)] of the glow behind the logo and its drop shadow."""
+    return [
+        polygons_layer(layout["bars"], 25, (PURPLE[0], PURPLE[1], PURPLE[2], 80), canvas),
+        polygons_layer(layout["shadows"], 8, (0, 0, 0, 100), canvas),
+    ]
+
+
+def add_logo(art, layout, glows, y0, y1):
+    """Solana logo with glow and drop shadow over the band `art`."""
+    W = art.shape[1]
+    overlay = Image.new("RGBA", (W, y1 - y0), (0, 0, 0, 0))
+    od = ImageDraw.Draw(overlay)
+    for poly in layout["bars"]:
+        od.polygon(_shifted(poly, y0), fill=(255, 255, 255, 255))
+
+    # Apply gradient to logo
+    ov_arr = np.array(overlay)
+    ll, lt, lr, lb = layout["box"]
+    dm = (lr - ll) + (lb - lt)
+    gradient_fill(ov_arr, y0, layout["box"],
+                  lambda r, g, b, a: (r > 200) & (a > 200),
+                  lambda x, y: np.clip(((x - ll) + (lb - y)) / dm, 0.0, 1.0))
+
+    # Logo glow (soft light behind logo), then the drop shadow
+    img = Image.fromarray(art, "RGBA")
+    for layer, (x, y) in glows:
+        paste_layer(img, layer, (x, y - y0))
+    return composite_arrays(np.asarray(img), ov_arr)
+
+
+def load_fonts(candidates=None):
+    """(title, subtitle) fonts from the first candidate that loads."""
+    for fp in candidates or FONT_CANDIDATES:
+        try:
+            ft = ImageFont.truetype(fp, 100)
+            fs = ImageFont.truetype(fp, 50)
+        except OSError:
+            continue
+        print(f"Font: {fp}")
+        return ft, fs
+    print(f"ERROR: none of the fonts {candidates or FONT_CANDIDATES} could be loaded")
+    sys.exit(1)
+
+
+def text_layout(center_x, text_y, ft):
+    """Left edge and size of "SEEKER" and the y of "PINBALL" below it."""
+    bb = ft.getbbox("SEEKER")
+    tw, th = bb[2] - bb[0], bb[3] - bb[1]
+    return {"x": center_x, "y": int(text_y), "left": center_x - tw // 2,
+            "width": tw, "height": th, "pinball_y": int(text_y) + th + 12}
+
+
+# FreeType faces are not safe to rasterize from several threads at once.
+_font_lock = threading.Lock()
+
+
+def add_text(art, layout, ft, fs, y0):
+    """Gradient "SEEKER" over a green "PINBALL" on the band `art`."""
+    cx, ty, ty2 = layout["x"], layout["y"] - y0, layout["pinball_y"] - y0
+    img = Image.fromarray(art, "RGBA")
+    with _font_lock:
+        ad = ImageDraw.Draw(img)
+        # "SEEKER" shadow
+        ad.text((cx + 3, ty + 3), "SEEKER", font=ft, fill=(0, 0, 0, 120), anchor="mt")
+        # "SEEKER" white base
+        ad.text((cx, ty), "SEEKER", font=ft, fill=(255, 255, 255, 255), anchor="mt")
+
+    # Apply gradient to SEEKER text
+    tl, tw, th = layout["left"], layout["width"], layout["height"]
+    art = np.array(img)
+    gradient_fill(art, y0, (tl - 10, layout["y"] - 5, tl + tw + 10, layout["y"] + th + 15),
+                  lambda r, g, b, a: (r > 220) & (g > 220) & (b > 220) & (a > 200),
+                  lambda x, y: np.clip((x - tl) / max(tw, 1), 0.0, 1.0))
+
+    # "PINBALL" below
+    img = Image.fromarray(art, "RGBA")
+    with _font_lock:
+        ad = ImageDraw.Draw(img)
+        ad.text((cx + 2, ty2 + 2), "PINBALL", font=fs, fill=(0, 0, 0, 80), anchor="mt")
+        ad.text((cx, ty2), "PINBALL", font=fs,
+                fill=(GREEN[0], GREEN[1], GREEN[2], 220), anchor="mt")
+    return img
+
+
+def add_accents(img, edges, ys, y0):
+    """Faint purple horizontal lines, a third of the row wide, at each y."""
+    ad = ImageDraw.Draw(img)
+    for ly in ys:
+        if ly not in edges:
+            continue
+        left, right = edges[ly]
+        mid = (left + right) // 2
+        line_w = (right - left) // 3
+        ad.line([(mid - line_w, ly - y0), (mid + line_w, ly - y0)],
+                fill=(PURPLE[0], PURPLE[1], PURPLE[2], 40), width=1)
+
+
+def replace_marquee(orig, fonts=None, tile_height=DEFAULT_TILE_HEIGHT, workers=None):
+    """
+    New marquee: `orig` with the artwork inside its frame repainted.
+
+    Everything after the edge scan is rendered per band of `tile_height`
+    rows straight into the one full-size copy of the image; the logo glow
+    and shadow are rendered once, around the logo only. The output is
+    pixel-identical to painting the whole image at once.
+    """
+    arr = np.array(orig.convert("RGBA"))
+    H, W = arr.shape[:2]
+
+    # ---- Map exact inner frame edges ----
+    edges = frame_edges(arr, tile_height=tile_height, workers=workers)
+    polygon = artwork_polygon(edges)
+    print(f"Artwork polygon: {len(polygon)} points, y={TOP_Y}-{BOT_Y}")
+
+    center_x = W // 2
+    stars = star_field(edges)
+    logo = logo_layout(center_x)
+    glows = logo_glows(logo, (W, H))
+    ft, fs = fonts or load_fonts()
+    text = text_layout(center_x, logo["bottom"] + 40, ft)
+    accents = [LOGO_Y - 60, text["pinball_y"] + 80]
+
+    def render(y0, y1, top, bottom):
+        # ---- New artwork layer for these rows ----
+        art = paint_background(edges, W, y0, y1)
+        img = Image.fromarray(art, "RGBA")
+        sd = ImageDraw.Draw(img)
+        for box, fill in stars:
+            sd.ellipse([box[0], box[1] - y0, box[2], box[3] - y0], fill=fill)
+        art = add_logo(np.asarray(img), logo, glows, y0, y1)
+        img = add_text(art, text, ft, fs, y0)
+        add_accents(img, edges, accents, y0)
+
+        # ---- Composite: original + new artwork (masked to inner area) ----
+        inside = band_mask(polygon, W, y0, y1) > 0
+        art = np.array(img)
+        art[~inside] = 0
+        # Clear the inner area of the original so the artwork replaces it
+        band = arr[y0:y1]
+        band[inside] = 0
+        band[:] = composite_arrays(band, art)
+
+    map_bands(render, H, tile_height, workers=workers)
+    print("Artwork painted and composited")
+    return Image.fromarray(arr, "RGBA")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replace the marquee artwork with the Solana design")
+    parser.add_argument("--input", default=MARQUEE_PATH, help="Marquee to repaint")
+    parser.add_argument("--output", help="Where to save (default: overwrite --input)")
+    parser.add_argument("--font", action="append", help="TrueType font to try first (repeatable)")
+    parser.add_argument("--tile-height", type=int, default=DEFAULT_TILE_HEIGHT, help="Rows per band")
+    parser.add_argument("--workers", type=int, help="Parallel bands (default: CPU count)")
+    args = parser.parse_args()
+
+    fonts = load_fonts(args.font + FONT_CANDIDATES) if args.font else None
+    with Image.open(args.input) as orig:
+        result = replace_marquee(orig, fonts, args.tile_height, args.workers)
+    result.save(args.output or args.input, "PNG")
+    print("Done!")
+
+
+if __name__ == "__main__":
+    main()
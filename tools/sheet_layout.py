@@ -0,0 +1,306 @@
+"""
+Sprite sheet grid layout, layout records, and a check of the Dart side.
+
+Sheet builders get their grid from choose_grid rather than hard-coding
+it: of the grids that fit the max texture size, the one whose
+power-of-two padded texture is smallest, then the one with the fewest
+empty cells, then the squarest. save_sheet writes the sheet and records
+its frame count, grid and cell size in tools/sheet_layouts.json under
+its repo-relative path (the records live in tools/ because pubspec
+bundles asset directories whole).
+
+--check finds every SpriteAnimationData.sequenced call in the Dart
+sources, resolves the image it animates and the constants its arguments
+are built from, and verifies amount, amountPerRow and the textureSize
+divisors against the image's record, or for images without one, against
+the image size.
+
+    python tools/sheet_layout.py 24 200 200      # grid for 24 frames of 200x200
+    python tools/sheet_layout.py --check
+"""
+
+import argparse
+import ast
+import json
+import operator
+import os
+import re
+import sys
+
+from asset_budget import image_size, next_pow2
+from dart_assets import REPO_ROOT, asset_file, load_accessors
+from golden_impact import dart_files
+
+LAYOUTS_PATH = os.path.join(REPO_ROOT, "tools", "sheet_layouts.json")
+
+# Largest texture side the sheets may use; 4096 is supported by every
+# WebGL and mobile GPU the game targets.
+MAX_TEXTURE = 4096
+
+_SEQUENCED_RE = re.compile(r"SpriteAnimationData\.sequenced\(")
+_CONST_RE = re.compile(r"\bconst (?:\w+ )?(\w+) = ([^;]+);")
+# Components read a sheet from the cache or, if it may not be loaded yet,
+# await images.load; either call names the image.
+_IMAGE_LOAD_RE = re.compile(r"\b(?:fromCache|images\.load)\(")
+_ASSET_RE = re.compile(r"Assets\.([\w.]+?)\.(?:keyName|path)\b")
+_DIVISOR_RE = re.compile(r"\b\w+\.(width|height)\s*/\s*(\w+(?:\s*(?:~/|[*+-])\s*\w+)*)")
+
+_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.FloorDiv: operator.floordiv,
+    ast.Div: operator.truediv,
+}
+
+
+def choose_grid(frames, cell_w, cell_h, max_texture=MAX_TEXTURE):
+    """(cols, rows) for `frames` cells of cell_w x cell_h; ValueError if none fits."""
+    best = None
+    for cols in range(1, frames + 1):
+        rows = -(-frames // cols)
+        w, h = cols * cell_w, rows * cell_h
+        if w > max_texture or h > max_texture:
+            continue
+        key = (next_pow2(w) * next_pow2(h), cols * rows, abs(w - h), rows)
+        if best is None or key < best[0]:
+            best = (key, cols, rows)
+    if best is None:
+        raise ValueError(f"{frames} frames of {cell_w}x{cell_h} do not fit a "
+                         f"{max_texture}x{max_texture} texture")
+    return best[1], best[2]
+
+
+def layout(frames, cols, rows, cell_w, cell_h):
+    """Layout record of a sheet, in the keys frame_count's sidecar uses."""
+    return {
+        "frames": int(frames),
+        "cols": int(cols),
+        "rows": int(rows),
+        "cellWidth": int(cell_w),
+        "cellHeight": int(cell_h),
+    }
+
+
+def load_layouts(path=LAYOUTS_PATH):
+    """{repo-relative sheet path: layout record}."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def record_layout(sheet_path, record, path=LAYOUTS_PATH, root=REPO_ROOT):
+    """Store `record` for the sheet at `sheet_path`; returns its key."""
+    key = os.path.relpath(os.path.abspath(sheet_path), root).replace(os.sep, "/")
+    layouts = load_layouts(path)
+    layouts[key] = record
+    with open(path, "w") as f:
+        json.dump(dict(sorted(layouts.items())), f, indent=2)
+        f.write("\n")
+    return key
+
+
+def save_sheet(sheet, sheet_path, frames, cols, rows):
+    """Save `sheet` as a PNG and record its layout."""
+    os.makedirs(os.path.dirname(sheet_path), exist_ok=True)
+    sheet.save(sheet_path, "PNG")
+    record_layout(sheet_path, layout(frames, cols, rows, sheet.width // cols, sheet.height // rows))
+
+
+def _closing(text, start):
+    """Index of the parenthesis closing the one just before `start`."""
+    depth = 1
+    for i in range(start, len(text)):
+        if text[i] == "(":
+            depth += 1
+        elif text[i] == ")":
+            depth -= 1
+            if not depth:
+                return i
+    return len(text)
+
+
+def _named_args(text):
+    """{name: expression} of a Dart argument list."""
+    args, depth, part = {}, 0, []
+    for ch in text + ",":
+        if ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth -= 1
+        if ch == "," and not depth:
+            name, sep, expr = "".join(part).partition(":")
+            if sep:
+                args[name.strip()] = expr.strip()
+            part = []
+        else:
+            part.append(ch)
+    return args
+
+
+def evaluate(expr, names):
+    """Value of a Dart integer expression over `names`, or None."""
+    def ev(node):
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return node.value
+        if isinstance(node, ast.Name) and names.get(node.id) is not None:
+            return names[node.id]
+        if isinstance(node, ast.BinOp) and type(node.op) in _OPS:
+            return _OPS[type(node.op)](ev(node.left), ev(node.right))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return -ev(node.operand)
+        raise ValueError(expr)
+
+    try:
+        return ev(ast.parse(expr.replace("~/", "//"), mode="eval").body)
+    except (SyntaxError, ValueError, ZeroDivisionError):
+        return None
+
+
+def sequenced_calls(text):
+    """
+    (line, images, amount, amountPerRow, {width/height: divisor}) of every
+    SpriteAnimationData.sequenced call in a Dart file. `images` are the
+    accessor chains passed to the nearest fromCache or images.load before
+    the call (a conditional can pass several); the numbers are None if
+    unresolved.
+    """
+    code = re.sub(r"//.*", "", text)
+    calls, previous = [], 0
+    for match in _SEQUENCED_RE.finditer(code):
+        start = match.end()
+        end = _closing(code, start)
+        window = code[previous:match.start()]
+        loads = list(_IMAGE_LOAD_RE.finditer(window))
+        images = []
+        if loads:
+            load = previous + loads[-1].end()
+            argument = re.sub(r"\s+", "", code[load:_closing(code, load)])
+            images = _ASSET_RE.findall(argument)
+
+        # Constants in scope are those defined before the call; the last
+        # definition of a name wins, as in a later method.
+        names = {}
+        for name, expr in _CONST_RE.findall(code[:match.start()]):
+            names[name] = evaluate(expr, names)
+        args = _named_args(code[start:end])
+        divisors = {axis: evaluate(expr, names) for axis, expr in _DIVISOR_RE.findall(window)}
+        calls.append((
+            code.count("\n", 0, match.start()) + 1,
+            images,
+            evaluate(args.get("amount", ""), names),
+            evaluate(args.get("amountPerRow", ""), names),
+            divisors,
+        ))
+        previous = end
+    return calls
+
+
+def _resolve(chain, package, accessors):
+    """(package, path) behind an accessor chain, trying the file's own package first."""
+    owners = [package] + [p for p in accessors if p != package]
+    for owner in owners:
+        path = accessors.get(owner, {}).get(chain)
+        if path:
+            return owner, path
+    return None
+
+
+def check_call(amount, per_row, divisors, size, record):
+    """Problems with one sequenced call animating an image of `size`."""
+    problems = []
+    width_div, height_div = divisors.get("width"), divisors.get("height")
+    if record:
+        cols, rows, frames = record["cols"], record["rows"], record["frames"]
+        expected = (cols * record["cellWidth"], rows * record["cellHeight"])
+        if size and tuple(size) != expected:
+            problems.append(f"image is {size[0]}x{size[1]}, recorded {expected[0]}x{expected[1]}")
+        if per_row is not None and per_row != cols:
+            problems.append(f"amountPerRow {per_row}, sheet has {cols} columns")
+        if amount is not None and amount != frames:
+            problems.append(f"amount {amount}, sheet has {frames} frames")
+        if width_div is not None and width_div != cols:
+            problems.append(f"textureSize width / {width_div}, sheet has {cols} columns")
+        if height_div is not None and height_div != rows:
+            problems.append(f"textureSize height / {height_div}, sheet has {rows} rows")
+        return problems
+
+    cols = width_div if width_div is not None else per_row
+    if size:
+        for axis, length, div in (("width", size[0], cols), ("height", size[1], height_div)):
+            if div and length % div:
+                problems.append(f"image {axis} {length} is not a multiple of {div}")
+    if per_row is not None and cols is not None and per_row > cols:
+        problems.append(f"amountPerRow {per_row}, texture has {cols} columns")
+    if amount is not None and per_row and height_div and amount > per_row * height_div:
+        problems.append(f"amount {amount}, grid has {per_row * height_div} cells")
+    return problems
+
+
+def check_dart(root=REPO_ROOT, layouts_path=LAYOUTS_PATH):
+    """[(dart file, line, sheet, recorded, problems)] for every sequenced call."""
+    accessors = load_accessors(root)
+    layouts = load_layouts(layouts_path)
+    results = []
+    for package, path in dart_files("lib", root):
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        if "SpriteAnimationData.sequenced" not in text:
+            continue
+        rel = os.path.relpath(path, root).replace(os.sep, "/")
+        for line, chains, amount, per_row, divisors in sequenced_calls(text):
+            if not chains:
+                results.append((rel, line, None, False, ["image not resolved"]))
+            for chain in chains:
+                found = _resolve(chain, package, accessors)
+                if not found:
+                    results.append((rel, line, chain, False, [f"no asset for Assets.{chain}"]))
+                    continue
+                sheet = os.path.relpath(asset_file(*found, root=root), root).replace(os.sep, "/")
+                size = image_size(os.path.join(root, sheet)) if os.path.exists(os.path.join(root, sheet)) else None
+                record = layouts.get(sheet)
+                problems = check_call(amount, per_row, divisors, size, record)
+                if amount is None or per_row is None:
+                    problems.append("amount or amountPerRow not resolved")
+                results.append((rel, line, sheet, record is not None, problems))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sprite sheet grid choice and Dart sequenced() check")
+    parser.add_argument("frames", nargs="?", type=int)
+    parser.add_argument("cell_width", nargs="?", type=int)
+    parser.add_argument("cell_height", nargs="?", type=int)
+    parser.add_argument("--max-texture", type=int, default=MAX_TEXTURE)
+    parser.add_argument("--check", action="store_true",
+                        help="Verify the Dart SpriteAnimationData.sequenced calls against the sheets")
+    args = parser.parse_args()
+
+    if args.check:
+        results = check_dart()
+        failed = 0
+        for rel, line, sheet, recorded, problems in results:
+            status = "FAIL" if problems else "ok"
+            note = "" if recorded else "  (no layout record)"
+            print(f"  {status:<4} {rel}:{line}  {sheet}{note}")
+            for problem in problems:
+                print(f"         {problem}")
+            failed += bool(problems)
+        print(f"\n{len(results)} sequenced calls, {failed} with problems")
+        if failed:
+            sys.exit(1)
+        return
+
+    if args.cell_height is None:
+        parser.error("frames, cell_width and cell_height are required unless --check is given")
+    cols, rows = choose_grid(args.frames, args.cell_width, args.cell_height, args.max_texture)
+    w, h = cols * args.cell_width, rows * args.cell_height
+    print(f"{args.frames} frames of {args.cell_width}x{args.cell_height}: {cols}x{rows} grid, "
+          f"{w}x{h} sheet ({next_pow2(w)}x{next_pow2(h)} padded, "
+          f"{cols * rows - args.frames} empty cells)")
+    print(f"  Dart: SpriteAnimationData.sequenced(amount: {args.frames}, amountPerRow: {cols}, ...)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Shared image helpers for the sprite generators.
+
+Post-processing that used to be copied into every generator script lives
+here so each tool applies the same transform with its own parameters.
+"""
+
+import io
+import os
+import subprocess
+import sys
+from functools import partial
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    print("ERROR: Pillow and NumPy required. Run: pip install Pillow numpy")
+    sys.exit(1)
+
+from frame_store import FrameStore, map_chunks
+
+# Width of the brightness band below the threshold that fades to opaque.
+MATTE_RAMP = 30
+
+
+def fit_to_cell(img, width, height=None, padding=5, scale_factor=0.88,
+                resample=Image.BICUBIC):
+    """
+    Crop to content, scale to fit and center on a transparent cell.
+
+    Fused replacement for crop_to_content + center_on_canvas: the content
+    bbox (plus `padding` source pixels) is box-reduced by an integer factor
+    straight out of the source, then a single affine resample writes it
+    into the destination cell. No intermediate crop, full-size LANCZOS pass
+    or alpha paste is needed.
+    """
+    if height is None:
+        height = width
+    if img.mode != "RGBA":
+        img = img.convert("RGBA")
+
+    bbox = img.getchannel("A").getbbox()
+    if bbox is None:
+        bbox = (0, 0, img.width, img.height)
+    x0, y0, x1, y1 = bbox
+    x0 = max(0, x0 - padding)
+    y0 = max(0, y0 - padding)
+    x1 = min(img.width, x1 + padding)
+    y1 = min(img.height, y1 + padding)
+    src_w, src_h = x1 - x0, y1 - y0
+
+    scale = min(width / src_w, height / src_h) * scale_factor
+    new_w = max(1, int(src_w * scale))
+    new_h = max(1, int(src_h * scale))
+    off_x = (width - new_w) // 2
+    off_y = (height - new_h) // 2
+
+    # Integer pre-reduction leaves the final filter within ~1.5x of the
+    # target size, where a plain bicubic sample does not alias.
+    factor = max(1, round(1 / scale))
+    if factor > 1:
+        img = img.reduce(factor, box=(x0, y0, x1, y1))
+        origin_x, origin_y = 0.0, 0.0
+        span_w, span_h = src_w / factor, src_h / factor
+    else:
+        origin_x, origin_y = float(x0), float(y0)
+        span_w, span_h = float(src_w), float(src_h)
+
+    # Output pixel (u, v) samples source (a*u + c, e*v + f).
+    a = span_w / new_w
+    e = span_h / new_h
+    c = origin_x - off_x * a
+    f = origin_y - off_y * e
+    return img.transform(
+        (width, height), Image.AFFINE, (a, 0, c, 0, e, f), resample=resample,
+    )
+
+
+def open_image(path, revision=None):
+    """
+    Open an image from disk, or as it was at a git `revision` (like
+    `git show REV:path`). Paths are taken relative to the repository.
+    """
+    if revision is None:
+        return Image.open(path)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    rel = os.path.relpath(os.path.abspath(path), root).replace(os.sep, "/")
+    result = subprocess.run(["git", "show", f"{revision}:{rel}"], capture_output=True, cwd=root)
+    if result.returncode != 0:
+        raise RuntimeError(f"git show {revision}:{rel} failed: {result.stderr.decode(errors='replace').strip()}")
+    return Image.open(io.BytesIO(result.stdout))
+
+
+def _alpha_caps(threshold, ramp=MATTE_RAMP):
+    """Highest alpha a pixel keeps, indexed by r + g + b (0..765)."""
+    caps = np.full(766, 255, dtype=np.uint8)
+    for total in range(766):
+        brightness = total / 3
+        if brightness > threshold - ramp:
+            fade = int(255 * (1 - (brightness - (threshold - ramp)) / ramp))
+            caps[total] = min(255, max(0, fade))
+    return caps
+
+
+def _threshold_alpha(arr, threshold, ramp=MATTE_RAMP):
+    """Alpha the threshold matte gives an RGBA array, and its mask of light pixels."""
+    # Channel-wise ops: reductions over the short last axis are far slower.
+    r, g, b = arr[:, :, 0], arr[:, :, 1], arr[:, :, 2]
+    total = r.astype(np.int16) + g + b
+    alpha = np.minimum(arr[:, :, 3], _alpha_caps(threshold, ramp)[total])
+    alpha[np.minimum(np.minimum(r, g), b) > threshold] = 0
+    return alpha, total > 3 * (threshold - ramp)
+
+
+def border_connected(mask):
+    """
+    Pixels of `mask` 4-connected to the image border.
+
+    Labels horizontal runs instead of pixels, links the runs that overlap
+    between neighbouring rows and merges the links by vectorized
+    hook-and-jump union-find, so the work is a few array passes over the
+    image plus a few passes over the (much smaller) run graph.
+    """
+    h, w = mask.shape
+    padded = np.zeros((h, w + 2), dtype=bool)
+    padded[:, 1:-1] = mask
+    # flatnonzero + divmod is several times faster than a 2-D nonzero.
+    rows, cols = np.divmod(np.flatnonzero(padded[:, 1:] != padded[:, :-1]), w + 1)
+    if len(rows) == 0:
+        return np.zeros((h, w), dtype=bool)
+    # Transitions alternate start, end within each row; ends are exclusive.
+    rows, starts, ends = rows[0::2], cols[0::2], cols[1::2]
+    first_pixel = rows * w + starts
+
+    # Vertically overlapping runs, one link per pair: a pair can only
+    # change where an overlap begins or a run starts in either row.
+    run_start = np.zeros((h, w), dtype=bool)
+    run_start[rows, starts] = True
+    both = mask[:-1] & mask[1:]
+    begins = np.ones_like(both)
+    begins[:, 1:] = ~both[:, :-1]
+    ys, xs = np.divmod(np.flatnonzero(both & (begins | run_start[:-1] | run_start[1:])), w)
+    a = np.searchsorted(first_pixel, ys * w + xs, "right") - 1
+    b = np.searchsorted(first_pixel, (ys + 1) * w + xs, "right") - 1
+
+    labels = np.arange(len(rows))
+    while True:
+        la, lb = labels[a], labels[b]
+        if (la == lb).all():
+            break
+        low = np.minimum(la, lb)
+        np.minimum.at(labels, la, low)
+        np.minimum.at(labels, lb, low)
+        while True:
+            jumped = labels[labels]
+            if (jumped == labels).all():
+                break
+            labels = jumped
+
+    on_border = (rows == 0) | (rows == h - 1) | (starts == 0) | (ends == w)
+    keep = np.isin(labels, labels[on_border])
+
+    # Paint the kept runs: the flat image alternates gap, run, gap, ...
+    bounds = np.empty(2 * len(rows) + 2, dtype=np.int64)
+    bounds[0], bounds[-1] = 0, h * w
+    bounds[1:-1:2] = first_pixel
+    bounds[2:-1:2] = rows * w + ends
+    values = np.zeros(len(bounds) - 1, dtype=bool)
+    values[1::2] = keep
+    return np.repeat(values, np.diff(bounds)).reshape(h, w)
+
+
+def remove_background(img, threshold=220, mode="border"):
+    """
+    Make the light studio background transparent, with a soft alpha ramp.
+
+    Pixels brighter than `threshold` on every channel become transparent
+    and those within MATTE_RAMP below it fade out. In "border" mode only
+    light regions connected to the image border are matted, so interior
+    highlights (coin rim speculars, bezel glints) stay opaque; "threshold"
+    mode mattes every light pixel, as the generators used to.
+    """
+    arr = np.array(img.convert("RGBA"))
+    alpha, light = _threshold_alpha(arr, threshold)
+    if mode == "border":
+        alpha = np.where(border_connected(light), alpha, arr[:, :, 3])
+    elif mode != "threshold":
+        raise ValueError(f"unknown matte mode {mode!r}")
+    arr[:, :, 3] = alpha
+    return Image.fromarray(arr, "RGBA")
+
+
+def _matte_chunk(indices, store, matte):
+    for i in indices:
+        store.put(i, matte(store.image(i)))
+
+
+def matte_all(images, matte=remove_background, workers=None):
+    """
+    [matte(img) for img in images], run on `workers` processes (default:
+    one per CPU) when there are several images of one size. The images go
+    through a shared FrameStore and are matted in place, so no frame is
+    pickled; `matte` must be picklable, like a partial of remove_background.
+    """
+    workers = workers or os.cpu_count() or 1
+    sizes = {img.size for img in images}
+    if len(images) < 2 or len(sizes) > 1 or workers < 2:
+        return [matte(img) for img in images]
+    width, height = sizes.pop()
+    with FrameStore(len(images), width, height) as store:
+        for i, img in enumerate(images):
+            store.put(i, img)
+        map_chunks(partial(_matte_chunk, matte=matte), len(images), store, workers=workers)
+        return [store.image(i).copy() for i in range(len(images))]
@@ -0,0 +1,193 @@
+"""
+Row-band processing for board-sized images.
+
+An image is processed as horizontal bands of `tile_height` rows, so the
+scratch memory of an operation (float math, layers, blur buffers) scales
+with the band instead of the image. Each band carries `halo` extra rows on
+both sides for neighbourhood operations such as blurs; only its core rows
+are written back. Bands run on a thread pool, since NumPy and Pillow
+release the GIL in their inner loops.
+
+Operations are `op(block, top)` callables, where `block` is an (h, W, 4)
+uint8 RGBA band whose first row is image row `top`. They return the
+processed block and declare the rows of context they need as `op.halo`.
+
+    python tools/tiles.py packages/pinball_components/assets/images/board_background.png \\
+        --output /tmp/board.png --op threshold:128 --op gradient:00000000:000000a0 --op blur:4
+"""
+
+import argparse
+import math
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+    from PIL import Image, ImageFilter
+except ImportError:
+    print("ERROR: Pillow and NumPy required. Run: pip install Pillow numpy")
+    sys.exit(1)
+
+DEFAULT_TILE_HEIGHT = 256
+
+
+def bands(height, tile_height=DEFAULT_TILE_HEIGHT, halo=0):
+    """(y0, y1, top, bottom) per band: core rows [y0, y1), padded rows [top, bottom)."""
+    for y0 in range(0, height, tile_height):
+        y1 = min(height, y0 + tile_height)
+        yield y0, y1, max(0, y0 - halo), min(height, y1 + halo)
+
+
+def map_bands(fn, height, tile_height=DEFAULT_TILE_HEIGHT, halo=0, workers=None):
+    """Call fn(y0, y1, top, bottom) for every band on a thread pool."""
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        # Consume results so exceptions raised in a band propagate.
+        for _ in pool.map(lambda band: fn(*band), bands(height, tile_height, halo)):
+            pass
+
+
+def halo_of(ops):
+    return sum(getattr(op, "halo", 0) for op in ops)
+
+
+def process(src, ops, tile_height=DEFAULT_TILE_HEIGHT, workers=None, out=None):
+    """
+    Apply `ops` in order to the RGBA array `src`, band by band, into `out`.
+
+    Without halo every band only touches its own rows, so `out` may be
+    `src` itself and the whole pass needs no full-size copy at all.
+    """
+    halo = halo_of(ops)
+    if out is None:
+        out = np.empty_like(src)
+    elif out is src and halo:
+        raise ValueError("in-place processing needs operations without halo")
+
+    def run(y0, y1, top, bottom):
+        block = src[top:bottom]
+        for op in ops:
+            block = op(block, top)
+        out[y0:y1] = block[y0 - top:y1 - top]
+
+    map_bands(run, len(src), tile_height, halo, workers)
+    return out
+
+
+def blur_halo(radius):
+    """Rows beyond which Pillow's GaussianBlur no longer reaches."""
+    # GaussianBlur runs three box passes of about `radius` each.
+    return 3 * math.ceil(radius) + 3
+
+
+def threshold(level, channel=3):
+    """Binarize one channel (alpha by default): 255 above `level`, else 0."""
+    def op(block, top):
+        block = block.copy()
+        block[:, :, channel] = np.where(block[:, :, channel] > level, 255, 0)
+        return block
+    return op
+
+
+def gradient(top_color, bottom_color, height, start=0, end=None):
+    """Composite a vertical RGBA gradient running from row `start` to `end` over the block."""
+    end = height if end is None else end
+    top_color = np.array(top_color, dtype=np.float32)
+    bottom_color = np.array(bottom_color, dtype=np.float32)
+
+    def op(block, top):
+        ys = np.arange(top, top + len(block), dtype=np.float32)
+        t = np.clip((ys - start) / max(end - start, 1), 0, 1)[:, None]
+        rows = (top_color * (1 - t) + bottom_color * t).round().astype(np.uint8)
+        layer = np.broadcast_to(rows[:, None, :], block.shape)
+        return composite_arrays(block, layer)
+    return op
+
+
+def mask(mask_arr):
+    """Scale alpha by an (H, W) uint8 mask of the full image."""
+    def op(block, top):
+        m = mask_arr[top:top + len(block)].astype(np.uint16)
+        block = block.copy()
+        block[:, :, 3] = (block[:, :, 3] * m + 127) // 255
+        return block
+    return op
+
+
+def composite(layer_arr):
+    """Alpha-composite rows of a full-size RGBA layer over the block."""
+    def op(block, top):
+        return composite_arrays(block, layer_arr[top:top + len(block)])
+    return op
+
+
+def blur(radius):
+    """Gaussian blur, exact across bands thanks to its halo."""
+    def op(block, top):
+        img = Image.fromarray(np.ascontiguousarray(block), "RGBA")
+        return np.asarray(img.filter(ImageFilter.GaussianBlur(radius=radius)))
+    op.halo = blur_halo(radius)
+    return op
+
+
+def composite_arrays(dst, src):
+    """Image.alpha_composite of two equally sized RGBA arrays."""
+    return np.asarray(Image.alpha_composite(
+        Image.fromarray(np.ascontiguousarray(dst), "RGBA"),
+        Image.fromarray(np.ascontiguousarray(src), "RGBA"),
+    ))
+
+
+def _color(text):
+    text = text.lstrip("#")
+    if len(text) == 6:
+        text += "ff"
+    return tuple(int(text[i:i + 2], 16) for i in range(0, 8, 2))
+
+
+def parse_op(spec, size):
+    """An operation from a `name:arg[:arg]` command line spec."""
+    W, H = size
+    name, _, rest = spec.partition(":")
+    args = rest.split(":") if rest else []
+    if name == "threshold":
+        return threshold(int(args[0]) if args else 127)
+    if name == "blur":
+        return blur(float(args[0]))
+    if name == "gradient":
+        return gradient(_color(args[0]), _color(args[1]), H)
+    if name == "mask":
+        with Image.open(args[0]) as m:
+            return mask(np.asarray(m.convert("L").resize(size)))
+    if name == "composite":
+        with Image.open(args[0]) as layer:
+            return composite(np.asarray(layer.convert("RGBA").resize(size)))
+    raise ValueError(f"unknown operation {name!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Band-wise processing of large images")
+    parser.add_argument("input")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--op", action="append", required=True,
+                        help="threshold:LEVEL, blur:RADIUS, gradient:TOP:BOTTOM (RRGGBB[AA]), "
+                             "mask:PATH or composite:PATH; applied in order")
+    parser.add_argument("--tile-height", type=int, default=DEFAULT_TILE_HEIGHT)
+    parser.add_argument("--workers", type=int, help="Parallel bands (default: CPU count)")
+    args = parser.parse_args()
+
+    with Image.open(args.input) as img:
+        src = np.array(img.convert("RGBA"))
+    H, W = src.shape[:2]
+    ops = [parse_op(spec, (W, H)) for spec in args.op]
+    halo = halo_of(ops)
+    count = len(range(0, H, args.tile_height))
+    print(f"{args.input}: {W}x{H}, {count} bands of {args.tile_height} rows (+{halo} halo)")
+
+    out = process(src, ops, args.tile_height, args.workers, out=None if halo else src)
+    Image.fromarray(out, "RGBA").save(args.output)
+    print(f"  -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()